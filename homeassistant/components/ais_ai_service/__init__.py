@@ -14,7 +14,6 @@ import platform
 from aiohttp.web import json_response
 import async_timeout
 import psutil
-import requests
 import voluptuous as vol
 
 from homeassistant import core
@@ -69,6 +68,10 @@ from homeassistant.util import dt as dt_util
 
 from ..automation import AutomationConfig
 from .ais_agent import AisAgent
+from .entity_index import async_setup_entity_index, get_entity_index
+from .frame_client import COALESCE_KEYS, async_setup_frame_client, get_frame_client
+from .intent_dispatcher import get_intent_dispatcher
+from .remote_menu import async_setup_remote_menu, get_remote_menu
 
 aisCloudWS = None
 
@@ -128,6 +131,297 @@ INTENT_SPELL_STATUS = "AisSpellStatusInfo"
 INTENT_RUN_AUTOMATION = "AisRunAutomation"
 INTENT_ASK_GOOGLE = "AisAskGoogle"
 
+# utterances of the AIS intents, the first matching utterance wins
+AIS_INTENT_UTTERANCES = [
+    (
+        INTENT_GET_WEATHER,
+        [
+            "[aktualna] pogoda",
+            "jaka jest pogoda",
+        ],
+    ),
+    (
+        INTENT_GET_WEATHER_48,
+        [
+            "prognoza pogody",
+            "pogoda prognoza",
+            "jaka będzie pogoda",
+        ],
+    ),
+    (
+        INTENT_CLIMATE_SET_TEMPERATURE,
+        [
+            "Ogrzewanie [w] {item} {temp} stopni[e]",
+            "Ogrzewanie [w] {item} temperatura {temp} stopni[e]",
+        ],
+    ),
+    (
+        INTENT_CLIMATE_SET_PRESENT_MODE,
+        [
+            "Ogrzewanie tryb {item}",
+        ],
+    ),
+    (
+        INTENT_CLIMATE_SET_ALL_OFF,
+        [
+            "Wyłącz całe ogrzewanie",
+        ],
+    ),
+    (
+        INTENT_CLIMATE_SET_ALL_ON,
+        [
+            "Włącz całe ogrzewanie",
+        ],
+    ),
+    (
+        INTENT_LAMPS_ON,
+        [
+            "włącz światła",
+            "zapal światła",
+            "włącz wszystkie światła",
+            "zapal wszystkie światła",
+        ],
+    ),
+    (
+        INTENT_LAMPS_OFF,
+        [
+            "zgaś światła",
+            "wyłącz światła",
+            "wyłącz wszystkie światła",
+            "zgaś wszystkie światła",
+        ],
+    ),
+    (
+        INTENT_SWITCHES_ON,
+        [
+            "włącz przełączniki",
+            "włącz wszystkie przełączniki",
+        ],
+    ),
+    (
+        INTENT_SWITCHES_OFF,
+        [
+            "wyłącz przełączniki",
+            "wyłącz wszystkie przełączniki",
+        ],
+    ),
+    (
+        INTENT_GET_TIME,
+        [
+            "która",
+            "która [jest] [teraz] godzina",
+            "którą mamy godzinę",
+            "jaki [jest] czas",
+            "[jaka] [jest] godzina",
+        ],
+    ),
+    (
+        INTENT_GET_DATE,
+        [
+            "[jaka] [jest] data",
+            "jaki [mamy] [jest] [dzisiaj] dzień",
+            "co dzisiaj jest",
+            "co [mamy] [jest] dzisiaj",
+        ],
+    ),
+    (
+        INTENT_PLAY_RADIO,
+        [
+            "Włącz radio",
+            "Radio {item}",
+            "Włącz radio {item}",
+            "Graj radio {item}",
+            "Graj {item} radio",
+            "Posłuchał bym radio {item}",
+            "Włącz stację radiową {item}",
+        ],
+    ),
+    (
+        INTENT_PLAY_PODCAST,
+        [
+            "Podcast {item}",
+            "Włącz podcast {item}",
+            "Graj podcast {item}",
+            "Graj {item} podcast",
+            "Posłuchał bym podcast {item}",
+        ],
+    ),
+    (
+        INTENT_PLAY_YT_MUSIC,
+        [
+            "Muzyka {item}",
+            "Włącz muzykę {item}",
+            "Graj muzykę {item}",
+            "Graj {item} muzykę",
+            "Posłuchał bym muzykę {item}",
+            "Włącz [z] [na] YouTube {item}",
+            "YouTube {item}",
+        ],
+    ),
+    (
+        INTENT_PLAY_SPOTIFY,
+        [
+            "Spotify {item}",
+        ],
+    ),
+    (
+        INTENT_TURN_ON,
+        [
+            "Włącz {item}",
+            "Zapal światło w {item}",
+        ],
+    ),
+    (
+        INTENT_TURN_OFF,
+        [
+            "Wyłącz {item}",
+            "Zgaś Światło w {item}",
+        ],
+    ),
+    (
+        INTENT_TOGGLE,
+        [
+            "Przełącz {item}",
+        ],
+    ),
+    (
+        INTENT_STATUS,
+        [
+            "Jaka jest {item}",
+            "Jaki jest {item}",
+            "Jak jest {item}",
+            "Jakie jest {item}",
+            "[jaki] [ma] status {item}",
+        ],
+    ),
+    (
+        INTENT_ASK_QUESTION,
+        [
+            "Co to jest {item}",
+            "Kto to jest {item}",
+            "Znajdź informację o {item}",
+            "Znajdź informacje o {item}",
+            "Wyszukaj informację o {item}",
+            "Wyszukaj informacje o {item}",
+            "Wyszukaj {item}",
+            "Kim jest {item}",
+            "Informacje o {item}",
+            "Czym jest {item}",
+            "Opowiedz mi o {intem}",
+            "Informację na temat {item}",
+            "Co wiesz o {item}",
+            "Co wiesz na temat {item}",
+            "Opowiedz o {item}",
+            "Kim są {item}",
+            "Kto to {item}",
+        ],
+    ),
+    (
+        INTENT_SPELL_STATUS,
+        [
+            "Przeliteruj {item}",
+            "Literuj {item}",
+        ],
+    ),
+    (
+        INTENT_ASKWIKI_QUESTION,
+        [
+            "Wikipedia {item}",
+            "wiki {item}",
+            "encyklopedia {item}",
+        ],
+    ),
+    (
+        INTENT_OPEN_COVER,
+        [
+            "Otwórz {item}",
+            "Odsłoń {item}",
+        ],
+    ),
+    (
+        INTENT_CLOSE_COVER,
+        [
+            "Zamknij {item}",
+            "Zasłoń {item}",
+        ],
+    ),
+    (
+        INTENT_STOP,
+        [
+            "Stop",
+            "Zatrzymaj",
+            "Koniec",
+            "Pauza",
+            "Zaniechaj",
+            "Stój",
+        ],
+    ),
+    (
+        INTENT_PLAY,
+        [
+            "Start",
+            "Graj",
+            "Odtwarzaj",
+        ],
+    ),
+    (
+        INTENT_SCENE,
+        [
+            "Scena {item}",
+            "Aktywuj [scenę] {item}",
+        ],
+    ),
+    (
+        INTENT_RUN_AUTOMATION,
+        [
+            "Uruchom {item}",
+            "Automatyzacja {item}",
+            "Jolka {item}",
+        ],
+    ),
+    (
+        INTENT_ASK_GOOGLE,
+        [
+            "Google {item}",
+        ],
+    ),
+    (
+        INTENT_PERSON_STATUS,
+        [
+            "Gdzie jest {item}",
+            "Lokalizacja {item}",
+        ],
+    ),
+    (
+        INTENT_NEXT,
+        [
+            "[włącz] następny",
+            "[włącz] kolejny",
+            "[graj] następny",
+            "[graj] kolejny",
+        ],
+    ),
+    (
+        INTENT_PREV,
+        [
+            "[włącz] poprzedni",
+            "[włącz] wcześniejszy",
+            "[graj] poprzedni",
+            "[graj] wcześniejszy",
+        ],
+    ),
+    (
+        INTENT_SAY_IT,
+        [
+            "Powiedz",
+            "Mów",
+            "Powiedz {item}",
+            "Mów {item}",
+            "Echo {item}",
+        ],
+    ),
+]
+
 REGEX_TYPE = type(re.compile(""))
 
 _LOGGER = logging.getLogger(__name__)
@@ -762,21 +1056,18 @@ def get_curr_group():
     return CURR_GROUP
 
 
-def get_group_from_group(entity_id):
+def get_group_from_group(hass, entity_id):
     global CURR_GROUP
-    for group in GROUP_ENTITIES:
-        if group["entity_id"] == entity_id:
-            CURR_GROUP = group
-            break
+    group = get_remote_menu(hass).get_group(entity_id)
+    if group is not None:
+        CURR_GROUP = group
     return CURR_GROUP
 
 
-def get_curr_group_idx():
-    idx = 0
-    for group in GROUP_ENTITIES:
-        if group["entity_id"] == get_curr_group()["entity_id"]:
-            return idx
-        idx += 1
+def get_curr_group_idx(hass):
+    idx = get_remote_menu(hass).group_index(get_curr_group()["entity_id"])
+    if idx is None:
+        return len(GROUP_ENTITIES)
     return idx
 
 
@@ -835,23 +1126,9 @@ def set_curr_group(hass, group):
 def set_next_group(hass):
     # set focus on next group in focused view
     global CURR_GROUP
-    first_group_in_view = None
-    curr_group_in_view = None
-    next_group_in_view = None
-    for group in GROUP_ENTITIES:
-        if group["remote_group_view"] == get_curr_group_view():
-            # select the first group
-            if curr_group_in_view is not None and next_group_in_view is None:
-                next_group_in_view = group
-            if first_group_in_view is None:
-                first_group_in_view = group
-            if CURR_GROUP["entity_id"] == group["entity_id"]:
-                curr_group_in_view = group
-
-    if next_group_in_view is not None:
-        CURR_GROUP = next_group_in_view
-    else:
-        CURR_GROUP = first_group_in_view
+    CURR_GROUP = get_remote_menu(hass).neighbour_group(
+        get_curr_group_view(), CURR_GROUP["entity_id"], 1
+    )
     # to reset
     set_curr_group(hass, CURR_GROUP)
 
@@ -859,40 +1136,26 @@ def set_next_group(hass):
 def set_prev_group(hass):
     # set focus on prev group in focused view
     global CURR_GROUP
-    last_group_in_view = None
-    curr_group_in_view = None
-    prev_group_in_view = None
-    for group in GROUP_ENTITIES:
-        if group["remote_group_view"] == get_curr_group_view():
-            # select the last group
-            last_group_in_view = group
-            if CURR_GROUP["entity_id"] == group["entity_id"]:
-                curr_group_in_view = group
-            if curr_group_in_view is None:
-                prev_group_in_view = group
-    if prev_group_in_view is not None:
-        CURR_GROUP = prev_group_in_view
-    else:
-        CURR_GROUP = last_group_in_view
+    CURR_GROUP = get_remote_menu(hass).neighbour_group(
+        get_curr_group_view(), CURR_GROUP["entity_id"], -1
+    )
     # to reset
     set_curr_group(hass, CURR_GROUP)
 
 
 # entity in group
-def get_curr_entity():
+def get_curr_entity(hass):
     global CURR_ENTITIE
     if CURR_ENTITIE is None:
-        if len(GROUP_ENTITIES[get_curr_group_idx()]["entities"]) > 0:
-            CURR_ENTITIE = GROUP_ENTITIES[get_curr_group_idx()]["entities"][0]
+        if len(GROUP_ENTITIES[get_curr_group_idx(hass)]["entities"]) > 0:
+            CURR_ENTITIE = GROUP_ENTITIES[get_curr_group_idx(hass)]["entities"][0]
     return CURR_ENTITIE
 
 
-def get_curr_entity_idx():
-    idx = 0
-    for item in GROUP_ENTITIES[get_curr_group_idx()]["entities"]:
-        if item == get_curr_entity():
-            return idx
-        idx += 1
+def get_curr_entity_idx(hass):
+    return get_remote_menu(hass).entity_index(
+        GROUP_ENTITIES[get_curr_group_idx(hass)], get_curr_entity(hass)
+    )
 
 
 def set_curr_entity(hass, entity):
@@ -900,7 +1163,7 @@ def set_curr_entity(hass, entity):
     global CURR_ENTITIE
     global CURR_ENTITIE_POSITION
     if entity is None:
-        CURR_ENTITIE = get_curr_entity()
+        CURR_ENTITIE = get_curr_entity(hass)
     else:
         CURR_ENTITIE = entity
     CURR_ENTITIE_POSITION = None
@@ -928,8 +1191,8 @@ def set_next_entity(hass):
     elif CURR_ENTITIE == "sensor.spotifylist":
         CURR_ENTITIE = "input_select.ais_music_service"
     else:
-        entity_idx = get_curr_entity_idx()
-        group_idx = get_curr_group_idx()
+        entity_idx = get_curr_entity_idx(hass)
+        group_idx = get_curr_group_idx(hass)
         l_group_len = len(GROUP_ENTITIES[group_idx]["entities"])
         if entity_idx + 1 == l_group_len:
             entity_idx = 0
@@ -964,13 +1227,13 @@ def set_prev_entity(hass):
 
     # end special case for music
     else:
-        idx = get_curr_entity_idx()
-        l_group_len = len(GROUP_ENTITIES[get_curr_group_idx()]["entities"])
+        idx = get_curr_entity_idx(hass)
+        l_group_len = len(GROUP_ENTITIES[get_curr_group_idx(hass)]["entities"])
         if idx == 0:
             idx = l_group_len - 1
         else:
             idx = idx - 1
-        CURR_ENTITIE = GROUP_ENTITIES[get_curr_group_idx()]["entities"][idx]
+        CURR_ENTITIE = GROUP_ENTITIES[get_curr_group_idx(hass)]["entities"][idx]
     # to reset variables
     set_curr_entity(hass, None)
     say_curr_entity(hass)
@@ -978,7 +1241,7 @@ def set_prev_entity(hass):
 
 def say_curr_entity(hass):
     # check if we have selected item
-    entity_id = get_curr_entity()
+    entity_id = get_curr_entity(hass)
     if entity_id is None:
         if CURR_GROUP["entity_id"] == "group.all_ais_persons":
             _say_it(
@@ -1410,7 +1673,7 @@ def select_entity(hass, long_press):
     if CURR_GROUP["entity_id"] == "group.all_ais_devices":
         get_groups(hass)
         gg = CURR_GROUP["entities"]
-        set_curr_group(hass, get_group_from_group(gg[0]))
+        set_curr_group(hass, get_group_from_group(hass, gg[0]))
         say_curr_group(hass)
         return
     if CURR_ENTITIE is None:
@@ -1975,7 +2238,7 @@ def go_up_in_menu(hass):
         # go up in the group view menu
         # check if group in group
         if CURR_GROUP["remote_group_view"].startswith("group."):
-            gg = get_group_from_group(CURR_GROUP["remote_group_view"])
+            gg = get_group_from_group(hass, CURR_GROUP["remote_group_view"])
             set_curr_group(hass, gg)
             say_curr_group(hass)
             return
@@ -2083,128 +2346,8 @@ def go_home(hass):
 
 def get_groups(hass):
     global GROUP_ENTITIES
-    all_ais_sensors = []
-    all_ais_persons = []
-    all_ais_automations = []
-    all_ais_scenes = []
-    all_ais_switches = []
-    all_ais_lights = []
-    all_ais_climates = []
-    all_ais_covers = []
-    all_ais_locks = []
-    all_ais_vacuums = []
-    all_ais_cameras = []
-    all_ais_fans = []
-    entities = hass.states.async_all()
-    GROUP_ENTITIES = []
-
-    def add_menu_item(l_entity):
-        l_group = {
-            "friendly_name": l_entity.attributes.get("friendly_name"),
-            "order": l_entity.attributes.get("order"),
-            "entity_id": l_entity.entity_id,
-            "entities": l_entity.attributes.get("entity_id"),
-            "context_key_words": l_entity.attributes.get("context_key_words"),
-            "context_answer": l_entity.attributes.get("context_answer"),
-            "context_suffix": l_entity.attributes.get("context_suffix"),
-            "remote_group_view": l_entity.attributes.get("remote_group_view"),
-            "player_mode": l_entity.attributes.get("player_mode", ""),
-        }
-        GROUP_ENTITIES.append(l_group)
-
-    def get_key(item):
-        return item["order"]
-
-    for entity in entities:
-        if entity.entity_id.startswith("group."):
-            remote = entity.attributes.get("remote_group_view")
-            if remote is not None:
-                add_menu_item(entity)
-        elif entity.entity_id.startswith("sensor."):
-            device_class = entity.attributes.get("device_class", None)
-            if device_class is not None:
-                all_ais_sensors.append(entity.entity_id)
-        elif entity.entity_id.startswith("person."):
-            all_ais_persons.append(entity.entity_id)
-        elif entity.entity_id.startswith(
-                "automation."
-        ) and not entity.entity_id.startswith("automation.ais_"):
-            all_ais_automations.append(entity.entity_id)
-        elif entity.entity_id.startswith("scene."):
-            all_ais_scenes.append(entity.entity_id)
-        elif (
-                entity.entity_id.startswith("switch.")
-                and entity.entity_id != "switch.zigbee_tryb_parowania"
-        ):
-            all_ais_switches.append(entity.entity_id)
-        elif entity.entity_id.startswith("light."):
-            all_ais_lights.append(entity.entity_id)
-        elif entity.entity_id.startswith("climate."):
-            all_ais_climates.append(entity.entity_id)
-        elif entity.entity_id.startswith("cover."):
-            all_ais_covers.append(entity.entity_id)
-        elif entity.entity_id.startswith("lock."):
-            all_ais_locks.append(entity.entity_id)
-        elif entity.entity_id.startswith("vacuum."):
-            all_ais_vacuums.append(entity.entity_id)
-        elif entity.entity_id.startswith("camera."):
-            all_ais_cameras.append(entity.entity_id)
-        elif entity.entity_id.startswith("fan."):
-            all_ais_fans.append(entity.entity_id)
-
-    # update group on remote
-    all_unique_sensors = list(set(all_ais_sensors))
-    all_unique_sensors.sort()
-    all_unique_persons = list(set(all_ais_persons))
-    all_unique_persons.sort()
-    all_unique_automations = list(set(all_ais_automations))
-    all_unique_automations.sort()
-    all_unique_scenes = list(set(all_ais_scenes))
-    all_unique_scenes.sort()
-    all_unique_switches = list(set(all_ais_switches))
-    all_unique_switches.sort()
-    all_unique_lights = list(set(all_ais_lights))
-    all_unique_lights.sort()
-    all_unique_climates = list(set(all_ais_climates))
-    all_unique_climates.sort()
-    all_unique_covers = list(set(all_ais_covers))
-    all_unique_covers.sort()
-    all_unique_locks = list(set(all_ais_locks))
-    all_unique_locks.sort()
-    all_unique_vacuums = list(set(all_ais_vacuums))
-    all_unique_vacuums.sort()
-    all_unique_cameras = list(set(all_ais_cameras))
-    all_unique_cameras.sort()
-    all_unique_fans = list(set(all_ais_fans))
-    all_unique_fans.sort()
-
-    GROUP_ENTITIES = sorted(GROUP_ENTITIES, key=get_key)
-
-    for group in GROUP_ENTITIES:
-        if group["entity_id"] == "group.all_ais_automations":
-            group["entities"] = all_unique_automations
-        elif group["entity_id"] == "group.all_ais_scenes":
-            group["entities"] = all_unique_scenes
-        elif group["entity_id"] == "group.all_ais_persons":
-            group["entities"] = all_unique_persons
-        elif group["entity_id"] == "group.all_ais_sensors":
-            group["entities"] = all_unique_sensors
-        elif group["entity_id"] == "group.all_ais_switches":
-            group["entities"] = all_unique_switches
-        elif group["entity_id"] == "group.all_ais_lights":
-            group["entities"] = all_unique_lights
-        elif group["entity_id"] == "group.all_ais_climates":
-            group["entities"] = all_unique_climates
-        elif group["entity_id"] == "group.all_ais_covers":
-            group["entities"] = all_unique_covers
-        elif group["entity_id"] == "group.all_ais_locks":
-            group["entities"] = all_unique_locks
-        elif group["entity_id"] == "group.all_ais_vacuums":
-            group["entities"] = all_unique_vacuums
-        elif group["entity_id"] == "group.all_ais_cameras":
-            group["entities"] = all_unique_cameras
-        elif group["entity_id"] == "group.all_ais_fans":
-            group["entities"] = all_unique_fans
+    # the menu is kept up to date by the state changes
+    GROUP_ENTITIES = get_remote_menu(hass).groups
 
 
 # new way to communicate with frame
@@ -2285,6 +2428,9 @@ async def async_setup(hass, config):
     """Register the process service."""
     global aisCloudWS
     aisCloudWS = ais_cloud.AisCloudWS(hass)
+    async_setup_frame_client(hass)
+    async_setup_entity_index(hass)
+    async_setup_remote_menu(hass)
     warnings.filterwarnings("ignore", module="fuzzywuzzy")
     config = config.get(DOMAIN, {})
     intents = hass.data.get(DOMAIN)
@@ -2971,187 +3117,8 @@ async def async_setup(hass, config):
     hass.helpers.intent.async_register(AisSayIt())
     hass.helpers.intent.async_register(SpellStatusIntent())
 
-    async_register(hass, INTENT_GET_WEATHER, ["[aktualna] pogoda", "jaka jest pogoda"])
-    async_register(
-        hass,
-        INTENT_GET_WEATHER_48,
-        ["prognoza pogody", "pogoda prognoza", "jaka będzie pogoda"],
-    )
-    async_register(
-        hass,
-        INTENT_CLIMATE_SET_TEMPERATURE,
-        [
-            "Ogrzewanie [w] {item} {temp} stopni[e]",
-            "Ogrzewanie [w] {item} temperatura {temp} stopni[e]",
-        ],
-    )
-    async_register(hass, INTENT_CLIMATE_SET_PRESENT_MODE, ["Ogrzewanie tryb {item}"])
-    async_register(hass, INTENT_CLIMATE_SET_ALL_OFF, ["Wyłącz całe ogrzewanie"])
-    async_register(hass, INTENT_CLIMATE_SET_ALL_ON, ["Włącz całe ogrzewanie"])
-    async_register(
-        hass,
-        INTENT_LAMPS_ON,
-        [
-            "włącz światła",
-            "zapal światła",
-            "włącz wszystkie światła",
-            "zapal wszystkie światła",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_LAMPS_OFF,
-        [
-            "zgaś światła",
-            "wyłącz światła",
-            "wyłącz wszystkie światła",
-            "zgaś wszystkie światła",
-        ],
-    )
-    async_register(
-        hass, INTENT_SWITCHES_ON, ["włącz przełączniki", "włącz wszystkie przełączniki"]
-    )
-    async_register(
-        hass,
-        INTENT_SWITCHES_OFF,
-        ["wyłącz przełączniki", "wyłącz wszystkie przełączniki"],
-    )
-    async_register(
-        hass,
-        INTENT_GET_TIME,
-        [
-            "która",
-            "która [jest] [teraz] godzina",
-            "którą mamy godzinę",
-            "jaki [jest] czas",
-            "[jaka] [jest] godzina",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_GET_DATE,
-        [
-            "[jaka] [jest] data",
-            "jaki [mamy] [jest] [dzisiaj] dzień",
-            "co dzisiaj jest",
-            "co [mamy] [jest] dzisiaj",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_PLAY_RADIO,
-        [
-            "Włącz radio",
-            "Radio {item}",
-            "Włącz radio {item}",
-            "Graj radio {item}",
-            "Graj {item} radio",
-            "Posłuchał bym radio {item}",
-            "Włącz stację radiową {item}",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_PLAY_PODCAST,
-        [
-            "Podcast {item}",
-            "Włącz podcast {item}",
-            "Graj podcast {item}",
-            "Graj {item} podcast",
-            "Posłuchał bym podcast {item}",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_PLAY_YT_MUSIC,
-        [
-            "Muzyka {item}",
-            "Włącz muzykę {item}",
-            "Graj muzykę {item}",
-            "Graj {item} muzykę",
-            "Posłuchał bym muzykę {item}",
-            "Włącz [z] [na] YouTube {item}",
-            "YouTube {item}",
-        ],
-    )
-    async_register(hass, INTENT_PLAY_SPOTIFY, ["Spotify {item}"])
-    async_register(hass, INTENT_TURN_ON, ["Włącz {item}", "Zapal światło w {item}"])
-    async_register(hass, INTENT_TURN_OFF, ["Wyłącz {item}", "Zgaś Światło w {item}"])
-    async_register(hass, INTENT_TOGGLE, ["Przełącz {item}"])
-    async_register(
-        hass,
-        INTENT_STATUS,
-        [
-            "Jaka jest {item}",
-            "Jaki jest {item}",
-            "Jak jest {item}",
-            "Jakie jest {item}",
-            "[jaki] [ma] status {item}",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_ASK_QUESTION,
-        [
-            "Co to jest {item}",
-            "Kto to jest {item}",
-            "Znajdź informację o {item}",
-            "Znajdź informacje o {item}",
-            "Wyszukaj informację o {item}",
-            "Wyszukaj informacje o {item}",
-            "Wyszukaj {item}",
-            "Kim jest {item}",
-            "Informacje o {item}",
-            "Czym jest {item}",
-            "Opowiedz mi o {intem}",
-            "Informację na temat {item}",
-            "Co wiesz o {item}",
-            "Co wiesz na temat {item}",
-            "Opowiedz o {item}",
-            "Kim są {item}",
-            "Kto to {item}",
-        ],
-    )
-    async_register(hass, INTENT_SPELL_STATUS, ["Przeliteruj {item}", "Literuj {item}"])
-    async_register(
-        hass,
-        INTENT_ASKWIKI_QUESTION,
-        ["Wikipedia {item}", "wiki {item}", "encyklopedia {item}"],
-    )
-    async_register(hass, INTENT_OPEN_COVER, ["Otwórz {item}", "Odsłoń {item}"])
-    async_register(hass, INTENT_CLOSE_COVER, ["Zamknij {item}", "Zasłoń {item}"])
-    async_register(
-        hass, INTENT_STOP, ["Stop", "Zatrzymaj", "Koniec", "Pauza", "Zaniechaj", "Stój"]
-    )
-    async_register(hass, INTENT_PLAY, ["Start", "Graj", "Odtwarzaj"])
-    async_register(hass, INTENT_SCENE, ["Scena {item}", "Aktywuj [scenę] {item}"])
-    async_register(
-        hass, INTENT_RUN_AUTOMATION, ["Uruchom {item}", "Automatyzacja {item}", "Jolka {item}"]
-    )
-    async_register(hass, INTENT_ASK_GOOGLE, ["Google {item}"])
-    async_register(
-        hass, INTENT_PERSON_STATUS, ["Gdzie jest {item}", "Lokalizacja {item}"]
-    )
-    async_register(
-        hass,
-        INTENT_NEXT,
-        ["[włącz] następny", "[włącz] kolejny", "[graj] następny", "[graj] kolejny"],
-    )
-    async_register(
-        hass,
-        INTENT_PREV,
-        [
-            "[włącz] poprzedni",
-            "[włącz] wcześniejszy",
-            "[graj] poprzedni",
-            "[graj] wcześniejszy",
-        ],
-    )
-    async_register(
-        hass,
-        INTENT_SAY_IT,
-        ["Powiedz", "Mów", "Powiedz {item}", "Mów {item}", "Echo {item}"],
-    )
+    for intent_type, utterances in AIS_INTENT_UTTERANCES:
+        async_register(hass, intent_type, utterances)
 
     # initial status of the player
     hass.states.async_set("sensor.ais_player_mode", "ais_favorites")
@@ -3200,7 +3167,6 @@ async def _publish_command_to_frame(hass, key, val, ip=None):
     # sent the command to the android frame via http
     if ip is None:
         ip = "localhost"
-    url = ais_global.G_HTTP_REST_SERVICE_BASE_URL.format(ip)
 
     if key == "WifiConnectToSid":
         ssid = val.split(";")[0]
@@ -3287,8 +3253,11 @@ async def _publish_command_to_frame(hass, key, val, ip=None):
         if access == "on":
             try:
                 # r = requests.get('http://httpbin.org/status/404', timeout=10)
-                r = requests.get("http://" + gate_id + ".paczka.pro", timeout=10)
-                if r.status_code == 404:
+                web_session = async_get_clientsession(hass)
+                with async_timeout.timeout(10):
+                    r = await web_session.get("http://" + gate_id + ".paczka.pro")
+                    r.release()
+                if r.status == 404:
                     pass
                     # command = "pm2 restart tunnel || pm2 start /data/data/pl.sviete.dom/files/usr/bin/cloudflared" \
                     #           " --name tunnel --output /dev/null --error /dev/null" \
@@ -3305,10 +3274,9 @@ async def _publish_command_to_frame(hass, key, val, ip=None):
 
     else:
         requests_json = {key: val, "ip": ip}
-    try:
-        requests.post(url + "/command", json=requests_json, timeout=2)
-    except Exception:
-        pass
+    get_frame_client(hass).async_send(
+        ip, "/command", requests_json, key if key in COALESCE_KEYS else None
+    )
 
 
 def _wifi_rssi_to_info(rssi):
@@ -3387,7 +3355,9 @@ def _process_command_from_frame(hass, service):
         event_data = {"status": str(service.data["payload"])}
         hass.bus.fire("ais_speech_status", event_data)
         hass.states.async_set(
-            "sensor.ais_speech_status", str(service.data["payload"]), {}
+            "sensor.ais_speech_status",
+            str(service.data["payload"]),
+            get_frame_client(hass).state_attributes,
         )
         _LOGGER.debug("speech_status: " + str(service.data["payload"]))
         return
@@ -3635,24 +3605,14 @@ def _process_command_from_frame(hass, service):
         # this is done only once on start to set the voice on hass from android
         voice = service.data["payload"]
         set_voice = "Jola lokalnie"
-        if voice == "pl-pl-x-oda-network":
-            set_voice = "Jola online"
-        elif voice == "pl-pl-x-oda#female_1-local":
-            set_voice = "Celina"
-        elif voice == "pl-pl-x-oda#female_2-local":
-            set_voice = "Anżela"
-        elif voice == "pl-pl-x-oda#female_3-local":
-            set_voice = "Asia"
-        elif voice == "pl-pl-x-oda#male_1-local":
-            set_voice = "Sebastian"
-        elif voice == "pl-pl-x-oda#male_2-local":
-            set_voice = "Bartek"
-        elif voice == "pl-pl-x-oda#male_3-local":
-            set_voice = "Andrzej"
+        for name, tts_voice in ais_global.GLOBAL_TTS_VOICES.items():
+            if tts_voice == voice:
+                set_voice = name
+                break
 
         current_voice = hass.states.get("input_select.assistant_voice").state
         if current_voice != set_voice:
-            # we will inform the frame about change in EVENT_STATE_CHANGED listener
+            # we will inform the frame about change in the assistant voice listener
             hass.async_run_job(
                 hass.services.async_call(
                     "input_select",
@@ -3661,7 +3621,7 @@ def _process_command_from_frame(hass, service):
                 )
             )
         else:
-            # EVENT_STATE_CHANGED listener will not notice this change - publish info to frame about voice
+            # the voice listener will not notice this change - publish info to frame
             hass.services.call(
                 "ais_ai_service",
                 "publish_command_to_frame",
@@ -3775,15 +3735,7 @@ def _post_message(
             "ais_ai_service", "say_in_browser", {"text": tts_browser_text}
         )
     )
-    try:
-        requests.post(
-            ais_global.G_HTTP_REST_SERVICE_BASE_URL.format("127.0.0.1")
-            + "/text_to_speech",
-            json=j_data,
-            timeout=1,
-        )
-    except Exception as e:
-        pass
+    get_frame_client(hass).send("127.0.0.1", "/text_to_speech", j_data)
 
 
 def _beep_it(hass, tone):
@@ -3996,7 +3948,7 @@ def _process_code(hass, data):
 
 
 def get_context_suffix(hass):
-    context_suffix = GROUP_ENTITIES[get_curr_group_idx()]["context_suffix"]
+    context_suffix = GROUP_ENTITIES[get_curr_group_idx(hass)]["context_suffix"]
     if context_suffix == "Muzyka":
         context_suffix = hass.states.get("input_select.ais_music_service").state
     return context_suffix
@@ -4035,27 +3987,24 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
         await ha_agent.async_initialize(hass.data.get("conversation_config"))
 
     # 1. first check the conversation intents
-    conv_intents = hass.data.get("conversation", {})
-    for intent_type, matchers in conv_intents.items():
-        for matcher in matchers:
-            match = matcher.match(text)
-            if not match:
-                continue
-            response = await hass.helpers.intent.async_handle(
-                "conversation",
-                intent_type,
-                {key: {"value": value} for key, value in match.groupdict().items()},
-                text,
-            )
-            return response
+    found = get_intent_dispatcher(hass, "conversation").match(text)
+    if found is not None:
+        intent_type, match = found
+        response = await hass.helpers.intent.async_handle(
+            "conversation",
+            intent_type,
+            {key: {"value": value} for key, value in match.groupdict().items()},
+            text,
+        )
+        return response
 
     # 2. check the user automatons intents
+    automations = {}
     if ais_global.G_AUTOMATION_CONFIG is not None:
         automations = {
             state.entity_id: state.name
-            for state in hass.states.async_all()
-            if state.entity_id.startswith("automation")
-               and not state.entity_id.startswith("automation.ais_")
+            for state in hass.states.async_all("automation")
+            if not state.entity_id.startswith("automation.ais_")
         }
 
     for key, value in automations.items():
@@ -4101,26 +4050,18 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
 
     # 3. check the AIS dom intents
     if s is False:
-        intents = hass.data.get(DOMAIN, {})
+        dispatcher = get_intent_dispatcher(hass, DOMAIN)
         try:
-            for intent_type, matchers in intents.items():
-                if found_intent is not None:
-                    break
-                for matcher in matchers:
-                    match = matcher.match(text)
-                    if match:
-                        # we have a match
-                        found_intent = intent_type
-                        m, s = await hass.helpers.intent.async_handle(
-                            DOMAIN,
-                            intent_type,
-                            {
-                                key: {"value": value}
-                                for key, value in match.groupdict().items()
-                            },
-                            text,
-                        )
-                        break
+            found = dispatcher.match(text)
+            if found is not None:
+                # we have a match
+                found_intent, match = found
+                m, s = await hass.helpers.intent.async_handle(
+                    DOMAIN,
+                    found_intent,
+                    {key: {"value": value} for key, value in match.groupdict().items()},
+                    text,
+                )
             # the item was match as INTENT_TURN_ON but we don't have such device - maybe it is radio or podcast???
             if s is False and found_intent == INTENT_TURN_ON:
                 m_org = m
@@ -4170,28 +4111,23 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
             if found_intent is None and hot_word_on is False:
                 suffix = get_context_suffix(hass)
                 if suffix is not None:
-                    for intent_type, matchers in intents.items():
-                        if found_intent is not None:
-                            break
-                        for matcher in matchers:
-                            match = matcher.match(suffix + " " + text)
-                            if match:
-                                # we have a match
-                                found_intent = intent_type
-                                m, s = await hass.helpers.intent.async_handle(
-                                    DOMAIN,
-                                    intent_type,
-                                    {
-                                        key: {"value": value}
-                                        for key, value in match.groupdict().items()
-                                    },
-                                    suffix + " " + text,
-                                )
-                                # reset the curr button code
-                                # TODO the mic should send a button code too
-                                # in this case we will know if the call source
-                                CURR_BUTTON_CODE = 0
-                                break
+                    found = dispatcher.match(suffix + " " + text)
+                    if found is not None:
+                        # we have a match
+                        found_intent, match = found
+                        m, s = await hass.helpers.intent.async_handle(
+                            DOMAIN,
+                            found_intent,
+                            {
+                                key: {"value": value}
+                                for key, value in match.groupdict().items()
+                            },
+                            suffix + " " + text,
+                        )
+                        # reset the curr button code
+                        # TODO the mic should send a button code too
+                        # in this case we will know if the call source
+                        CURR_BUTTON_CODE = 0
             # 5. ask cloud
             if s is False or found_intent is None:
                 # no success - try to ask the cloud
@@ -4223,23 +4159,7 @@ async def _async_process(hass, text, calling_client_id=None, hot_word_on=False):
 @core.callback
 def _match_entity(hass, name, domain=None):
     """Match a name to an entity."""
-    from fuzzywuzzy import process as fuzzy_extract
-
-    if domain is not None:
-        # entities = hass.states.async_entity_ids(domain)
-        entities = {
-            state.entity_id: state.name
-            for state in hass.states.async_all()
-            if state.entity_id.startswith(domain)
-        }
-    else:
-        entities = {state.entity_id: state.name for state in hass.states.async_all()}
-
-    try:
-        entity_id = fuzzy_extract.extractOne(name, entities, score_cutoff=86)[2]
-    except Exception as e:
-        entity_id = None
-
+    entity_id = get_entity_index(hass).match(name, domain)
     if entity_id is not None:
         return hass.states.get(entity_id)
     else:
@@ -0,0 +1,297 @@
+"""Fuzzy entity name index used to match voice commands to entities."""
+from collections import Counter, defaultdict
+import heapq
+import logging
+import math
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_ENTITY_INDEX = "ais_ai_service_entity_index"
+
+DEFAULT_SCORE_CUTOFF = 86
+# number of best trigram candidates that are scored with fuzzywuzzy
+MAX_CANDIDATES = 20
+# queries shorter than this have too few trigrams to prune the candidates
+MIN_QUERY_LENGTH = 3
+
+PL_DIACRITICS = str.maketrans("ąćęłńóśźżĄĆĘŁŃÓŚŹŻ", "acelnoszzACELNOSZZ")
+
+
+def normalize_name(name):
+    """Return the name lower case, without Polish diacritics and extra spaces."""
+    name = name.translate(PL_DIACRITICS).lower()
+    return " ".join("".join(c if c.isalnum() else " " for c in name).split())
+
+
+def name_trigrams(name):
+    """Return the set of trigrams of the normalized name."""
+    padded = f"  {normalize_name(name)} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def name_shape(processed):
+    """Return what score_bound needs of a name processed by fuzzywuzzy.
+
+    The length and spaces of the name, of its sorted tokens and of its sorted
+    unique tokens, the counts of its characters other than spaces and its
+    tokens.
+    """
+    tokens = processed.split()
+    unique_tokens = set(tokens)
+    chars = Counter(processed.replace(" ", ""))
+    return (
+        (len(processed), processed.count(" ")),
+        (sum(map(len, tokens)) + len(tokens) - 1, len(tokens) - 1),
+        (sum(map(len, unique_tokens)) + len(unique_tokens) - 1, len(unique_tokens) - 1),
+        chars,
+        unique_tokens,
+    )
+
+
+def _ratio_bound(common, len1, len2):
+    """Return the highest rounded ratio of two strings sharing characters."""
+    return math.ceil(200 * min(common, len1, len2) / (len1 + len2) - 1e-9)
+
+
+def _partial_ratio_bound(common, len1, len2):
+    """Return the highest rounded partial ratio of two strings."""
+    shorter = min(len1, len2)
+    common = min(common, shorter)
+    bound = 200 * common / (shorter + common)
+    # a partial ratio over 99.5 is 100
+    return 100 if bound > 99.5 else math.ceil(bound - 1e-9)
+
+
+def score_bound(query_shape, entity_shape):
+    """Return a score fuzzywuzzy WRatio can not exceed for the two names.
+
+    Any ratio of two strings is at most twice the characters they share
+    over their total length. The token set ratios compare the shared tokens
+    with all the tokens, they only reach 100 when the names share a token.
+    """
+    *query_strings, query_chars, query_tokens = query_shape
+    *entity_strings, entity_chars, entity_tokens = entity_shape
+    len1, len2 = query_strings[0][0], entity_strings[0][0]
+    if len1 <= 0 or len2 <= 0:
+        return 0
+    common_chars = sum((query_chars & entity_chars).values())
+    # the name, its sorted tokens and its sorted unique tokens
+    strings = [
+        (common_chars + min(spaces1, spaces2), str_len1, str_len2)
+        for (str_len1, spaces1), (str_len2, spaces2) in zip(
+            query_strings, entity_strings
+        )
+    ]
+    shared_token = not query_tokens.isdisjoint(entity_tokens)
+
+    bound = _ratio_bound(*strings[0])
+    len_ratio = max(len1, len2) / min(len1, len2)
+    if len_ratio < 1.5:
+        for common, str_len1, str_len2 in strings[1:]:
+            bound = max(bound, 0.95 * _ratio_bound(common, str_len1, str_len2))
+        if shared_token:
+            bound = max(bound, 95)
+    else:
+        scale = 0.9 if len_ratio <= 8 else 0.6
+        bound = max(bound, scale * _partial_ratio_bound(*strings[0]))
+        for common, str_len1, str_len2 in strings[1:]:
+            partial = _partial_ratio_bound(common, str_len1, str_len2)
+            bound = max(bound, 0.95 * scale * partial)
+        if shared_token:
+            bound = max(bound, 95 * scale)
+    return math.ceil(bound - 1e-9)
+
+
+class AisEntityNameIndex:
+    """Entity names partitioned per domain with a trigram inverted index.
+
+    The index is updated from state changed events, matching scores first
+    the entities sharing the most trigrams with the query, with the same
+    scorer that fuzzywuzzy extractOne uses by default. The other entities
+    are only scored when a bound of their score says they could still win,
+    so the match is the one of extractOne.
+    """
+
+    def __init__(self):
+        """Initialize the index."""
+        # domain -> {entity_id: name}
+        self._domains = defaultdict(dict)
+        # entity_id -> (insert sequence, name processed by fuzzywuzzy,
+        # trigrams, name shape)
+        self._entries = {}
+        # trigram -> {entity_id}
+        self._trigrams = defaultdict(set)
+        self._seq = 0
+
+    def __len__(self):
+        """Return the number of indexed entities."""
+        return len(self._entries)
+
+    @callback
+    def async_update(self, entity_id, name):
+        """Add or rename the entity."""
+        from fuzzywuzzy import utils as fuzzy_utils
+
+        domain = entity_id.split(".", 1)[0]
+        if self._domains[domain].get(entity_id) == name:
+            return
+        entry = self._entries.get(entity_id)
+        self.async_remove(entity_id)
+        if entry is None:
+            seq = self._seq
+            self._seq += 1
+        else:
+            seq = entry[0]
+        trigrams = name_trigrams(name)
+        processed = fuzzy_utils.full_process(name, force_ascii=True)
+        self._domains[domain][entity_id] = name
+        self._entries[entity_id] = (seq, processed, trigrams, name_shape(processed))
+        for trigram in trigrams:
+            self._trigrams[trigram].add(entity_id)
+
+    @callback
+    def async_remove(self, entity_id):
+        """Remove the entity from the index."""
+        entry = self._entries.pop(entity_id, None)
+        if entry is None:
+            return
+        domain = entity_id.split(".", 1)[0]
+        self._domains[domain].pop(entity_id, None)
+        for trigram in entry[2]:
+            entity_ids = self._trigrams[trigram]
+            entity_ids.discard(entity_id)
+            if not entity_ids:
+                del self._trigrams[trigram]
+
+    def _partition(self, domain):
+        """Return the entity ids of the domain or all, in insertion order."""
+        if domain is not None:
+            partition = self._domains.get(domain, {})
+        else:
+            partition = self._entries
+        return sorted(partition, key=lambda eid: self._entries[eid][0])
+
+    def _candidates(self, query, domain):
+        """Return the best entity ids by trigrams in insertion order, or None.
+
+        None means there is no trigram to prune with.
+        """
+        if len(normalize_name(query)) >= MIN_QUERY_LENGTH:
+            shared = defaultdict(int)
+            query_trigrams = name_trigrams(query)
+            for trigram in query_trigrams:
+                for entity_id in self._trigrams.get(trigram, ()):
+                    shared[entity_id] += 1
+            if domain is not None:
+                partition = self._domains.get(domain, {})
+                shared = {eid: cnt for eid, cnt in shared.items() if eid in partition}
+            if shared:
+                # WRatio scores both partial and reordered matches high, take
+                # the best candidates by trigram containment and by similarity
+                query_len = len(query_trigrams)
+
+                def containment(entity_id):
+                    name_len = len(self._entries[entity_id][2])
+                    return shared[entity_id] / min(query_len, name_len)
+
+                def similarity(entity_id):
+                    name_len = len(self._entries[entity_id][2])
+                    common = shared[entity_id]
+                    return common / (query_len + name_len - common)
+
+                best = set(heapq.nlargest(MAX_CANDIDATES, shared, key=containment))
+                best.update(heapq.nlargest(MAX_CANDIDATES, shared, key=similarity))
+                return sorted(best, key=lambda eid: self._entries[eid][0])
+        return None
+
+    def match(self, query, domain=None, score_cutoff=DEFAULT_SCORE_CUTOFF):
+        """Return the entity id best matching the query or None.
+
+        The result is the one of fuzzywuzzy extractOne over the partition:
+        the first entity with the best score over the cutoff. The trigram
+        candidates are scored first, the other entities only when the score
+        bound of their name can beat the best score, or tie it from an
+        earlier place.
+        """
+        from fuzzywuzzy import fuzz, utils as fuzzy_utils
+
+        # extractOne processes the query twice
+        processed_query = fuzzy_utils.full_process(
+            fuzzy_utils.full_process(query), force_ascii=True
+        )
+        if not processed_query:
+            return None
+        query_shape = name_shape(processed_query)
+        candidates = self._candidates(query, domain) or []
+
+        best_id = None
+        best_seq = None
+        best_score = score_cutoff - 1
+
+        def score(entity_id):
+            nonlocal best_id, best_seq, best_score
+            seq, processed, _, _ = self._entries[entity_id]
+            entity_score = fuzz.WRatio(processed_query, processed, full_process=False)
+            if entity_score > best_score or (
+                entity_score == best_score and best_seq is not None and seq < best_seq
+            ):
+                best_id = entity_id
+                best_seq = seq
+                best_score = entity_score
+
+        for entity_id in candidates:
+            score(entity_id)
+
+        scored = set(candidates)
+        for entity_id in self._partition(domain):
+            if entity_id in scored:
+                continue
+            seq, _, _, shape = self._entries[entity_id]
+            bound = score_bound(query_shape, shape)
+            if bound > best_score or (
+                bound == best_score and best_seq is not None and seq < best_seq
+            ):
+                score(entity_id)
+        return best_id
+
+
+@callback
+def async_setup_entity_index(hass):
+    """Build the entity name index and keep it up to date."""
+    index = hass.data.get(DATA_ENTITY_INDEX)
+    if index is not None:
+        return index
+
+    index = hass.data[DATA_ENTITY_INDEX] = AisEntityNameIndex()
+    for state in hass.states.async_all():
+        index.async_update(state.entity_id, state.name)
+
+    @callback
+    def async_name_changed_filter(event):
+        """Only entities added, removed or renamed change the index."""
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        return (
+            old_state is None or new_state is None or old_state.name != new_state.name
+        )
+
+    @callback
+    def async_state_changed(event):
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            index.async_remove(event.data["entity_id"])
+        else:
+            index.async_update(new_state.entity_id, new_state.name)
+
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED, async_state_changed, event_filter=async_name_changed_filter
+    )
+    return index
+
+
+def get_entity_index(hass):
+    """Return the entity name index."""
+    return hass.data[DATA_ENTITY_INDEX]
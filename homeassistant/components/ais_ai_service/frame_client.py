@@ -0,0 +1,231 @@
+"""Async transport for TTS and commands sent to the Android frame."""
+import asyncio
+from datetime import timedelta
+import logging
+import time
+
+import aiohttp
+import async_timeout
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, STATE_UNKNOWN
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+import homeassistant.components.ais_dom.ais_global as ais_global
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_FRAME_CLIENT = "ais_ai_service_frame_client"
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_TIMEOUT = 2
+
+# the TTS status entity of the frame shows the metrics as attributes
+STATS_ENTITY_ID = "sensor.ais_speech_status"
+STATS_INTERVAL = timedelta(minutes=1)
+
+# commands where only the last value matters - a burst of volume ticks
+# or speed changes is sent to the frame as a single request
+COALESCE_KEYS = {
+    "setVolume",
+    "setPlaybackSpeed",
+    "setTtsVoice",
+    "setAudioRouting",
+}
+
+
+class AisFrameClient:
+    """Fire-and-forget HTTP client for the Android frame.
+
+    Requests are queued per frame host and sent in order by one worker
+    per host, on the shared keep-alive aiohttp session. The number of
+    requests in flight over all hosts is bounded by a semaphore.
+    """
+
+    def __init__(
+        self,
+        hass,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        max_queue=DEFAULT_MAX_QUEUE,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        """Initialize the client."""
+        self.hass = hass
+        self._session = async_get_clientsession(hass)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._max_queue = max_queue
+        self._timeout = timeout
+        self._queues = {}
+        self._workers = {}
+        self._pending = {}
+        self._closed = False
+        self._stats = {
+            "queued": 0,
+            "sent": 0,
+            "failed": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "max_queue_depth": 0,
+            "last_latency_ms": None,
+        }
+        # ip -> dropped and coalesced requests of the frame host
+        self._host_stats = {}
+
+    @property
+    def stats(self):
+        """Return the backpressure metrics of the client."""
+        stats = dict(self._stats)
+        stats["queue_depth"] = sum(q.qsize() for q in self._queues.values())
+        stats["hosts"] = {
+            ip: {"queue_depth": queue.qsize(), **self._host_stats[ip]}
+            for ip, queue in self._queues.items()
+        }
+        return stats
+
+    @property
+    def state_attributes(self):
+        """Return the metrics as the attributes of the TTS status entity."""
+        stats = self.stats
+        attributes = {
+            "Frame queue depth": stats["queue_depth"],
+            "Frame queue max depth": stats["max_queue_depth"],
+            "Frame requests sent": stats["sent"],
+            "Frame requests failed": stats["failed"],
+            "Frame requests coalesced": stats["coalesced"],
+            "Frame requests dropped": stats["dropped"],
+            "Frame latency ms": stats["last_latency_ms"],
+        }
+        for ip, host_stats in stats["hosts"].items():
+            attributes[f"Frame {ip} queue depth"] = host_stats["queue_depth"]
+            attributes[f"Frame {ip} coalesced"] = host_stats["coalesced"]
+            attributes[f"Frame {ip} dropped"] = host_stats["dropped"]
+        return attributes
+
+    @callback
+    def async_update_state(self, now=None):
+        """Show the metrics on the TTS status entity, only if they changed.
+
+        The state and the other attributes of the entity are kept.
+        """
+        metrics = self.state_attributes
+        state = self.hass.states.get(STATS_ENTITY_ID)
+        if state is None:
+            self.hass.states.async_set(STATS_ENTITY_ID, STATE_UNKNOWN, metrics)
+            return
+        if all(state.attributes.get(name) == value for name, value in metrics.items()):
+            return
+        self.hass.states.async_set(
+            STATS_ENTITY_ID, state.state, {**state.attributes, **metrics}
+        )
+
+    def send(self, ip, path, payload, coalesce_key=None):
+        """Queue a request to the frame, safe to call from any thread."""
+        self.hass.loop.call_soon_threadsafe(
+            self.async_send, ip, path, payload, coalesce_key
+        )
+
+    @callback
+    def async_send(self, ip, path, payload, coalesce_key=None):
+        """Queue a request to the frame without waiting for the response."""
+        if self._closed:
+            return
+        if ip is None:
+            ip = "localhost"
+        if coalesce_key is not None:
+            pending_key = (ip, path, coalesce_key)
+            if pending_key in self._pending:
+                # the queued request is not sent yet, just update its payload
+                self._pending[pending_key] = payload
+                self._stats["coalesced"] += 1
+                self._host_stats[ip]["coalesced"] += 1
+                return
+            self._pending[pending_key] = payload
+        else:
+            pending_key = None
+
+        queue = self._queues.get(ip)
+        if queue is None:
+            queue = self._queues[ip] = asyncio.Queue()
+            self._host_stats[ip] = {"coalesced": 0, "dropped": 0}
+            # the worker runs for the whole session, it is not tracked by hass
+            self._workers[ip] = self.hass.loop.create_task(self._async_worker(ip))
+
+        if queue.qsize() >= self._max_queue:
+            # the frame is not keeping up, drop the oldest request
+            _, _, old_key, _ = queue.get_nowait()
+            queue.task_done()
+            if old_key is not None:
+                self._pending.pop(old_key, None)
+            self._stats["dropped"] += 1
+            self._host_stats[ip]["dropped"] += 1
+            _LOGGER.debug("Frame %s queue is full, dropping the oldest request", ip)
+
+        queue.put_nowait((path, payload, pending_key, time.monotonic()))
+        self._stats["queued"] += 1
+        if queue.qsize() > self._stats["max_queue_depth"]:
+            self._stats["max_queue_depth"] = queue.qsize()
+
+    async def _async_worker(self, ip):
+        """Send the queued requests for one frame host in order."""
+        queue = self._queues[ip]
+        base_url = ais_global.G_HTTP_REST_SERVICE_BASE_URL.format(ip)
+        while True:
+            path, payload, pending_key, queued_at = await queue.get()
+            if pending_key is not None:
+                payload = self._pending.pop(pending_key, payload)
+            try:
+                async with self._semaphore:
+                    with async_timeout.timeout(self._timeout):
+                        async with self._session.post(
+                            base_url + path, json=payload
+                        ) as resp:
+                            await resp.read()
+                self._stats["sent"] += 1
+            except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+                self._stats["failed"] += 1
+                _LOGGER.debug("Error sending %s to frame %s: %s", path, ip, err)
+            except Exception as err:  # pylint: disable=broad-except
+                # keep the worker alive for the next requests to the frame
+                self._stats["failed"] += 1
+                _LOGGER.error("Error sending %s to frame %s: %s", path, ip, err)
+            finally:
+                self._stats["last_latency_ms"] = round(
+                    (time.monotonic() - queued_at) * 1000
+                )
+                queue.task_done()
+
+    async def async_close(self):
+        """Stop the workers, requests still in the queues are discarded."""
+        self._closed = True
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers = {}
+        self._queues = {}
+        self._pending = {}
+
+
+@callback
+def async_setup_frame_client(hass):
+    """Create the frame client shared by the component."""
+    client = hass.data.get(DATA_FRAME_CLIENT)
+    if client is not None:
+        return client
+
+    client = hass.data[DATA_FRAME_CLIENT] = AisFrameClient(hass)
+    remove_update = async_track_time_interval(
+        hass, client.async_update_state, STATS_INTERVAL
+    )
+
+    async def async_close_client(event):
+        remove_update()
+        await client.async_close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_close_client)
+    return client
+
+
+def get_frame_client(hass):
+    """Return the frame client shared by the component."""
+    return hass.data[DATA_FRAME_CLIENT]
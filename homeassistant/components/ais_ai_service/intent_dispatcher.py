@@ -0,0 +1,109 @@
+"""Single pass dispatcher for the conversation and AIS intent utterances."""
+
+DATA_INTENT_DISPATCHERS = "ais_ai_service_intent_dispatchers"
+
+# characters ending the literal beginning of an utterance regex
+REGEX_SPECIAL_CHARS = frozenset("\\[](){}.*+?|^$")
+
+
+def leading_words(matcher):
+    """Return the literal words the utterance regex has to start with."""
+    pattern = matcher.pattern
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+    length = 0
+    for char in pattern:
+        if char in REGEX_SPECIAL_CHARS:
+            break
+        length += 1
+    words = pattern[:length].split(" ")
+    if pattern[length:] != "$":
+        # the last word is not complete, eg. stopni[e]
+        words = words[:-1]
+    if "" in words:
+        words = words[: words.index("")]
+    return tuple(word.lower() for word in words)
+
+
+class _TrieNode:
+    """Node of the utterance trie keyed by the leading literal words."""
+
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        """Initialize the node."""
+        self.children = {}
+        self.entries = []
+
+
+class IntentDispatcher:
+    """Route a text to the first matching utterance of the registered intents.
+
+    The utterance regexes are kept in a trie keyed by their literal leading
+    words. Each node holds, in the registration order, the regexes that may
+    match a text starting with the words of the node, so matching a text is
+    one walk down the trie and a try of only those regexes. This gives the
+    same match as trying all the regexes one by one. The trie is rebuilt
+    only when utterances are registered.
+    """
+
+    def __init__(self, data, key):
+        """Initialize the dispatcher for the intents stored in data[key]."""
+        self._data = data
+        self._key = key
+        self._signature = None
+        self._root = _TrieNode()
+
+    def _intents_signature(self, intents):
+        """Return a value that changes when utterances are registered."""
+        return id(intents), len(intents), sum(map(len, intents.values()))
+
+    def _build(self, intents):
+        """Build the trie of the utterance regexes."""
+        root = _TrieNode()
+        priority = 0
+        for intent_type, matchers in intents.items():
+            for matcher in matchers:
+                node = root
+                for word in leading_words(matcher):
+                    node = node.children.setdefault(word, _TrieNode())
+                node.entries.append((priority, intent_type, matcher))
+                priority += 1
+
+        # each node also gets the regexes of the nodes above it
+        def inherit(node, inherited):
+            node.entries = sorted(inherited + node.entries)
+            for child in node.children.values():
+                inherit(child, node.entries)
+
+        inherit(root, [])
+        self._root = root
+
+    def match(self, text):
+        """Return the intent type and the regex match for the text or None."""
+        intents = self._data.get(self._key, {})
+        signature = self._intents_signature(intents)
+        if signature != self._signature:
+            self._build(intents)
+            self._signature = signature
+
+        node = self._root
+        for word in text.lower().split(" "):
+            child = node.children.get(word)
+            if child is None:
+                break
+            node = child
+        for _, intent_type, matcher in node.entries:
+            match = matcher.match(text)
+            if match:
+                return intent_type, match
+        return None
+
+
+def get_intent_dispatcher(hass, domain):
+    """Return the dispatcher for the intents registered in hass.data[domain]."""
+    dispatchers = hass.data.setdefault(DATA_INTENT_DISPATCHERS, {})
+    dispatcher = dispatchers.get(domain)
+    if dispatcher is None:
+        dispatcher = dispatchers[domain] = IntentDispatcher(hass.data, domain)
+    return dispatcher
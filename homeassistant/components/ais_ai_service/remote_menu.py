@@ -0,0 +1,211 @@
+"""Menu of groups and entities navigated with the remote."""
+import bisect
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import callback
+
+DATA_REMOTE_MENU = "ais_ai_service_remote_menu"
+
+# group with all the entities of the domain
+DOMAIN_GROUPS = {
+    "sensor": "group.all_ais_sensors",
+    "person": "group.all_ais_persons",
+    "automation": "group.all_ais_automations",
+    "scene": "group.all_ais_scenes",
+    "switch": "group.all_ais_switches",
+    "light": "group.all_ais_lights",
+    "climate": "group.all_ais_climates",
+    "cover": "group.all_ais_covers",
+    "lock": "group.all_ais_locks",
+    "vacuum": "group.all_ais_vacuums",
+    "camera": "group.all_ais_cameras",
+    "fan": "group.all_ais_fans",
+}
+
+
+def domain_group_for(state):
+    """Return the domain group the entity is listed in or None."""
+    domain = state.domain
+    if domain == "sensor":
+        if state.attributes.get("device_class") is None:
+            return None
+    elif domain == "automation":
+        if state.entity_id.startswith("automation.ais_"):
+            return None
+    elif domain == "switch":
+        if state.entity_id == "switch.zigbee_tryb_parowania":
+            return None
+    return DOMAIN_GROUPS.get(domain)
+
+
+def menu_item(state):
+    """Return the menu item of the group."""
+    return {
+        "friendly_name": state.attributes.get("friendly_name"),
+        "order": state.attributes.get("order"),
+        "entity_id": state.entity_id,
+        "entities": state.attributes.get("entity_id"),
+        "context_key_words": state.attributes.get("context_key_words"),
+        "context_answer": state.attributes.get("context_answer"),
+        "context_suffix": state.attributes.get("context_suffix"),
+        "remote_group_view": state.attributes.get("remote_group_view"),
+        "player_mode": state.attributes.get("player_mode", ""),
+    }
+
+
+class AisRemoteMenu:
+    """Menu groups sorted by order, updated from state changed events.
+
+    The groups list and the sorted entity lists of the domain groups are
+    updated in place, so the references held by the remote navigation stay
+    valid and moving to the next or previous item is an index lookup.
+    """
+
+    def __init__(self):
+        """Initialize the menu."""
+        # menu groups sorted by order
+        self.groups = []
+        self._groups = {}
+        self._group_idx = {}
+        # remote group view -> menu groups of the view sorted by order
+        self._views = {}
+        self._view_idx = {}
+        # domain group entity_id -> sorted entity ids
+        self._members = {group_id: [] for group_id in DOMAIN_GROUPS.values()}
+
+    @callback
+    def async_update(self, entity_id, old_state, new_state):
+        """Update the menu with the state change."""
+        if entity_id.startswith("group."):
+            self._async_update_group(entity_id, new_state)
+            return
+
+        old_group = domain_group_for(old_state) if old_state is not None else None
+        new_group = domain_group_for(new_state) if new_state is not None else None
+        if old_group == new_group:
+            return
+        if old_group is not None:
+            members = self._members[old_group]
+            idx = bisect.bisect_left(members, entity_id)
+            if idx < len(members) and members[idx] == entity_id:
+                del members[idx]
+        if new_group is not None:
+            members = self._members[new_group]
+            idx = bisect.bisect_left(members, entity_id)
+            if idx == len(members) or members[idx] != entity_id:
+                members.insert(idx, entity_id)
+
+    @callback
+    def _async_update_group(self, entity_id, new_state):
+        """Add, update or remove the menu group."""
+        group = self._groups.get(entity_id)
+        if new_state is None or new_state.attributes.get("remote_group_view") is None:
+            if group is not None:
+                del self._groups[entity_id]
+                self._async_sort_groups()
+            return
+
+        item = menu_item(new_state)
+        if entity_id in self._members:
+            item["entities"] = self._members[entity_id]
+        if group is None:
+            self._groups[entity_id] = item
+            self._async_sort_groups()
+        elif group != item:
+            resort = (
+                group["order"] != item["order"]
+                or group["remote_group_view"] != item["remote_group_view"]
+            )
+            # update in place, the remote may hold a reference to the group
+            group.update(item)
+            if resort:
+                self._async_sort_groups()
+
+    @callback
+    def _async_sort_groups(self):
+        """Sort the menu groups by order."""
+        self.groups[:] = sorted(self._groups.values(), key=lambda item: item["order"])
+        self._group_idx = {}
+        self._views = {}
+        self._view_idx = {}
+        for idx, group in enumerate(self.groups):
+            view = self._views.setdefault(group["remote_group_view"], [])
+            self._group_idx[group["entity_id"]] = idx
+            self._view_idx[group["entity_id"]] = len(view)
+            view.append(group)
+
+    def group_index(self, entity_id):
+        """Return the position of the group in the menu or None."""
+        return self._group_idx.get(entity_id)
+
+    def get_group(self, entity_id):
+        """Return the menu group or None."""
+        return self._groups.get(entity_id)
+
+    def neighbour_group(self, view, entity_id, step):
+        """Return the group step positions away in the view, wrapping around.
+
+        If the group is not in the view the first or the last group of the
+        view is returned.
+        """
+        groups = self._views.get(view)
+        if not groups:
+            return None
+        group = self._groups.get(entity_id)
+        if group is None or group["remote_group_view"] != view:
+            return groups[0] if step > 0 else groups[-1]
+        return groups[(self._view_idx[entity_id] + step) % len(groups)]
+
+    def entity_index(self, group, entity_id):
+        """Return the position of the entity in the group or None."""
+        entities = group["entities"] or []
+        if group["entity_id"] in self._members:
+            idx = bisect.bisect_left(entities, entity_id)
+            if idx < len(entities) and entities[idx] == entity_id:
+                return idx
+            return None
+        try:
+            return entities.index(entity_id)
+        except ValueError:
+            return None
+
+
+@callback
+def async_setup_remote_menu(hass):
+    """Build the remote menu and keep it up to date."""
+    menu = hass.data.get(DATA_REMOTE_MENU)
+    if menu is not None:
+        return menu
+
+    menu = hass.data[DATA_REMOTE_MENU] = AisRemoteMenu()
+    for state in hass.states.async_all():
+        menu.async_update(state.entity_id, None, state)
+
+    @callback
+    def async_menu_changed_filter(event):
+        """Only groups and entities added or removed change the menu."""
+        return (
+            event.data["entity_id"].startswith("group.")
+            or event.data.get("old_state") is None
+            or event.data.get("new_state") is None
+            or event.data["old_state"].attributes.get("device_class")
+            != event.data["new_state"].attributes.get("device_class")
+        )
+
+    @callback
+    def async_state_changed(event):
+        menu.async_update(
+            event.data["entity_id"],
+            event.data.get("old_state"),
+            event.data.get("new_state"),
+        )
+
+    hass.bus.async_listen(
+        EVENT_STATE_CHANGED, async_state_changed, event_filter=async_menu_changed_filter
+    )
+    return menu
+
+
+def get_remote_menu(hass):
+    """Return the remote menu."""
+    return hass.data[DATA_REMOTE_MENU]
@@ -4,6 +4,7 @@ import xml.etree.ElementTree as XmlETree
 
 import feedparser
 
+from homeassistant.components.ais_dom import ais_global
 from homeassistant.components.media_player import BrowseMedia
 from homeassistant.components.media_player.const import (
     MEDIA_CLASS_DIRECTORY,
@@ -30,6 +31,7 @@ async def async_browse_media(
     media_content_type=None,
     media_content_id=None,
     ais_gate=None,
+    catalog=None,
 ):
     """Implement the media browsing helper."""
 
@@ -37,13 +39,13 @@ async def async_browse_media(
         return await async_ais_media_library()
 
     if media_content_id.startswith("ais_radio"):
-        return await async_ais_radio_library(media_content_id, ais_gate)
+        return await async_ais_radio_library(media_content_id, ais_gate, catalog)
 
     if media_content_id.startswith("ais_tunein"):
         return await async_ais_tunein_library(media_content_id, ais_gate)
 
     if media_content_id.startswith("ais_podcast"):
-        return await async_ais_podcast_library(media_content_id, ais_gate)
+        return await async_ais_podcast_library(media_content_id, ais_gate, catalog)
 
     if media_content_id.startswith("ais_audio_books"):
         return await async_ais_audio_books_library(media_content_id, ais_gate)
@@ -211,11 +213,37 @@ async def async_ais_audio_books_library(media_content_id, ais_gate) -> BrowseMed
     return root
 
 
-async def async_ais_podcast_library(media_content_id, ais_gate) -> BrowseMedia:
+async def async_get_audio_type(media_content_id, nature, ais_gate, catalog):
+    """Return the types from the AIS cloud catalog or from the gate."""
+    if catalog is None:
+        return await ais_gate.get_audio_type(media_content_id)
+    json_ws_resp = await catalog.async_audio_type(nature)
+    if json_ws_resp is None:
+        raise BrowseError("Can't load types: " + media_content_id)
+    return json_ws_resp
+
+
+async def async_get_audio_name(media_content_id, nature, ais_gate, catalog):
+    """Return the names from the AIS cloud catalog or from the gate."""
+    if catalog is None:
+        return await ais_gate.get_audio_name(media_content_id)
+    json_ws_resp = await catalog.async_audio_name(
+        nature, media_content_id.split("/", 1)[1]
+    )
+    if json_ws_resp is None:
+        raise BrowseError("Can't load names: " + media_content_id)
+    return json_ws_resp
+
+
+async def async_ais_podcast_library(
+    media_content_id, ais_gate, catalog=None
+) -> BrowseMedia:
     """Create response payload to describe contents of a podcast library."""
     if media_content_id == "ais_podcast":
         # get podcast types
-        json_ws_resp = await ais_gate.get_audio_type(media_content_id)
+        json_ws_resp = await async_get_audio_type(
+            media_content_id, ais_global.G_AN_PODCAST, ais_gate, catalog
+        )
         ais_podcast_types = []
         for item in json_ws_resp["data"]:
             ais_podcast_types.append(
@@ -239,7 +267,9 @@ async def async_ais_podcast_library(media_content_id, ais_gate) -> BrowseMedia:
         )
     elif media_content_id.count("/") == 1:
         # get podcasts for types
-        json_ws_resp = await ais_gate.get_audio_name(media_content_id)
+        json_ws_resp = await async_get_audio_name(
+            media_content_id, ais_global.G_AN_PODCAST, ais_gate, catalog
+        )
         ais_radio_stations = []
         for item in json_ws_resp["data"]:
             ais_radio_stations.append(
@@ -303,10 +333,14 @@ async def async_ais_podcast_library(media_content_id, ais_gate) -> BrowseMedia:
     return root
 
 
-async def async_ais_radio_library(media_content_id, ais_gate) -> BrowseMedia:
+async def async_ais_radio_library(
+    media_content_id, ais_gate, catalog=None
+) -> BrowseMedia:
     """Create response payload to describe contents of a radio library."""
     if media_content_id == "ais_radio":
-        json_ws_resp = await ais_gate.get_audio_type(media_content_id)
+        json_ws_resp = await async_get_audio_type(
+            media_content_id, ais_global.G_AN_RADIO, ais_gate, catalog
+        )
         ais_radio_types = []
         for item in json_ws_resp["data"]:
             ais_radio_types.append(
@@ -330,7 +364,9 @@ async def async_ais_radio_library(media_content_id, ais_gate) -> BrowseMedia:
         )
     else:
         # get radio station for type
-        json_ws_resp = await ais_gate.get_audio_name(media_content_id)
+        json_ws_resp = await async_get_audio_name(
+            media_content_id, ais_global.G_AN_RADIO, ais_gate, catalog
+        )
         ais_radio_stations = []
         for item in json_ws_resp["data"]:
             ais_radio_stations.append(
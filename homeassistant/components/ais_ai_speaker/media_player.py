@@ -2,6 +2,7 @@
 import logging
 from typing import Optional
 
+from homeassistant.components.ais_cloud.catalog import DATA_CATALOG
 from homeassistant.components.media_player import (
     SUPPORT_PAUSE,
     SUPPORT_PLAY,
@@ -337,6 +338,7 @@ class AisPlayerDevice(MediaPlayerEntity):
             media_content_type,
             media_content_id,
             self._ais_gate,
+            self.hass.data.get(DATA_CATALOG),
         )
         await self._ais_gate.cache_browse_media(result.as_dict())
         return result
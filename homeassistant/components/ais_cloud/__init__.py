@@ -11,13 +11,22 @@ import voluptuous as vol
 from homeassistant.components import websocket_api
 from homeassistant.components.ais_dom import ais_global
 from homeassistant.components.http.view import HomeAssistantView
-from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util.async_ import run_callback_threadsafe
+
+from .catalog import async_setup_catalog, get_catalog
 
 DOMAIN = "ais_cloud"
 _LOGGER = logging.getLogger(__name__)
 CLOUD_APP_URL = "https://" + ais_global.AIS_HOST + "/ords/f?p=100:1&x01=TOKEN:"
 
+# input number -> TTS setting in ais_global
+TTS_NUMBER_SETTINGS = {
+    "input_number.assistant_rate": "GLOBAL_TTS_RATE",
+    "input_number.assistant_tone": "GLOBAL_TTS_PITCH",
+}
+
 
 def check_url(url_address):
     # check the 301 redirection
@@ -34,6 +43,7 @@ async def async_setup(hass, config):
     hass.http.register_view(RestoreAisBackupView())
 
     """Initialize the radio station list."""
+    async_setup_catalog(hass)
     data = hass.data[DOMAIN] = AisColudData(hass)
     await data.async_get_types()
     #
@@ -145,81 +155,70 @@ async def async_setup(hass, config):
 
     hass.components.websocket_api.async_register_command(websocket_add_ais_media_source)
 
-    def state_changed(state_event):
-        """Called on state change"""
-        if ais_global.G_AIS_START_IS_DONE is False:
-            return
+    def assistant_voice_changed(state_event):
+        new_voice = state_event.data["new_state"].state
+        ais_global.GLOBAL_TTS_VOICE = ais_global.GLOBAL_TTS_VOICES.get(
+            new_voice, "pl-pl-x-oda-local"
+        )
+        # publish to frame
+        hass.services.call("ais_ai_service", "say_it", {"text": new_voice})
+        hass.services.call(
+            "ais_ai_service",
+            "publish_command_to_frame",
+            {"key": "setTtsVoice", "val": ais_global.GLOBAL_TTS_VOICE},
+        )
 
-        entity_id = state_event.data.get("entity_id")
-        if entity_id == "input_select.assistant_voice":
-            # old_voice = state_event.data["old_state"].state
-            new_voice = state_event.data["new_state"].state
-            if new_voice == "Jola online":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda-network"
-            elif new_voice == "Jola lokalnie":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda-local"
-            elif new_voice == "Celina":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#female_1-local"
-            elif new_voice == "Anżela":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#female_2-local"
-            elif new_voice == "Asia":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#female_3-local"
-            elif new_voice == "Sebastian":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#male_1-local"
-            elif new_voice == "Bartek":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#male_2-local"
-            elif new_voice == "Andrzej":
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda#male_3-local"
-            else:
-                ais_global.GLOBAL_TTS_VOICE = "pl-pl-x-oda-local"
-            # publish to frame
-            if ais_global.G_AIS_START_IS_DONE:
-                hass.services.call("ais_ai_service", "say_it", {"text": new_voice})
-            hass.services.call(
-                "ais_ai_service",
-                "publish_command_to_frame",
-                {"key": "setTtsVoice", "val": ais_global.GLOBAL_TTS_VOICE},
-            )
-        elif entity_id == "input_number.assistant_rate":
-            try:
-                ais_global.GLOBAL_TTS_RATE = float(hass.states.get(entity_id).state)
-            except Exception:
-                ais_global.GLOBAL_TTS_RATE = 1
-        elif entity_id == "input_number.assistant_tone":
-            try:
-                ais_global.GLOBAL_TTS_PITCH = float(hass.states.get(entity_id).state)
-            except Exception:
-                ais_global.GLOBAL_TTS_PITCH = 1
-        elif entity_id == "input_select.ais_android_wifi_network":
-            # take the password for wifi if value changed
-            if state_event.data["old_state"] is not None:
-                _old_state = state_event.data["old_state"].state
-                _new_state = state_event.data["new_state"].state
-                if _old_state != _new_state:
-                    ssid = hass.states.get(
-                        "input_select.ais_android_wifi_network"
-                    ).state.split(";")[0]
-                    password = ais_global.get_pass_for_ssid(ssid)
-                    hass.services.call(
-                        "input_text",
-                        "set_value",
-                        {
-                            "value": password,
-                            "entity_id": "input_text.ais_iot_device_wifi_password",
-                        },
-                    )
-        elif entity_id in (
-            "input_boolean.ais_quiet_mode",
-            "input_datetime.ais_quiet_mode_start",
-            "input_datetime.ais_quiet_mode_stop",
-        ):
-            hass.async_add_job(
-                hass.services.async_call(
-                    "ais_ai_service", "check_night_mode", {"timer": False}
+    def assistant_number_changed(state_event):
+        setting = TTS_NUMBER_SETTINGS[state_event.data["entity_id"]]
+        try:
+            value = float(state_event.data["new_state"].state)
+        except Exception:
+            value = 1
+        setattr(ais_global, setting, value)
+
+    def wifi_network_changed(state_event):
+        # take the password for wifi if value changed
+        if state_event.data["old_state"] is not None:
+            _old_state = state_event.data["old_state"].state
+            _new_state = state_event.data["new_state"].state
+            if _old_state != _new_state:
+                ssid = _new_state.split(";")[0]
+                password = ais_global.get_pass_for_ssid(ssid)
+                hass.services.call(
+                    "input_text",
+                    "set_value",
+                    {
+                        "value": password,
+                        "entity_id": "input_text.ais_iot_device_wifi_password",
+                    },
                 )
+
+    def quiet_mode_changed(state_event):
+        hass.add_job(
+            hass.services.async_call(
+                "ais_ai_service", "check_night_mode", {"timer": False}
             )
+        )
 
-    hass.bus.async_listen(EVENT_STATE_CHANGED, state_changed)
+    state_handlers = {
+        "input_select.assistant_voice": assistant_voice_changed,
+        "input_number.assistant_rate": assistant_number_changed,
+        "input_number.assistant_tone": assistant_number_changed,
+        "input_select.ais_android_wifi_network": wifi_network_changed,
+        "input_boolean.ais_quiet_mode": quiet_mode_changed,
+        "input_datetime.ais_quiet_mode_start": quiet_mode_changed,
+        "input_datetime.ais_quiet_mode_stop": quiet_mode_changed,
+    }
+
+    def state_changed(state_event):
+        """Called on state change of the AIS settings"""
+        if ais_global.G_AIS_START_IS_DONE is False:
+            return
+        if state_event.data["new_state"] is None:
+            return
+        state_handlers[state_event.data["entity_id"]](state_event)
+
+    async_track_state_change_event(hass, list(state_handlers), state_changed)
     return True
 
 
@@ -411,6 +410,7 @@ async def websocket_add_ais_media_source(hass, connection, msg):
     )
     if ais_answer.get("error", False):
         _LOGGER.error(ais_answer["message"])
+    get_catalog(hass).async_invalidate()
 
     connection.send_result(msg["id"], ais_answer)
     await hass.services.async_call(
@@ -797,37 +797,12 @@ class AisCloudWS:
 
 class AisCacheData:
     def __init__(self, hass):
-        """Initialize the files cache"""
+        """Initialize the cache, the catalog keeps the files in memory"""
         self.hass = hass
-        self.persistence_radio = "/dom/radio_stations.json"
-        self.persistence_podcast = "/dom/podcast.json"
-        self.persistence_news = "/dom/news_chanels.json"
-
-    def get_path(self, nature):
-        path = str(os.path.dirname(__file__))
-        if nature == ais_global.G_AN_RADIO:
-            path = path + self.persistence_radio
-        elif nature == ais_global.G_AN_PODCAST:
-            path = path + self.persistence_podcast
-        elif nature == ais_global.G_AN_NEWS:
-            path = path + self.persistence_news
-        return path
 
     def audio_type(self, nature):
-        # get types from cache file
-        path = self.get_path(nature)
-        data = None
-        if not os.path.isfile(path):
-            return None
-        else:
-            with open(path) as file:
-                data = json.loads(file.read())
-        return data
-
-    def store_audio_type(self, nature, json_data):
-        path = self.get_path(nature)
-        with open(path, "w") as outfile:
-            json.dump(json_data, outfile)
+        # get types from the catalog memory
+        return get_catalog(self.hass).cached_audio_type(nature)
 
     def audio(self, item, type, text_input):
         return None
@@ -841,54 +816,28 @@ class AisColudData:
         self.audio_name = None
         self.cloud = AisCloudWS(hass)
         self.cache = AisCacheData(hass)
+        self.catalog = get_catalog(hass)
         self.news_channels = []
 
     async def async_get_types(self):
-        # check if we have data stored in local files
-        # otherwise we should work in online mode and get data from cloud
-        # ----------------
-        # ----- RADIO ----
-        # ----------------
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_RADIO)
-        try:
-            json_ws_resp = ws_resp.json()
-            self.cache.store_audio_type(ais_global.G_AN_RADIO, json_ws_resp)
-            types = [ais_global.G_EMPTY_OPTION]
-        except Exception as e:
-            _LOGGER.warning("RADIO WS resp " + str(ws_resp) + " " + str(e))
-
-        # ----------------
-        # --- PODCASTS ---
-        # ----------------
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_PODCAST)
-        try:
-            json_ws_resp = ws_resp.json()
-            self.cache.store_audio_type(ais_global.G_AN_PODCAST, json_ws_resp)
-            types = [ais_global.G_EMPTY_OPTION]
-        except Exception as e:
-            _LOGGER.warning("PODCASTS WS resp " + str(ws_resp) + " " + str(e))
-
-        # ----------------
-        # ----- NEWS -----
-        # ----------------
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_NEWS)
-        try:
-            json_ws_resp = ws_resp.json()
-            self.cache.store_audio_type(ais_global.G_AN_NEWS, json_ws_resp)
-            types = [ais_global.G_EMPTY_OPTION]
-        except Exception as e:
-            _LOGGER.error("NEWS WS resp " + str(ws_resp) + " " + str(e))
+        # load the types stored in local files to memory
+        # and get the changes from the cloud in the background
+        for nature in (
+            ais_global.G_AN_RADIO,
+            ais_global.G_AN_PODCAST,
+            ais_global.G_AN_NEWS,
+        ):
+            await self.catalog.async_load(nature)
+            self.catalog.async_revalidate(nature)
 
     async def async_get_radio_types(self, call):
-        ws_resp_json = await self.cloud.async_audio_type(ais_global.G_AN_RADIO)
-        try:
-            types = [ais_global.G_FAVORITE_OPTION]
-            for item in ws_resp_json["data"]:
-                # TODO
+        json_ws_resp = await self.catalog.async_user_audio_type(ais_global.G_AN_RADIO)
+        types = [ais_global.G_FAVORITE_OPTION]
+        if json_ws_resp is None:
+            _LOGGER.warning("get_radio_types error")
+        else:
+            for item in json_ws_resp["data"]:
                 types.append(item["name"])
-        except Exception as e:
-            _LOGGER.warning("get_radio_types from cache")
-            types = self.cache.audio_type(ais_global.G_AN_RADIO)["data"]
 
         # populate list with all stations from selected type
         await self.hass.services.async_call(
@@ -911,11 +860,11 @@ class AisColudData:
             )
             return
 
-        ws_resp = self.cloud.audio_name(ais_global.G_AN_RADIO, call.data["radio_type"])
-        try:
-            json_ws_resp = ws_resp.json()
-        except Exception as e:
-            _LOGGER.warning("get_radio_names error " + str(e))
+        json_ws_resp = self.catalog.audio_name(
+            ais_global.G_AN_RADIO, call.data["radio_type"]
+        )
+        if json_ws_resp is None:
+            _LOGGER.warning("get_radio_names error " + call.data["radio_type"])
             return
 
         list_info = {}
@@ -952,15 +901,10 @@ class AisColudData:
             )
 
     def get_podcast_types(self, call):
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_PODCAST)
-        try:
-            json_ws_resp = ws_resp.json()
-            types = [ais_global.G_FAVORITE_OPTION]
-            for item in json_ws_resp["data"]:
-                types.append(item)
-        except Exception as e:
-            _LOGGER.warning("get_podcast_types from cache")
-            types = self.cache.audio_type(ais_global.G_AN_PODCAST)["data"]
+        json_ws_resp = self.catalog.audio_type(ais_global.G_AN_PODCAST)
+        types = [ais_global.G_FAVORITE_OPTION]
+        if json_ws_resp is not None:
+            types.extend(json_ws_resp["data"])
         # populate list with all podcast types
         self.hass.services.call(
             "input_select",
@@ -980,13 +924,11 @@ class AisColudData:
                 {"audio_source": ais_global.G_AN_PODCAST},
             )
             return
-        ws_resp = self.cloud.audio_name(
+        json_ws_resp = self.catalog.audio_name(
             ais_global.G_AN_PODCAST, call.data["podcast_type"]
         )
-        try:
-            json_ws_resp = ws_resp.json()
-        except Exception as e:
-            _LOGGER.warning("get_podcast_names problem " + str(e))
+        if json_ws_resp is None:
+            _LOGGER.warning("get_podcast_names problem " + call.data["podcast_type"])
             return
 
         list_info = {}
@@ -1235,6 +1177,9 @@ class AisColudData:
                     )
                     if ais_answer.get("error", False):
                         _LOGGER.error(ais_answer["message"])
+                    run_callback_threadsafe(
+                        self.hass.loop, self.catalog.async_invalidate
+                    ).result()
             self.hass.services.call("ais_cloud", "get_radio_types")
             self.hass.states.async_set("sensor.radiolist", state, new_attr)
 
@@ -1534,17 +1479,10 @@ class AisColudData:
         )
 
     def get_rss_news_category(self, call):
-        ws_resp = self.cloud.audio_type(ais_global.G_AN_NEWS)
-        try:
-            json_ws_resp = ws_resp.json()
-            self.cache.store_audio_type(ais_global.G_AN_NEWS, json_ws_resp)
-            types = [ais_global.G_EMPTY_OPTION]
-            for item in json_ws_resp["data"]:
-                types.append(item)
-
-        except Exception as e:
-            _LOGGER.warning("get_rss_news_category from cache")
-            types = self.cache.audio_type(ais_global.G_AN_NEWS)["data"]
+        json_ws_resp = self.catalog.audio_type(ais_global.G_AN_NEWS)
+        types = [ais_global.G_EMPTY_OPTION]
+        if json_ws_resp is not None:
+            types.extend(json_ws_resp["data"])
 
         self.hass.services.call(
             "input_select",
@@ -1567,13 +1505,13 @@ class AisColudData:
                 },
             )
             return
-        ws_resp = self.cloud.audio_name(
+        json_ws_resp = self.catalog.audio_name(
             ais_global.G_AN_NEWS, call.data["rss_news_category"]
         )
-        try:
-            json_ws_resp = ws_resp.json()
-        except Exception as e:
-            _LOGGER.warning("get_rss_news_channels problem " + str(e))
+        if json_ws_resp is None:
+            _LOGGER.warning(
+                "get_rss_news_channels problem " + call.data["rss_news_category"]
+            )
             return
 
         names = [ais_global.G_EMPTY_OPTION]
@@ -0,0 +1,301 @@
+"""Cached catalog of the radio, podcast and news types and names from AIS cloud."""
+import asyncio
+import json
+import logging
+import os
+import time
+
+import aiohttp
+import async_timeout
+
+from homeassistant.components.ais_dom import ais_global
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CATALOG = "ais_cloud_catalog"
+
+# seconds after which the cached list is revalidated with the cloud
+DEFAULT_TTL = 3600
+REQUEST_TIMEOUT = 10
+# seconds to wait for more changes before the nature file is written
+SAVE_DELAY = 10
+
+# one cache file per nature, shipped with the types to work offline
+NATURE_FILES = {
+    ais_global.G_AN_RADIO: "radio_stations.json",
+    ais_global.G_AN_PODCAST: "podcast.json",
+    ais_global.G_AN_NEWS: "news_chanels.json",
+}
+
+# key of the public types list in the nature cache
+TYPES_KEY = None
+# key of the types list with the private and shared types of the user
+USER_TYPES_KEY = ("audio_type2",)
+
+
+def nature_path(nature):
+    """Return the path of the cache file of the nature."""
+    return os.path.join(os.path.dirname(__file__), "dom", NATURE_FILES[nature])
+
+
+def _load_nature(nature):
+    """Read the cache file of the nature, in the executor."""
+    path = nature_path(nature)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path) as file:
+            return json.loads(file.read())
+    except (OSError, ValueError) as error:
+        _LOGGER.warning("Can't read the %s catalog cache: %s", nature, error)
+        return {}
+
+
+def _save_nature(nature, content):
+    """Write the cache file of the nature, in the executor."""
+    try:
+        with open(nature_path(nature), "w") as outfile:
+            json.dump(content, outfile)
+    except OSError as error:
+        _LOGGER.warning("Can't write the %s catalog cache: %s", nature, error)
+
+
+class AisCloudCatalog:
+    """Radio, podcast and news types and names kept in memory.
+
+    The lists are read once from the nature cache files and then served from
+    memory. A list older than the TTL is still returned at once and
+    revalidated with the cloud in the background with its ETag, a missing
+    list is fetched and concurrent callers of the same list share the
+    request. Changed lists are written back to the nature cache files.
+    """
+
+    def __init__(self, hass, ttl=DEFAULT_TTL):
+        """Initialize the catalog."""
+        self.hass = hass
+        self._ttl = ttl
+        self._url = "https://" + ais_global.AIS_HOST + "/ords/dom/dom/"
+        self._headers = {"Authorization": f"{ais_global.get_sercure_android_id_dom()}"}
+        # nature -> {key: {"data": ..., "etag": ..., "fetched": ...}}
+        self._entries = {}
+        self._loading = {}
+        self._fetching = {}
+        self._save_handles = {}
+
+    async def async_load(self, nature):
+        """Read the cache file of the nature to memory, only once."""
+        if nature in self._entries:
+            return
+        task = self._loading.get(nature)
+        if task is None:
+            task = self._loading[nature] = self.hass.async_add_executor_job(
+                _load_nature, nature
+            )
+        content = await task
+        if nature in self._entries:
+            return
+        self._loading.pop(nature, None)
+        entries = self._entries[nature] = {}
+        if "data" in content:
+            entries[TYPES_KEY] = {
+                "data": content["data"],
+                "etag": content.get("etag"),
+                "fetched": content.get("fetched", 0),
+            }
+        if "user_types" in content:
+            entries[USER_TYPES_KEY] = content["user_types"]
+        for a_type, entry in content.get("names", {}).items():
+            entries[a_type] = entry
+
+    async def async_audio_type(self, nature):
+        """Return the types of the nature, {"data": [...]} or None."""
+        return await self._async_get(nature, TYPES_KEY)
+
+    async def async_user_audio_type(self, nature):
+        """Return the types of the nature with the private and shared types.
+
+        The types are {"data": [{"name": ...}, ...]} or None.
+        """
+        return await self._async_get(nature, USER_TYPES_KEY)
+
+    async def async_audio_name(self, nature, a_type):
+        """Return the names of the type, {"data": [...]} or None."""
+        return await self._async_get(nature, a_type)
+
+    def audio_type(self, nature):
+        """Return the types of the nature, from a worker thread."""
+        return asyncio.run_coroutine_threadsafe(
+            self.async_audio_type(nature), self.hass.loop
+        ).result()
+
+    def audio_name(self, nature, a_type):
+        """Return the names of the type, from a worker thread."""
+        return asyncio.run_coroutine_threadsafe(
+            self.async_audio_name(nature, a_type), self.hass.loop
+        ).result()
+
+    def cached_audio_type(self, nature):
+        """Return the types of the nature already in memory or None."""
+        entry = self._entries.get(nature, {}).get(TYPES_KEY)
+        if entry is None:
+            return None
+        return {"data": entry["data"]}
+
+    @callback
+    def async_revalidate(self, nature, key=TYPES_KEY):
+        """Revalidate the list with the cloud in the background."""
+        return self._async_fetch(nature, key)
+
+    @callback
+    def async_invalidate(self):
+        """Forget the names and the user types, eg. after a media is added."""
+        for entries in self._entries.values():
+            for key in [key for key in entries if key is not TYPES_KEY]:
+                del entries[key]
+        for nature in self._entries:
+            self._async_schedule_save(nature)
+
+    async def _async_get(self, nature, key):
+        """Return the list from memory, fetch it only if it is missing."""
+        await self.async_load(nature)
+        entry = self._entries[nature].get(key)
+        if entry is None:
+            await self._async_fetch(nature, key)
+            entry = self._entries[nature].get(key)
+            if entry is None:
+                return None
+        elif time.time() - entry["fetched"] > self._ttl:
+            # stale while revalidate
+            self._async_fetch(nature, key)
+        return {"data": entry["data"]}
+
+    @callback
+    def _async_fetch(self, nature, key):
+        """Return the task fetching the list, shared by concurrent callers."""
+        task = self._fetching.get((nature, key))
+        if task is None:
+            task = self._fetching[(nature, key)] = self.hass.async_create_task(
+                self._async_fetch_entry(nature, key)
+            )
+        return task
+
+    def _request(self, nature, key):
+        """Return the method, url and payload of the list request."""
+        if key is TYPES_KEY:
+            return "GET", self._url + "audio_type", None, {"nature": nature}
+        if key == USER_TYPES_KEY:
+            return "POST", self._url + "audio_type2", {"nature": nature}, None
+        origin = "public"
+        a_type = key
+        if a_type.startswith("Moje "):
+            origin = "private"
+            a_type = a_type.replace("Moje ", "", 1)
+        elif a_type.startswith("Udostępnione "):
+            origin = "shared"
+            a_type = a_type.replace("Udostępnione ", "", 1)
+        payload = {"nature": nature, "origin": origin, "type": a_type}
+        return "POST", self._url + "audio_name2", payload, None
+
+    async def _async_fetch_entry(self, nature, key):
+        """Fetch the list from the cloud, conditionally if it is cached."""
+        try:
+            await self.async_load(nature)
+            entry = self._entries[nature].get(key)
+            headers = dict(self._headers)
+            if entry is not None and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            method, url, payload, params = self._request(nature, key)
+            session = async_get_clientsession(self.hass)
+            try:
+                with async_timeout.timeout(REQUEST_TIMEOUT):
+                    async with session.request(
+                        method, url, json=payload, params=params, headers=headers
+                    ) as resp:
+                        if resp.status == 304 and entry is not None:
+                            entry["fetched"] = time.time()
+                            return
+                        if resp.status != 200:
+                            _LOGGER.warning(
+                                "AIS catalog %s %s error code %s",
+                                nature,
+                                key,
+                                resp.status,
+                            )
+                            return
+                        data = (await resp.json(content_type=None))["data"]
+                        etag = resp.headers.get("ETag")
+            except (
+                asyncio.TimeoutError,
+                aiohttp.ClientError,
+                ValueError,
+                KeyError,
+            ) as error:
+                _LOGGER.warning(
+                    "Can't get the AIS catalog %s %s: %s", nature, key, error
+                )
+                return
+
+            self._entries[nature][key] = {
+                "data": data,
+                "etag": etag,
+                "fetched": time.time(),
+            }
+            if entry is None or entry["data"] != data or entry.get("etag") != etag:
+                self._async_schedule_save(nature)
+        finally:
+            self._fetching.pop((nature, key), None)
+
+    @callback
+    def _async_schedule_save(self, nature):
+        """Write the nature cache file after a while, once for many changes."""
+        if nature in self._save_handles:
+            return
+        self._save_handles[nature] = self.hass.loop.call_later(
+            SAVE_DELAY, self._async_save, nature
+        )
+
+    @callback
+    def _async_save(self, nature):
+        """Write the nature cache file in the executor."""
+        self._save_handles.pop(nature, None)
+        entries = self._entries.get(nature, {})
+        content = {"names": {k: v for k, v in entries.items() if isinstance(k, str)}}
+        types = entries.get(TYPES_KEY)
+        if types is not None:
+            content.update(types)
+        user_types = entries.get(USER_TYPES_KEY)
+        if user_types is not None:
+            content["user_types"] = user_types
+        self.hass.async_add_executor_job(_save_nature, nature, content)
+
+    @callback
+    def async_flush(self):
+        """Write the pending changes now."""
+        for nature, handle in list(self._save_handles.items()):
+            handle.cancel()
+            self._async_save(nature)
+
+
+@callback
+def async_setup_catalog(hass):
+    """Create the catalog shared by the AIS components."""
+    catalog = hass.data.get(DATA_CATALOG)
+    if catalog is not None:
+        return catalog
+
+    catalog = hass.data[DATA_CATALOG] = AisCloudCatalog(hass)
+
+    @callback
+    def async_flush_catalog(event):
+        catalog.async_flush()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_flush_catalog)
+    return catalog
+
+
+def get_catalog(hass):
+    """Return the catalog shared by the AIS components."""
+    return hass.data[DATA_CATALOG]
@@ -20,6 +20,17 @@ G_DRIVE_SHARED_WITH_ME = "Udostępnione dla mnie"
 GLOBAL_TTS_RATE = 1
 GLOBAL_TTS_PITCH = 1
 GLOBAL_TTS_VOICE = "pl-pl-x-oda-local"
+# assistant voice -> TTS voice on the frame
+GLOBAL_TTS_VOICES = {
+    "Jola online": "pl-pl-x-oda-network",
+    "Jola lokalnie": "pl-pl-x-oda-local",
+    "Celina": "pl-pl-x-oda#female_1-local",
+    "Anżela": "pl-pl-x-oda#female_2-local",
+    "Asia": "pl-pl-x-oda#female_3-local",
+    "Sebastian": "pl-pl-x-oda#male_1-local",
+    "Bartek": "pl-pl-x-oda#male_2-local",
+    "Andrzej": "pl-pl-x-oda#male_3-local",
+}
 
 # audio nature
 G_AN_RADIO = "Radio"
@@ -13,8 +13,20 @@ import subprocess
 import time
 
 from homeassistant.components.ais_dom import ais_global
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 
 from .config_flow import configured_drivers
+from .dir_index import AisDirectoryIndex
+from .media_cache import COVERS_DIR, INDEX_FILE, AisMediaCache
+from .rclone_jobs import (
+    DEFAULT_CHECKERS,
+    DEFAULT_TRANSFERS,
+    JOB_MOUNT,
+    JOB_REMOVE,
+    JOB_SYNC,
+    async_setup_rclone_jobs,
+    rclone_sync_args,
+)
 
 DOMAIN = "ais_drives_service"
 G_LOCAL_FILES_ROOT = "/data/data/pl.sviete.dom/files/home/dom"
@@ -27,7 +39,7 @@ G_RCLONE_CONF = "--config=" + G_RCLONE_CONF_FILE
 G_RCLONE_URL_TO_STREAM = "http://127.0.0.1:8080/"
 G_DRIVE_CLIENT_ID = None
 G_DRIVE_SECRET = None
-G_COVER_FILE = "/data/data/pl.sviete.dom/files/home/AIS/www/cover.jpg"
+G_DEFAULT_COVER = "/static/icons/tile-win-310x150.png"
 G_RCLONE_REMOTES_LONG = []
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,14 +71,40 @@ async def async_setup(hass, config):
     data = hass.data[DOMAIN] = LocalData(hass)
     await data.async_load_all(hass)
 
+    # list the drives in the background and watch the folders for changes
+    hass.async_add_executor_job(
+        data.dir_index.start,
+        [
+            G_LOCAL_FILES_ROOT + "/dysk-wewnętrzny",
+            G_LOCAL_FILES_ROOT + "/dyski-wymienne",
+            G_LOCAL_FILES_ROOT + "/dyski-zdalne",
+        ],
+    )
+
+    def stop_dir_index(event):
+        data.dir_index.stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, stop_dir_index)
+
     # register services
     def browse_path(call):
         _LOGGER.debug("browse_path")
         data.browse_path(call)
 
-    def sync_locations(call):
+    async def sync_locations(call):
         _LOGGER.debug("sync_locations")
-        data.sync_locations(call)
+        await data.async_sync_locations(call)
+
+    async def rclone_cancel_job(call):
+        _LOGGER.debug("rclone_cancel_job")
+        job_id = call.data.get("id")
+        if job_id is not None:
+            try:
+                job_id = int(job_id)
+            except (TypeError, ValueError):
+                _LOGGER.error("Invalid rclone job id: %s", job_id)
+                return
+        data.rclone_jobs.async_cancel(job_id)
 
     def play_next(call):
         _LOGGER.debug("play_next")
@@ -96,6 +134,11 @@ async def async_setup(hass, config):
         _LOGGER.debug("remote_delete_item")
         data.remote_delete_item(True)
 
+    def remote_search_item(call):
+        _LOGGER.debug("remote_search_item")
+        if "prefix" in call.data:
+            data.remote_search_item(call.data["prefix"], True)
+
     def rclone_mount_drive(call):
         _LOGGER.debug("rclone_mount_drive")
         if "name" in call.data:
@@ -114,6 +157,7 @@ async def async_setup(hass, config):
     hass.services.async_register(DOMAIN, "rclone_remove_drive", rclone_remove_drive)
     hass.services.async_register(DOMAIN, "browse_path", browse_path)
     hass.services.async_register(DOMAIN, "sync_locations", sync_locations)
+    hass.services.async_register(DOMAIN, "rclone_cancel_job", rclone_cancel_job)
     hass.services.async_register(DOMAIN, "play_next", play_next)
     hass.services.async_register(DOMAIN, "play_prev", play_prev)
     hass.services.async_register(DOMAIN, "remote_next_item", remote_next_item)
@@ -121,6 +165,7 @@ async def async_setup(hass, config):
     hass.services.async_register(DOMAIN, "remote_select_item", remote_select_item)
     hass.services.async_register(DOMAIN, "remote_cancel_item", remote_cancel_item)
     hass.services.async_register(DOMAIN, "remote_delete_item", remote_delete_item)
+    hass.services.async_register(DOMAIN, "remote_search_item", remote_search_item)
 
     return True
 
@@ -439,50 +484,6 @@ def rclone_set_auth_ftp(drive_name, host, port, user_name, password):
         return "ERROR: " + str(e)
 
 
-def file_tags_extract(path):
-    import mutagen.flac
-    import mutagen.id3
-    import mutagen.mp4
-
-    global G_COVER_FILE
-    dir_www = "/data/data/pl.sviete.dom/files/home/AIS/www/"
-    dir_name = os.path.basename(os.path.dirname(path)).replace(" ", "")
-    ret_path = "/local/" + dir_name + "_cover.jpg"
-    f_length = 0
-    # file info
-    try:
-        fi = mutagen.File(path)
-        f_length = str(fi.info.length)
-    except Exception as e:
-        _LOGGER.error("Error " + str(e))
-
-    if G_COVER_FILE == dir_www + dir_name + "_cover.jpg":
-        return ret_path, f_length
-    # remove all .jpg
-    jpgs = os.listdir(dir_www)
-    for jpg in jpgs:
-        if jpg.endswith("_cover.jpg"):
-            os.remove(os.path.join(dir_www, jpg))
-
-    # generate the cover
-    G_COVER_FILE = dir_www + dir_name + "_cover.jpg"
-    try:
-        id3 = mutagen.id3.ID3(path)
-        open(G_COVER_FILE, "wb").write(id3.getall("APIC")[0].data)
-    except Exception:
-        try:
-            flac = mutagen.flac.FLAC(path)
-            open(G_COVER_FILE, "wb").write(flac.pictures[0].data)
-        except Exception:
-            try:
-                mp4 = mutagen.mp4.MP4(path)
-                open(G_COVER_FILE, "wb").write(mp4["covr"][0])
-            except Exception as e:
-                _LOGGER.info("Error " + str(e))
-
-    return ret_path, f_length
-
-
 class LocalData:
     """Class to hold local folders and files data."""
 
@@ -496,6 +497,11 @@ class LocalData:
         self.rclone_pexpect_stream = None
         self.file_path = None
         self.seek_position = 0
+        self.media_cache = AisMediaCache(
+            hass.config.path(".dom", INDEX_FILE), hass.config.path("www", COVERS_DIR)
+        )
+        self.rclone_jobs = async_setup_rclone_jobs(hass)
+        self.dir_index = AisDirectoryIndex()
 
     def beep(self):
         self.hass.services.call(
@@ -517,13 +523,19 @@ class LocalData:
             _url = self.current_path
             if _url.startswith("/data/data/pl.sviete.dom/files/home/dom/dyski-zdalne/"):
                 self.say("Pobieram i odtwarzam")
-            # TODO search the album and title ...
-            album_cover_path, file_length = file_tags_extract(self.current_path)
+            media = self.media_cache.get(self.current_path) or {}
+            self.media_cache.save()
+            tags = media.get("tags", {})
+            file_length = 0
+            if media.get("duration") is not None:
+                file_length = str(media["duration"])
             _audio_info = {
                 "NAME": os.path.basename(self.current_path),
                 "MEDIA_SOURCE": ais_global.G_AN_LOCAL,
-                "ALBUM_NAME": os.path.basename(os.path.dirname(self.current_path)),
-                "IMAGE_URL": album_cover_path,
+                "ALBUM_NAME": tags.get(
+                    "album", os.path.basename(os.path.dirname(self.current_path))
+                ),
+                "IMAGE_URL": self.media_cache.cover_url(media) or G_DEFAULT_COVER,
                 "DURATION": file_length,
                 "media_content_id": _url,
                 "lookup_url": self.current_path,
@@ -592,19 +604,18 @@ class LocalData:
 
     # browse files on local folder
     def display_current_items(self, say):
-        local_items = []
-        try:
-            local_items = os.scandir(self.current_path)
-        except Exception as e:
-            _LOGGER.error("list_dir error: " + str(e))
-        si = sorted(local_items, key=lambda en: en.name)
+        si = self.dir_index.children(self.current_path)
         items_info = [
             {"name": ".", "icon": "", "path": G_LOCAL_FILES_ROOT},
             {"name": "..", "icon": "", "path": ".."},
         ]
-        for i in si:
+        for name, is_dir in si:
             items_info.append(
-                {"name": i.name, "icon": self.get_icon(i), "path": i.path}
+                {
+                    "name": name,
+                    "icon": self.get_icon(name, is_dir),
+                    "path": os.path.join(self.current_path, name),
+                }
             )
         self.hass.states.set(
             "sensor.ais_drives",
@@ -615,6 +626,9 @@ class LocalData:
             slen = len(si)
             self.say(get_pozycji_variety(slen))
 
+        # read the tags and covers of the folder in the background
+        self.hass.add_job(self.media_cache.index_folder, self.current_path)
+
         # call from bookmarks now (since we have files from folder) we need to play the file
         if self.file_path is not None:
             self.hass.services.call(
@@ -623,12 +637,12 @@ class LocalData:
                 {"path": self.file_path, "seek_position": self.seek_position},
             )
 
-    def get_icon(self, entry):
-        if entry.is_dir():
+    def get_icon(self, name, is_dir):
+        if is_dir:
             return "folder"
-        elif entry.name.lower().endswith(".txt"):
+        elif name.lower().endswith(".txt"):
             return "file-document-outline"
-        elif entry.name.lower().endswith((".mp3", ".wav", ".mp4", ".flv")):
+        elif name.lower().endswith((".mp3", ".wav", ".mp4", ".flv")):
             return "music-circle"
 
     def browse_path(self, call):
@@ -736,7 +750,7 @@ class LocalData:
                     + '"'
                 )
             os.system("mkdir -p /data/data/pl.sviete.dom/dom_cloud_drives/" + name)
-            os.system(rclone_cmd_mount)
+            self.rclone_jobs.queue(JOB_MOUNT, name, [rclone_cmd_mount])
 
         else:
             self.say("Nie masz dodanego dysku zdalnego o nazwie " + name)
@@ -747,102 +761,93 @@ class LocalData:
         for r in remotes:
             if name == r["name"]:
                 drive_exist = True
+        commands = []
         if drive_exist:
             # Delete an existing remote
             fix_rclone_config_permissions()
-            rclone_cmd_remove_drive = (
-                "rclone config delete " + name + " " + G_RCLONE_CONF
-            )
-            os.system(rclone_cmd_remove_drive)
+            commands.append("rclone config delete " + name + " " + G_RCLONE_CONF)
         else:
             _LOGGER.error("rclone_remove_drive: NO drive in Rclone, name: " + name)
 
         # fusermount
         if not ais_global.has_root():
-            os.system("fusermount -u /data/data/pl.sviete.dom/dom_cloud_drives/" + name)
+            commands.append(
+                "fusermount -u /data/data/pl.sviete.dom/dom_cloud_drives/" + name
+            )
         else:
-            os.system(
+            commands.append(
                 'su -mm -c "export PATH=$PATH:/data/data/pl.sviete.dom/files/usr/bin/; '
                 + ' fusermount -u /data/data/pl.sviete.dom/dom_cloud_drives/"'
                 + name
             )
 
         # delete drive folder
-        os.system("rm -rf /data/data/pl.sviete.dom/dom_cloud_drives/" + name)
+        commands.append("rm -rf /data/data/pl.sviete.dom/dom_cloud_drives/" + name)
+        # one shell line, the next steps are done even if the previous failed
+        self.rclone_jobs.queue(JOB_REMOVE, name, ["; ".join(commands)])
 
-    def sync_locations(self, call):
+    async def async_sync_locations(self, call):
         if "source_path" not in call.data:
             _LOGGER.error("No source_path")
-            return []
+            return
         if "dest_path" not in call.data:
             _LOGGER.error("No dest_path")
-            return []
+            return
         if "say" in call.data:
             say = call.data["say"]
         else:
             say = False
 
         if say:
-            self.say(
-                "Synchronizuję lokalizację "
-                + call.data["source_path"]
-                + " z "
-                + call.data["dest_path"]
-                + " modyfikuję tylko "
-                + call.data["source_path"]
+            await self.hass.services.async_call(
+                "ais_ai_service",
+                "say_it",
+                {
+                    "text": "Synchronizuję lokalizację "
+                    + call.data["source_path"]
+                    + " z "
+                    + call.data["dest_path"]
+                    + " modyfikuję tylko "
+                    + call.data["source_path"]
+                },
             )
 
-        rclone_cmd = [
-            "rclone",
-            "sync",
+        rclone_cmd = rclone_sync_args(
             call.data["source_path"],
             call.data["dest_path"],
-            "--transfers=1",
-            "--stats=0",
+            call.data.get("transfers", DEFAULT_TRANSFERS),
+            call.data.get("checkers", DEFAULT_CHECKERS),
             G_RCLONE_CONF,
-        ]
+        )
         #
-        fix_rclone_config_permissions()
+        await self.hass.async_add_executor_job(fix_rclone_config_permissions)
         #
-        proc = subprocess.run(
-            rclone_cmd, encoding="utf-8", stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        self.rclone_jobs.async_queue(
+            JOB_SYNC,
+            call.data["dest_path"],
+            [rclone_cmd],
+            done_text="Synchronizacja zakończona.",
         )
 
-        #  will wait for the process to complete and then we are going to return the output
-        if "" != proc.stderr:
-            self.say("Błąd podczas synchronizacji: " + proc.stderr)
-        else:
-            self.say("Synchronizacja zakończona.")
-
     def play_next(self, call):
-        state = self.hass.states.get("sensor.ais_drives")
-        attr = state.attributes
-        files = attr.get("files", [])
-        l_idx = 0
-        i = 0
-        for f in files:
-            i = i + 1
-            if f["path"].replace(G_LOCAL_FILES_ROOT, "") == state.state:
-                l_idx = i
-        if l_idx == len(files):
-            l_idx = min(2, len(files))
-        self._browse_path(files[l_idx]["path"], True)
+        self._play_sibling(1)
 
     def play_prev(self, call):
-        state = self.hass.states.get("sensor.ais_drives")
-        attr = state.attributes
-        files = attr.get("files", [])
-        l_idx = 0
-        i = 0
-        for f in files:
-            i = i + 1
-            if f["path"].replace(G_LOCAL_FILES_ROOT, "") == state.state:
-                l_idx = i
-        if l_idx == 3:
-            l_idx = len(files) - 1
+        self._play_sibling(-1)
+
+    def _play_sibling(self, step):
+        if os.path.isdir(self.current_path):
+            # first or last item of the folder
+            si = self.dir_index.children(self.current_path)
+            if len(si) == 0:
+                self.say("brak pozycji")
+                return
+            path = os.path.join(self.current_path, si[0 if step > 0 else -1][0])
         else:
-            l_idx = l_idx - 2
-        self._browse_path(files[l_idx]["path"], True)
+            path = self.dir_index.sibling(self.current_path, step)
+            if path is None:
+                return
+        self._browse_path(path, True)
 
     def get_item_name(self, path):
         path = path.rstrip("/")
@@ -911,6 +916,27 @@ class LocalData:
         else:
             self._browse_path(files[self.selected_item_idx]["path"], say)
 
+    def remote_search_item(self, prefix, say):
+        """Go to the first item of the current folder starting with the prefix."""
+        if os.path.isdir(self.current_path):
+            folder = self.current_path
+        else:
+            folder = os.path.dirname(self.current_path)
+        names = self.dir_index.search(folder, prefix, limit=1)
+        if len(names) == 0:
+            if say:
+                self.say("Brak pozycji " + prefix)
+            return
+        if folder != self.current_path:
+            self._browse_path(folder, False)
+        path = os.path.join(folder, names[0])
+        position = self.dir_index.position(path)
+        if position is not None:
+            # the folder items start after "." and ".."
+            self.selected_item_idx = position + 2
+        if say:
+            self.say(self.get_item_name(path))
+
     def remote_cancel_item(self, say):
         self._browse_path("..", say)
 
@@ -940,6 +966,7 @@ class LocalData:
                 from pathlib import Path
 
                 parent_path = str(Path(path).parent)
+                self.dir_index.invalidate(parent_path)
                 self._browse_path(parent_path, False)
 
             else:
@@ -0,0 +1,213 @@
+"""Index of the folders on the local, USB and remote drives."""
+import bisect
+import logging
+import os
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+# folders below the roots listed in the background on start
+PRELOAD_DEPTH = 2
+# the watched folders are refreshed by inotify, the others when their
+# mtime changes, eg. the rclone mounts where inotify does not work
+MAX_WATCHES = 4096
+
+
+class DirListing:
+    """Sorted children of one folder."""
+
+    __slots__ = ("names", "is_dir", "keys", "key_idx", "mtime", "watched")
+
+    def __init__(self, children, mtime):
+        """Initialize the listing from (name, is_dir) sorted by name."""
+        self.names = [name for name, _ in children]
+        self.is_dir = [is_dir for _, is_dir in children]
+        # lower case names sorted for the prefix search
+        by_key = sorted((name.lower(), idx) for idx, name in enumerate(self.names))
+        self.keys = [key for key, _ in by_key]
+        self.key_idx = [idx for _, idx in by_key]
+        self.mtime = mtime
+        self.watched = False
+
+
+class AisDirectoryIndex:
+    """Sorted listings of the folders, kept up to date in the background.
+
+    A folder is listed once, the listing gives the children, the next or
+    previous sibling of a child and the children with a name prefix with
+    a binary search. The methods are called from the executor.
+    """
+
+    def __init__(self):
+        """Initialize the index."""
+        self._lock = threading.RLock()
+        self._listings = {}
+        self._wm = None
+        self._notifier = None
+        self._watches = {}
+
+    def start(self, roots):
+        """Start the inotify watches and list the roots in the background."""
+        try:
+            import pyinotify
+        except ImportError:
+            _LOGGER.info("No pyinotify, the folders are checked by mtime")
+        else:
+            index = self
+
+            class EventHandler(pyinotify.ProcessEvent):
+                def process_default(self, event):
+                    index.invalidate(event.path)
+
+            self._wm = pyinotify.WatchManager()
+            self._notifier = pyinotify.ThreadedNotifier(self._wm, EventHandler())
+            self._notifier.daemon = True
+            self._notifier.start()
+
+        for root in roots:
+            self._preload(root, PRELOAD_DEPTH)
+
+    def stop(self):
+        """Stop the inotify thread."""
+        if self._notifier is not None:
+            self._notifier.stop()
+            self._notifier = None
+
+    def _preload(self, path, depth):
+        """List the folder and its subfolders up to the depth."""
+        listing = self.listing(path)
+        if listing is None or depth == 0:
+            return
+        for name, is_dir in zip(listing.names, listing.is_dir):
+            if is_dir:
+                self._preload(os.path.join(path, name), depth - 1)
+
+    def listing(self, path):
+        """Return the listing of the folder, list it only if it changed."""
+        path = path.rstrip("/") or "/"
+        with self._lock:
+            listing = self._listings.get(path)
+            if listing is not None and listing.watched:
+                return listing
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self.invalidate(path)
+            return None
+        if listing is not None and listing.mtime == mtime:
+            return listing
+
+        # watch before the listing to not miss a change made meanwhile
+        wd = self._watch(path)
+        children = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    children.append((entry.name, is_dir))
+        except OSError as e:
+            _LOGGER.error("list_dir error: " + str(e))
+            return None
+        children.sort()
+        listing = DirListing(children, mtime)
+        with self._lock:
+            # a change during the listing removes the watch, then the listing
+            # may be stale and is checked by its mtime instead
+            listing.watched = wd is not None and self._watches.get(path) == wd
+            self._listings[path] = listing
+        return listing
+
+    def _watch(self, path):
+        """Watch the folder with inotify, return the watch or None if not possible."""
+        if self._wm is None:
+            return None
+        with self._lock:
+            if path in self._watches:
+                return self._watches[path]
+            if len(self._watches) >= MAX_WATCHES:
+                return None
+        import pyinotify
+
+        mask = (
+            pyinotify.IN_CREATE
+            | pyinotify.IN_DELETE
+            | pyinotify.IN_MOVED_FROM
+            | pyinotify.IN_MOVED_TO
+            | pyinotify.IN_DELETE_SELF
+            | pyinotify.IN_MOVE_SELF
+        )
+        try:
+            wdd = self._wm.add_watch(path, mask, quiet=False)
+        except Exception as e:
+            _LOGGER.debug("Can't watch %s: %s", path, e)
+            return None
+        wd = wdd.get(path, -1)
+        if wd < 0:
+            return None
+        with self._lock:
+            self._watches[path] = wd
+        return wd
+
+    def invalidate(self, path):
+        """Forget the listing of the folder, it is listed again when needed."""
+        path = path.rstrip("/") or "/"
+        with self._lock:
+            self._listings.pop(path, None)
+            wd = self._watches.pop(path, None)
+        if wd is not None and self._wm is not None:
+            try:
+                self._wm.rm_watch(wd, quiet=True)
+            except Exception:
+                pass
+
+    def children(self, path):
+        """Return the (name, is_dir) children of the folder sorted by name."""
+        listing = self.listing(path)
+        if listing is None:
+            return []
+        return list(zip(listing.names, listing.is_dir))
+
+    def position(self, path):
+        """Return the position of the child in its sorted folder or None."""
+        parent, name = os.path.split(path.rstrip("/"))
+        listing = self.listing(parent)
+        if listing is None:
+            return None
+        idx = bisect.bisect_left(listing.names, name)
+        if idx < len(listing.names) and listing.names[idx] == name:
+            return idx
+        return None
+
+    def sibling(self, path, step):
+        """Return the path of the child step positions away, wrapping around."""
+        parent, name = os.path.split(path.rstrip("/"))
+        listing = self.listing(parent)
+        if listing is None or not listing.names:
+            return None
+        idx = bisect.bisect_left(listing.names, name)
+        if idx < len(listing.names) and listing.names[idx] == name:
+            idx = (idx + step) % len(listing.names)
+        elif step > 0:
+            idx = idx % len(listing.names)
+        else:
+            idx = (idx - 1) % len(listing.names)
+        return os.path.join(parent, listing.names[idx])
+
+    def search(self, path, prefix, limit=None):
+        """Return the names of the children starting with the prefix."""
+        listing = self.listing(path)
+        if listing is None:
+            return []
+        prefix = prefix.lower()
+        start = bisect.bisect_left(listing.keys, prefix)
+        names = []
+        for pos in range(start, len(listing.keys)):
+            if not listing.keys[pos].startswith(prefix):
+                break
+            names.append(listing.names[listing.key_idx[pos]])
+            if limit is not None and len(names) >= limit:
+                break
+        return names
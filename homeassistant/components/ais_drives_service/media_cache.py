@@ -0,0 +1,287 @@
+"""Metadata and cover art cache of the media files on the drives."""
+from collections import OrderedDict
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE = ".ais_media_cache.json"
+INDEX_VERSION = 1
+COVERS_DIR = "ais_media_cache"
+COVERS_URL = "/local/" + COVERS_DIR + "/"
+# disk space for the cover thumbnails, the least recently played go first
+DEFAULT_DISK_BUDGET = 50 * 1024 * 1024
+MAX_ENTRIES = 50000
+THUMBNAIL_SIZE = (300, 300)
+
+MEDIA_EXTENSIONS = (
+    ".mp3",
+    ".flac",
+    ".m4a",
+    ".mp4",
+    ".ogg",
+    ".opus",
+    ".wav",
+    ".aac",
+    ".wma",
+)
+
+# tag -> keys of the tag in ID3, Vorbis comments and MP4
+TAG_KEYS = {
+    "title": ("TIT2", "title", "\xa9nam"),
+    "artist": ("TPE1", "artist", "\xa9ART"),
+    "album": ("TALB", "album", "\xa9alb"),
+}
+
+
+def media_key(path, stat):
+    """Return the cache key of the file version."""
+    key = f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}"
+    return hashlib.sha1(key.encode("utf-8", "surrogateescape")).hexdigest()
+
+
+def extract_media_info(path):
+    """Return the duration, tags and cover art of the file, read with mutagen."""
+    import mutagen
+
+    duration = None
+    tags = {}
+    cover = None
+    try:
+        media = mutagen.File(path)
+    except Exception as e:
+        _LOGGER.error("Error " + str(e))
+        return duration, tags, cover
+    if media is None:
+        return duration, tags, cover
+
+    info = getattr(media, "info", None)
+    if info is not None:
+        duration = getattr(info, "length", None)
+
+    media_tags = media.tags or {}
+    for name, keys in TAG_KEYS.items():
+        for key in keys:
+            try:
+                value = media_tags.get(key)
+            except Exception:
+                value = None
+            if value:
+                tags[name] = str(value[0] if isinstance(value, list) else value)
+                break
+
+    try:
+        if getattr(media, "pictures", None):
+            cover = media.pictures[0].data
+        elif hasattr(media_tags, "getall") and media_tags.getall("APIC"):
+            cover = media_tags.getall("APIC")[0].data
+        elif "covr" in media_tags:
+            cover = bytes(media_tags["covr"][0])
+    except Exception as e:
+        _LOGGER.info("Error " + str(e))
+    return duration, tags, cover
+
+
+def make_thumbnail(data):
+    """Return the cover scaled down to a JPEG thumbnail."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.thumbnail(THUMBNAIL_SIZE)
+        out = io.BytesIO()
+        image.convert("RGB").save(out, format="JPEG", quality=85)
+        return out.getvalue()
+    except Exception as e:
+        _LOGGER.info("Error " + str(e))
+        return data
+
+
+class AisMediaCache:
+    """Duration, tags and cover thumbnails of the media files.
+
+    The entries are keyed by the path, mtime and size of the file, so a
+    changed file is read again. The covers are stored by the hash of the
+    thumbnail, an album shares one file. The least recently used entries
+    are dropped when the covers are over the disk budget. The methods do
+    file IO and are called from the executor.
+    """
+
+    def __init__(self, index_path, covers_dir, disk_budget=DEFAULT_DISK_BUDGET):
+        """Initialize the cache."""
+        self._index_path = index_path
+        self._covers_dir = covers_dir
+        self._disk_budget = disk_budget
+        self._lock = threading.RLock()
+        # key -> entry, the least recently used first
+        self._entries = OrderedDict()
+        # path -> key of the cached version of the file
+        self._paths = {}
+        # cover file -> [size, number of entries]
+        self._covers = {}
+        self._covers_size = 0
+        self._indexing = set()
+        self._loaded = False
+        self._dirty = False
+
+    def load(self):
+        """Read the index file, only once."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not os.path.isfile(self._index_path):
+                return
+            try:
+                with open(self._index_path) as file:
+                    index = json.loads(file.read())
+            except (OSError, ValueError) as e:
+                _LOGGER.warning("Can't read the media cache: " + str(e))
+                return
+            if index.get("version") != INDEX_VERSION:
+                return
+            for key, entry in index.get("entries", []):
+                cover = entry.get("cover")
+                if cover is not None and not self._add_cover_ref(cover):
+                    continue
+                self._entries[key] = entry
+                self._paths[entry["path"]] = key
+
+    def save(self):
+        """Write the index file if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            content = {
+                "version": INDEX_VERSION,
+                "entries": list(self._entries.items()),
+            }
+            self._dirty = False
+        tmp_path = self._index_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as outfile:
+                json.dump(content, outfile)
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            _LOGGER.warning("Can't write the media cache: " + str(e))
+
+    def get(self, path):
+        """Return the entry of the file, read the file only if it is not cached."""
+        self.load()
+        try:
+            key = media_key(path, os.stat(path))
+        except OSError as e:
+            _LOGGER.error("Error " + str(e))
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        duration, tags, cover = extract_media_info(path)
+        cover_name = None
+        if cover is not None:
+            cover_name = self._store_cover(make_thumbnail(cover))
+        entry = {"path": path, "duration": duration, "tags": tags, "cover": cover_name}
+        with self._lock:
+            old_key = self._paths.get(path)
+            if old_key is not None:
+                self._remove(old_key)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._paths[path] = key
+            if cover_name is not None:
+                self._add_cover_ref(cover_name)
+            self._dirty = True
+            self._evict()
+        return entry
+
+    def index_folder(self, folder):
+        """Cache the media files of the folder, in the background."""
+        with self._lock:
+            if folder in self._indexing:
+                return
+            self._indexing.add(folder)
+        try:
+            with os.scandir(folder) as entries:
+                paths = [
+                    entry.path
+                    for entry in entries
+                    if entry.name.lower().endswith(MEDIA_EXTENSIONS) and entry.is_file()
+                ]
+            for path in sorted(paths):
+                self.get(path)
+            self.save()
+        except OSError as e:
+            _LOGGER.info("Error " + str(e))
+        finally:
+            with self._lock:
+                self._indexing.discard(folder)
+
+    def cover_url(self, entry):
+        """Return the url of the cover of the entry or None."""
+        if entry is None or entry.get("cover") is None:
+            return None
+        return COVERS_URL + entry["cover"]
+
+    def _store_cover(self, data):
+        """Write the cover file named by its hash and return the name."""
+        name = hashlib.sha1(data).hexdigest()[:20] + ".jpg"
+        path = os.path.join(self._covers_dir, name)
+        if not os.path.isfile(path):
+            try:
+                os.makedirs(self._covers_dir, exist_ok=True)
+                with open(path, "wb") as outfile:
+                    outfile.write(data)
+            except OSError as e:
+                _LOGGER.warning("Can't write the cover: " + str(e))
+                return None
+        return name
+
+    def _add_cover_ref(self, name):
+        """Count the entry using the cover, False if the file is gone."""
+        cover = self._covers.get(name)
+        if cover is None:
+            try:
+                size = os.path.getsize(os.path.join(self._covers_dir, name))
+            except OSError:
+                return False
+            cover = self._covers[name] = [size, 0]
+            self._covers_size += size
+        cover[1] += 1
+        return True
+
+    def _remove(self, key):
+        """Drop the entry and the cover no other entry uses."""
+        entry = self._entries.pop(key)
+        if self._paths.get(entry["path"]) == key:
+            del self._paths[entry["path"]]
+        name = entry.get("cover")
+        if name is None or name not in self._covers:
+            return
+        cover = self._covers[name]
+        cover[1] -= 1
+        if cover[1] > 0:
+            return
+        del self._covers[name]
+        self._covers_size -= cover[0]
+        try:
+            os.remove(os.path.join(self._covers_dir, name))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop the least recently used entries over the budget."""
+        while self._entries and (
+            self._covers_size > self._disk_budget or len(self._entries) > MAX_ENTRIES
+        ):
+            self._remove(next(iter(self._entries)))
+            self._dirty = True
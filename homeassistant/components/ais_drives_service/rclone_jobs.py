@@ -0,0 +1,311 @@
+"""Queue of the rclone jobs run as async subprocesses."""
+import asyncio
+import itertools
+import json
+import logging
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RCLONE_JOBS = "ais_drives_service_rclone_jobs"
+SENSOR_RCLONE_JOBS = "sensor.ais_drives_rclone_jobs"
+
+JOB_SYNC = "sync"
+JOB_MOUNT = "mount"
+JOB_REMOVE = "remove"
+
+DEFAULT_TRANSFERS = 4
+DEFAULT_CHECKERS = 8
+# seconds between the rclone stats lines
+STATS_INTERVAL = 2
+# the mount runs in the foreground, if it is still alive after this
+# many seconds the drive is mounted and the next job can start
+MOUNT_START_TIMEOUT = 5
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_ERROR = "error"
+STATUS_CANCELLED = "cancelled"
+
+
+def rclone_sync_args(source, dest, transfers, checkers, conf):
+    """Return the rclone sync command streaming the stats as JSON logs."""
+    return [
+        "rclone",
+        "sync",
+        source,
+        dest,
+        "--transfers=" + str(transfers),
+        "--checkers=" + str(checkers),
+        "--stats=" + str(STATS_INTERVAL) + "s",
+        "--stats-log-level=NOTICE",
+        "--use-json-log",
+        conf,
+    ]
+
+
+class RcloneJob:
+    """Rclone operation waiting in the queue or running."""
+
+    def __init__(self, job_id, kind, name, commands, done_text=None):
+        """Initialize the job, commands is a list of argument lists or shell lines."""
+        self.job_id = job_id
+        self.kind = kind
+        self.name = name
+        self.commands = commands
+        self.done_text = done_text
+        self.status = STATUS_QUEUED
+        self.process = None
+        self.stats = {}
+        self.error = None
+
+    def as_dict(self):
+        """Return the job info shown in the sensor."""
+        return {
+            "id": self.job_id,
+            "kind": self.kind,
+            "name": self.name,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class AisRcloneJobs:
+    """Run the rclone jobs one by one without blocking the event loop.
+
+    The progress of a sync, read from the rclone JSON stats lines, and the
+    queue of the jobs are shown in the jobs sensor. A mount keeps running
+    in the background after the start, it is stopped on shutdown or when
+    the drive is removed.
+    """
+
+    def __init__(self, hass):
+        """Initialize the jobs queue."""
+        self.hass = hass
+        self._ids = itertools.count(1)
+        self._queue = asyncio.Queue()
+        self._jobs = {}
+        self._current = None
+        self._last = None
+        self._mounts = {}
+        self._worker = None
+
+    def queue(self, kind, name, commands, done_text=None):
+        """Add the job to the queue, safe to call from any thread."""
+        self.hass.loop.call_soon_threadsafe(
+            self.async_queue, kind, name, commands, done_text
+        )
+
+    @callback
+    def async_queue(self, kind, name, commands, done_text=None):
+        """Add the job to the queue and return its id."""
+        job = RcloneJob(next(self._ids), kind, name, commands, done_text)
+        self._jobs[job.job_id] = job
+        self._queue.put_nowait(job)
+        if self._worker is None:
+            # the worker runs for the whole session, it is not tracked by hass
+            self._worker = self.hass.loop.create_task(self._async_worker())
+        self._async_update_sensor()
+        return job.job_id
+
+    @callback
+    def async_cancel(self, job_id=None):
+        """Cancel the job, the running one if no id is given."""
+        job = self._current if job_id is None else self._jobs.get(job_id)
+        if job is None:
+            return False
+        if job.status == STATUS_QUEUED:
+            job.status = STATUS_CANCELLED
+            del self._jobs[job.job_id]
+        elif job.status == STATUS_RUNNING:
+            job.status = STATUS_CANCELLED
+            if job.process is not None and job.process.returncode is None:
+                job.process.terminate()
+        else:
+            return False
+        self._async_update_sensor()
+        return True
+
+    async def async_stop_mount(self, name):
+        """Stop the mount process of the drive."""
+        process = self._mounts.pop(name, None)
+        if process is not None and process.returncode is None:
+            process.terminate()
+            await process.wait()
+
+    async def _async_worker(self):
+        """Run the queued jobs in order."""
+        while True:
+            job = await self._queue.get()
+            if job.status == STATUS_CANCELLED:
+                continue
+            self._current = job
+            job.status = STATUS_RUNNING
+            self._async_update_sensor()
+            try:
+                if job.kind == JOB_REMOVE:
+                    await self.async_stop_mount(job.name)
+                for command in job.commands:
+                    await self._async_run(job, command)
+                    if job.status != STATUS_RUNNING:
+                        break
+                if job.status == STATUS_RUNNING:
+                    job.status = STATUS_DONE
+            except OSError as e:
+                job.status = STATUS_ERROR
+                job.error = str(e)
+            except Exception as e:  # pylint: disable=broad-except
+                # keep the worker alive for the next jobs
+                _LOGGER.exception("Rclone %s %s failed", job.kind, job.name)
+                job.status = STATUS_ERROR
+                job.error = str(e)
+                if job.process is not None and job.process.returncode is None:
+                    job.process.terminate()
+            self._jobs.pop(job.job_id, None)
+            self._current = None
+            self._last = job
+            self._async_update_sensor()
+            self._async_say_result(job)
+
+    async def _async_run(self, job, command):
+        """Run one command of the job, stream its stats and errors."""
+        if isinstance(command, str):
+            job.process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        else:
+            job.process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        process = job.process
+        reader = self.hass.loop.create_task(self._async_read_stderr(job, process))
+
+        if job.kind == JOB_MOUNT:
+            try:
+                await asyncio.wait_for(process.wait(), MOUNT_START_TIMEOUT)
+            except asyncio.TimeoutError:
+                # still running - mounted, the reader keeps draining the logs
+                self._mounts[job.name] = process
+                return
+        await process.wait()
+        await reader
+        if job.status == STATUS_RUNNING and process.returncode != 0:
+            job.status = STATUS_ERROR
+            if job.error is None:
+                job.error = "rclone exit code " + str(process.returncode)
+
+    async def _async_read_stderr(self, job, process):
+        """Read the log lines of the process until it ends."""
+        async for line in process.stderr:
+            self._async_process_line(job, line.decode(errors="replace").strip())
+
+    @callback
+    def _async_process_line(self, job, line):
+        """Read the rclone JSON log line."""
+        if not line:
+            return
+        try:
+            log = json.loads(line)
+        except ValueError:
+            # not a rclone json log, eg. shell error
+            job.error = line
+            return
+        if "stats" in log:
+            stats = log["stats"]
+            job.stats = {
+                "bytes": stats.get("bytes", 0),
+                "total_bytes": stats.get("totalBytes", 0),
+                "transfers": stats.get("transfers", 0),
+                "total_transfers": stats.get("totalTransfers", 0),
+                "checks": stats.get("checks", 0),
+                "total_checks": stats.get("totalChecks", 0),
+                "speed": round(stats.get("speed", 0)),
+                "eta": stats.get("eta"),
+                "errors": stats.get("errors", 0),
+            }
+            self._async_update_sensor()
+        elif log.get("level") == "error":
+            job.error = log.get("msg")
+
+    @callback
+    def _async_update_sensor(self):
+        """Show the running job progress and the queue."""
+        job = self._current
+        attrs = {
+            "queue": [
+                queued.as_dict()
+                for queued in self._jobs.values()
+                if queued.status == STATUS_QUEUED
+            ],
+            "mounts": list(self._mounts),
+        }
+        if job is None:
+            state = "idle"
+            if self._last is not None:
+                attrs["last_job"] = self._last.as_dict()
+        else:
+            state = job.kind
+            attrs.update(job.as_dict())
+            attrs.update(job.stats)
+            total = job.stats.get("total_bytes")
+            if total:
+                attrs["progress"] = round(job.stats["bytes"] * 100 / total)
+        self.hass.states.async_set(SENSOR_RCLONE_JOBS, state, attrs)
+
+    @callback
+    def _async_say_result(self, job):
+        """Say how the sync ended, log the errors of the other jobs."""
+        text = None
+        if job.status == STATUS_ERROR:
+            _LOGGER.error("Rclone %s %s error: %s", job.kind, job.name, job.error)
+            if job.kind == JOB_SYNC:
+                text = "Błąd podczas synchronizacji: " + str(job.error)
+        elif job.status == STATUS_DONE:
+            text = job.done_text
+        if text:
+            self.hass.async_create_task(
+                self.hass.services.async_call(
+                    "ais_ai_service", "say_it", {"text": text}
+                )
+            )
+
+    async def async_close(self):
+        """Cancel the jobs and stop the mounts."""
+        while not self._queue.empty():
+            self._queue.get_nowait().status = STATUS_CANCELLED
+        self.async_cancel()
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        for name in list(self._mounts):
+            await self.async_stop_mount(name)
+
+
+@callback
+def async_setup_rclone_jobs(hass):
+    """Create the rclone jobs queue."""
+    jobs = hass.data.get(DATA_RCLONE_JOBS)
+    if jobs is not None:
+        return jobs
+
+    jobs = hass.data[DATA_RCLONE_JOBS] = AisRcloneJobs(hass)
+    jobs._async_update_sensor()
+
+    async def async_close_jobs(event):
+        await jobs.async_close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_close_jobs)
+    return jobs
+
+
+def get_rclone_jobs(hass):
+    """Return the rclone jobs queue."""
+    return hass.data[DATA_RCLONE_JOBS]
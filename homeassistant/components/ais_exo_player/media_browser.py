@@ -4,6 +4,7 @@ import logging
 import async_timeout
 
 from homeassistant.components import ais_audiobooks_service, ais_cloud, media_source
+from homeassistant.components.ais_cloud.catalog import DATA_CATALOG
 import homeassistant.components.ais_dom.ais_global as ais_global
 from homeassistant.components.media_player import BrowseMedia
 from homeassistant.components.media_player.const import (
@@ -148,7 +149,7 @@ async def browse_media(hass, media_content_type=None, media_content_id=None):
         return ais_bookmarks_library(hass)
 
     if media_content_id.startswith("ais_radio"):
-        return ais_radio_library(hass, media_content_id)
+        return await ais_radio_library(hass, media_content_id)
 
     if media_content_id.startswith("ais_tunein"):
         return await ais_tunein_library(hass, media_content_id)
@@ -410,12 +411,21 @@ async def ais_audio_books_library(hass, media_content_id) -> BrowseMedia:
             raise BrowseError("Can't load chapters: " + str(e))
 
 
+def _get_catalog(hass):
+    """Return the AIS cloud catalog, it is there only with ais_cloud loaded."""
+    catalog = hass.data.get(DATA_CATALOG)
+    if catalog is None:
+        raise BrowseError("AIS cloud catalog is not available")
+    return catalog
+
+
 async def ais_podcast_library(hass, media_content_id) -> BrowseMedia:
-    ais_cloud_ws = ais_cloud.AisCloudWS(hass)
+    catalog = _get_catalog(hass)
     if media_content_id == "ais_podcast":
         # get podcast types
-        ws_resp = ais_cloud_ws.audio_type(ais_global.G_AN_PODCAST)
-        json_ws_resp = ws_resp.json()
+        json_ws_resp = await catalog.async_audio_type(ais_global.G_AN_PODCAST)
+        if json_ws_resp is None:
+            raise BrowseError("Can't load podcast types")
         ais_podcast_types = []
         for item in json_ws_resp["data"]:
             media_class = MEDIA_CLASS_PODCAST
@@ -473,10 +483,11 @@ async def ais_podcast_library(hass, media_content_id) -> BrowseMedia:
         return root
     elif media_content_id.count("/") == 1:
         # get podcasts for types
-        ws_resp = ais_cloud_ws.audio_name(
+        json_ws_resp = await catalog.async_audio_name(
             ais_global.G_AN_PODCAST, media_content_id.replace("ais_podcast/", "")
         )
-        json_ws_resp = ws_resp.json()
+        if json_ws_resp is None:
+            raise BrowseError("Can't load podcasts: " + media_content_id)
         ais_radio_stations = []
         for item in json_ws_resp["data"]:
             ais_radio_stations.append(
@@ -548,12 +559,13 @@ async def ais_podcast_library(hass, media_content_id) -> BrowseMedia:
             raise BrowseError("Timeout when reading RSS %s", lookup_url)
 
 
-def ais_radio_library(hass, media_content_id) -> BrowseMedia:
-    ais_cloud_ws = ais_cloud.AisCloudWS(hass)
+async def ais_radio_library(hass, media_content_id) -> BrowseMedia:
+    catalog = _get_catalog(hass)
     if media_content_id == "ais_radio":
         # get
-        ws_resp = ais_cloud_ws.audio_type(ais_global.G_AN_RADIO)
-        json_ws_resp = ws_resp.json()
+        json_ws_resp = await catalog.async_audio_type(ais_global.G_AN_RADIO)
+        if json_ws_resp is None:
+            raise BrowseError("Can't load radio types")
         # ais_radio_types = [ais_global.G_FAVORITE_OPTION]
         ais_radio_types = []
         for item in json_ws_resp["data"]:
@@ -611,10 +623,11 @@ def ais_radio_library(hass, media_content_id) -> BrowseMedia:
         return root
     else:
         # get radio station for type
-        ws_resp = ais_cloud_ws.audio_name(
+        json_ws_resp = await catalog.async_audio_name(
             ais_global.G_AN_RADIO, media_content_id.replace("ais_radio/", "")
         )
-        json_ws_resp = ws_resp.json()
+        if json_ws_resp is None:
+            raise BrowseError("Can't load radio stations: " + media_content_id)
         ais_radio_stations = []
         for item in json_ws_resp["data"]:
             ais_radio_stations.append(
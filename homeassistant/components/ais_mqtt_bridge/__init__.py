@@ -18,6 +18,7 @@ async def async_setup(hass: HomeAssistant, config: dict):
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up MQTT BRIDGE from a config entry."""
     hass.data[DOMAIN][entry.entry_id] = entry
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     for component in PLATFORMS:
         hass.async_create_task(
@@ -41,3 +42,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Reload the bridge when the options are changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -9,7 +9,8 @@ from homeassistant.components import ais_cloud
 from homeassistant.const import CONF_NAME
 from homeassistant.core import callback
 
-from .const import DOMAIN
+from .const import CONF_MAX_QUEUE, CONF_MAX_RATE, DOMAIN
+from .forwarder import DEFAULT_MAX_QUEUE, DEFAULT_MAX_RATE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,3 +66,39 @@ class AisMqttFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             """Continue bridge configuration with broker settings."""
             return self.async_create_entry(title="AIS MQTT Bridge", data=broker_config)
         return self.async_show_form(step_id="authentication")
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle a option flow for AIS MQTT BRIDGE."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry):
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the forwarding limits."""
+        mqtt_options = self.config_entry.options
+        max_rate = mqtt_options.get(CONF_MAX_RATE, DEFAULT_MAX_RATE)
+        max_queue = mqtt_options.get(CONF_MAX_QUEUE, DEFAULT_MAX_QUEUE)
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_MAX_RATE, default=max_rate): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=1000)
+                    ),
+                    vol.Required(CONF_MAX_QUEUE, default=max_queue): vol.All(
+                        vol.Coerce(int), vol.Range(min=10, max=100000)
+                    ),
+                }
+            ),
+        )
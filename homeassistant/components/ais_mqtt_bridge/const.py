@@ -1,3 +1,6 @@
 """Constants for the AIS MQTT BRIDGE integration."""
 
 DOMAIN = "ais_mqtt_bridge"
+
+CONF_MAX_RATE = "max_rate"
+CONF_MAX_QUEUE = "max_queue"
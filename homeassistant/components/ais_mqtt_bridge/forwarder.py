@@ -0,0 +1,155 @@
+"""Rate limited forwarding of the local MQTT messages to the AIS cloud broker."""
+import asyncio
+from collections import OrderedDict
+import itertools
+import logging
+
+import paho.mqtt.client as ais_mqtt
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUE = 1000
+# messages per second sent to the cloud, 0 - no limit
+DEFAULT_MAX_RATE = 50
+# seconds between the batches, a lower max rate sends a batch of one
+# message less often
+BATCH_INTERVAL = 0.1
+
+# topics where only the last value matters
+COALESCE_SUFFIXES = ("/state", "/status", "/availability", "/LWT", "/config")
+
+
+def is_state_topic(topic, retain):
+    """Return True if a newer message on the topic replaces the older one."""
+    return retain or topic.endswith(COALESCE_SUFFIXES)
+
+
+class AisMqttForwarder:
+    """Bounded queue of the messages for the cloud, sent in rate limited batches.
+
+    A state message waiting in the queue is replaced by a newer message on
+    the same topic. When the queue is full the oldest message is dropped.
+    While the cloud connection is down the messages wait in the queue, a
+    message the client does not accept goes back to the front of the queue.
+    """
+
+    def __init__(
+        self,
+        hass,
+        publish,
+        is_connected,
+        max_queue=DEFAULT_MAX_QUEUE,
+        max_rate=DEFAULT_MAX_RATE,
+    ):
+        """Initialize the forwarder.
+
+        publish(topic, payload) sends the message and returns the result code.
+        """
+        self.hass = hass
+        self._publish = publish
+        self._is_connected = is_connected
+        self._max_queue = max_queue
+        self._max_rate = max_rate
+        # key -> (topic, payload, queued at), the topic is the key of the
+        # state messages, the other messages get a unique key
+        self._pending = OrderedDict()
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._worker = None
+        self._stats = {
+            "forwarded": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "errors": 0,
+            "max_queue_depth": 0,
+            "last_latency_ms": None,
+            "max_latency_ms": 0,
+        }
+
+    @property
+    def stats(self):
+        """Return the forwarding metrics."""
+        stats = dict(self._stats)
+        stats["queue_depth"] = len(self._pending)
+        return stats
+
+    @callback
+    def async_start(self):
+        """Start sending the queued messages."""
+        if self._worker is None:
+            # the worker runs as long as the bridge, it is not tracked by hass
+            self._worker = self.hass.loop.create_task(self._async_worker())
+
+    async def async_stop(self):
+        """Stop sending, the queued messages are discarded."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        self._pending.clear()
+
+    @callback
+    def async_forward(self, topic, payload, retain=False):
+        """Queue the message for the cloud."""
+        now = self.hass.loop.time()
+        if is_state_topic(topic, retain):
+            key = topic
+            queued = self._pending.get(key)
+            if queued is not None:
+                # keep the place in the queue and the time of the first value
+                self._pending[key] = (topic, payload, queued[2])
+                self._stats["coalesced"] += 1
+                return
+        else:
+            key = (topic, next(self._seq))
+
+        if len(self._pending) >= self._max_queue:
+            self._pending.popitem(last=False)
+            self._stats["dropped"] += 1
+        self._pending[key] = (topic, payload, now)
+        if len(self._pending) > self._stats["max_queue_depth"]:
+            self._stats["max_queue_depth"] = len(self._pending)
+        self._wakeup.set()
+
+    @callback
+    def async_connected(self):
+        """Send the messages queued while the cloud was not connected."""
+        self._wakeup.set()
+
+    async def _async_worker(self):
+        """Send the queued messages in batches, not faster than the max rate."""
+        loop = self.hass.loop
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending and self._is_connected():
+                started = loop.time()
+                if self._max_rate:
+                    batch = max(1, int(self._max_rate * BATCH_INTERVAL))
+                    interval = batch / self._max_rate
+                else:
+                    batch = len(self._pending)
+                    interval = BATCH_INTERVAL
+                for _ in range(min(batch, len(self._pending))):
+                    key, (topic, payload, queued) = self._pending.popitem(last=False)
+                    try:
+                        result = self._publish(topic, payload)
+                    except Exception as e:  # pylint: disable=broad-except
+                        self._stats["errors"] += 1
+                        _LOGGER.debug("Error publishing %s to AIS: %s", topic, e)
+                        continue
+                    if result != ais_mqtt.MQTT_ERR_SUCCESS:
+                        # eg. the broker has just dropped, send it again later
+                        self._stats["errors"] += 1
+                        _LOGGER.debug("Error publishing %s to AIS: %s", topic, result)
+                        self._pending[key] = (topic, payload, queued)
+                        self._pending.move_to_end(key, last=False)
+                        break
+                    self._stats["forwarded"] += 1
+                    latency = round((loop.time() - queued) * 1000)
+                    self._stats["last_latency_ms"] = latency
+                    if latency > self._stats["max_latency_ms"]:
+                        self._stats["max_latency_ms"] = latency
+                await asyncio.sleep(max(0, interval - (loop.time() - started)))
@@ -8,7 +8,8 @@ import homeassistant.components.mqtt as hass_mqtt
 from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 
-from .const import DOMAIN
+from .const import CONF_MAX_QUEUE, CONF_MAX_RATE, DOMAIN
+from .forwarder import DEFAULT_MAX_QUEUE, DEFAULT_MAX_RATE, AisMqttForwarder
 
 _LOGGER = logging.getLogger(__name__)
 SCAN_INTERVAL = timedelta(minutes=1)
@@ -19,13 +20,14 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     _LOGGER.debug("AIS MQTT BRIDGE sensor, async_setup_entry")
     config_mqtt_settings = hass.data[DOMAIN][config_entry.entry_id]
     mqtt_settings = config_mqtt_settings.data
-    async_add_entities([AisMqttSoftBridge(hass, mqtt_settings)], True)
+    mqtt_options = config_mqtt_settings.options
+    async_add_entities([AisMqttSoftBridge(hass, mqtt_settings, mqtt_options)], True)
 
 
 class AisMqttSoftBridge(Entity):
     """AIS Mqtt Soft Bridge representation."""
 
-    def __init__(self, hass, mqtt_settings):
+    def __init__(self, hass, mqtt_settings, mqtt_options):
         """Sensor initialization."""
         self._username = mqtt_settings["user"]
         self._password = mqtt_settings["token"]
@@ -42,6 +44,13 @@ class AisMqttSoftBridge(Entity):
         self._ais_mqtt_connection_code = -1
         self._sub_state = None
         self._try_to_connect_no = 0
+        self._forwarder = AisMqttForwarder(
+            hass,
+            self.publish_to_ais,
+            self.is_connected_to_ais,
+            max_queue=mqtt_options.get(CONF_MAX_QUEUE, DEFAULT_MAX_QUEUE),
+            max_rate=mqtt_options.get(CONF_MAX_RATE, DEFAULT_MAX_RATE),
+        )
 
         # connection on start
         self._ais_mqtt_client = ais_mqtt.Client(
@@ -58,23 +67,28 @@ class AisMqttSoftBridge(Entity):
         )
         self._ais_mqtt_client.loop_start()
 
-    async def async_publish_to_ais(self, topic, payload):
-        if self._ais_mqtt_connection_code == 0:
-            self._ais_mqtt_client.publish(
-                topic=topic, payload=payload, qos=self._qos, retain=False
-            )
+    def is_connected_to_ais(self):
+        """Return True if the ais cloud broker is connected."""
+        return self._ais_mqtt_connection_code == 0
+
+    def publish_to_ais(self, topic, payload):
+        """Publish the message to the ais cloud broker, return the result code."""
+        info = self._ais_mqtt_client.publish(
+            topic=topic, payload=payload, qos=self._qos, retain=False
+        )
+        return info.rc
 
     @callback
-    async def hass_message_received(self, msg):
-        """Handle new MQTT messages."""
+    def hass_message_received(self, msg):
+        """Handle new MQTT messages, they are sent by the forwarder."""
         payload = msg.payload
         if type(payload) is bytes:
             payload = msg.payload.decode("utf-8")
-        self._ais_cloud_published = self._ais_cloud_published + 1
-        await self.async_publish_to_ais(msg.topic, payload)
+        self._forwarder.async_forward(msg.topic, payload, msg.retain)
 
     async def async_added_to_hass(self):
         """Subscribe to MQTT events."""
+        self._forwarder.async_start()
         await self._subscribe_topics()
 
     async def _subscribe_topics(self):
@@ -97,6 +111,7 @@ class AisMqttSoftBridge(Entity):
         self._sub_state = await hass_mqtt.subscription.async_unsubscribe_topics(
             self.hass, self._sub_state
         )
+        await self._forwarder.async_stop()
 
     @property
     def device_info(self):
@@ -148,10 +163,18 @@ class AisMqttSoftBridge(Entity):
     @property
     def device_state_attributes(self):
         """Return the attributes of the device."""
+        stats = self._forwarder.stats
         return {
             "MQTT packets sent": self._ais_cloud_published,
             "MQTT packets received": self._ais_cloud_received,
             "MQTT trying to connect": self._try_to_connect_no,
+            "MQTT queue depth": stats["queue_depth"],
+            "MQTT queue max depth": stats["max_queue_depth"],
+            "MQTT packets coalesced": stats["coalesced"],
+            "MQTT packets dropped": stats["dropped"],
+            "MQTT publish errors": stats["errors"],
+            "MQTT latency ms": stats["last_latency_ms"],
+            "MQTT max latency ms": stats["max_latency_ms"],
         }
 
     @property
@@ -167,6 +190,8 @@ class AisMqttSoftBridge(Entity):
         self._ais_mqtt_connection_code = result_code
         if result_code == 0:
             client_.subscribe("dom/#")
+            # send the messages queued while the connection was down
+            self.hass.loop.call_soon_threadsafe(self._forwarder.async_connected)
 
     def on_ais_disconnect(self, client_, userdata, result_code):
         """Handle connection result."""
@@ -20,41 +20,45 @@ async def async_setup(hass, config):
         )
     )
 
+    # the states are set at once, with one update time and context
+    states = []
+
+    def set_state(entity_id, state, attributes):
+        states.append((entity_id, state, attributes))
+
     # create sensors
-    hass.states.async_set("sensor.version_info", "", {"friendly_name": "Wersja"})
-    hass.states.async_set("sensor.ais_backup_info", 0, {})
-    hass.states.async_set("sensor.ais_db_connection_info", 0, {})
-    hass.states.async_set("sensor.ais_logs_settings_info", 0, {})
-    hass.states.async_set("sensor.ais_tv_mode", "", {})
-    hass.states.async_set("sensor.ais_tv_activity", "", {})
-    hass.states.async_set("sensor.ais_spotify_favorites_mode", "", {})
-    hass.states.async_set("sensor.ais_radio_origin", "private", {})
-    hass.states.async_set("sensor.ais_podcast_origin", "private", {})
-    hass.states.async_set(
+    set_state("sensor.version_info", "", {"friendly_name": "Wersja"})
+    set_state("sensor.ais_backup_info", 0, {})
+    set_state("sensor.ais_db_connection_info", 0, {})
+    set_state("sensor.ais_logs_settings_info", 0, {})
+    set_state("sensor.ais_tv_mode", "", {})
+    set_state("sensor.ais_tv_activity", "", {})
+    set_state("sensor.ais_spotify_favorites_mode", "", {})
+    set_state("sensor.ais_radio_origin", "private", {})
+    set_state("sensor.ais_podcast_origin", "private", {})
+    set_state(
         "sensor.ais_secure_android_id_dom",
         "",
         {"friendly_name": "Unikalny identyfikator bramki"},
     )
-    hass.states.async_set("sensor.ais_gate_model", "", {})
-    hass.states.async_set("sensor.selected_entity", "", {})
-    hass.states.async_set("sensor.ais_speech_status", "DONE", {})
-    hass.states.async_set(
-        "binary_sensor.ais_remote_button", "", {"friendly_name": "Kod przycisku"}
-    )
+    set_state("sensor.ais_gate_model", "", {})
+    set_state("sensor.selected_entity", "", {})
+    set_state("sensor.ais_speech_status", "DONE", {})
+    set_state("binary_sensor.ais_remote_button", "", {"friendly_name": "Kod przycisku"})
 
-    hass.states.async_set(
+    set_state(
         "sensor.internal_ip_address",
         "",
         {"friendly_name": "Lokalny adres IP", "icon": "mdi:access-point-network"},
     )
 
-    hass.states.async_set(
+    set_state(
         "sensor.local_host_name",
         "",
         {"friendly_name": "Lokalna nazwa hosta", "icon": "mdi:dns"},
     )
 
-    hass.states.async_set(
+    set_state(
         "sensor.gate_pairing_pin",
         "",
         {"friendly_name": "Kod PIN", "icon": "mdi:textbox-password"},
@@ -65,7 +69,7 @@ async def async_setup(hass, config):
     #
     # # # Mój Dom
     #
-    hass.states.async_set(
+    set_state(
         "group.all_ais_persons",
         "on",
         {
@@ -79,7 +83,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_switches",
         "",
         {
@@ -94,7 +98,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_lights",
         "",
         {
@@ -109,7 +113,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_sensors",
         "",
         {
@@ -123,7 +127,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_climates",
         "",
         {
@@ -135,7 +139,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_covers",
         "",
         {
@@ -147,7 +151,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_vacuums",
         "",
         {
@@ -159,7 +163,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_locks",
         "",
         {
@@ -171,7 +175,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_cameras",
         "",
         {
@@ -183,7 +187,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_fans",
         "",
         {
@@ -195,7 +199,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_devices",
         "",
         {
@@ -220,7 +224,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_automations",
         "on",
         {
@@ -232,7 +236,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.all_ais_scenes",
         "on",
         {
@@ -244,7 +248,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.day_info",
         "on",
         {
@@ -259,7 +263,7 @@ async def async_setup(hass, config):
     #
     # # # Audio
     #
-    hass.states.async_set(
+    set_state(
         "group.ais_favorites",
         "on",
         {
@@ -273,7 +277,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.ais_bookmarks",
         "on",
         {
@@ -287,7 +291,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.ais_rss_news_remote",
         "on",
         {
@@ -305,7 +309,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.local_audio",
         "on",
         {
@@ -319,7 +323,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.radio_player",
         "on",
         {
@@ -335,7 +339,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.podcast_player",
         "on",
         {
@@ -355,7 +359,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.audiobooks_player",
         "on",
         {
@@ -375,7 +379,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.music_player",
         "on",
         {
@@ -401,7 +405,7 @@ async def async_setup(hass, config):
     # # # Ustawienia
     #
 
-    hass.states.async_set(
+    set_state(
         "group.internet_status",
         "on",
         {
@@ -424,7 +428,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.ais_add_iot_device",
         "on",
         {
@@ -447,7 +451,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.audio_player",
         "on",
         {
@@ -466,7 +470,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.ais_tts_configuration",
         "on",
         {
@@ -490,7 +494,7 @@ async def async_setup(hass, config):
     #
     # # # System i Pomoc
     #
-    hass.states.async_set(
+    set_state(
         "group.dom_system_version",
         "on",
         {
@@ -514,7 +518,7 @@ async def async_setup(hass, config):
         },
     )
 
-    hass.states.async_set(
+    set_state(
         "group.ais_rss_help_remote",
         "on",
         {
@@ -528,6 +532,8 @@ async def async_setup(hass, config):
         },
     )
 
+    hass.states.async_set_many(states)
+
     # LOG settings
     try:
         with open(
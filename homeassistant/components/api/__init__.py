@@ -225,7 +225,7 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        return self.json_raw(b"[%s]" % b",".join(state.as_json() for state in states))
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -243,7 +243,7 @@ class APIEntityStateView(HomeAssistantView):
 
         state = request.app["hass"].states.get(entity_id)
         if state:
-            return self.json(state)
+            return self.json_raw(state.as_json())
         return self.json_message("Entity not found.", HTTP_NOT_FOUND)
 
     async def post(self, request, entity_id):
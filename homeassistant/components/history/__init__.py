@@ -15,8 +15,11 @@ from homeassistant.components import websocket_api
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder import history, models as history_models
 from homeassistant.components.recorder.statistics import (
+    PERIOD_HOUR,
+    STATISTICS_TABLES,
     list_statistic_ids,
     statistics_during_period,
+    statistics_during_period_columnar,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
@@ -98,6 +101,7 @@ async def async_setup(hass, config):
     conf = config.get(DOMAIN, {})
 
     filters = sqlalchemy_filter_from_include_exclude_conf(conf)
+    hass.data[DOMAIN] = filters
 
     use_include_order = conf.get(CONF_ORDER)
 
@@ -109,6 +113,7 @@ async def async_setup(hass, config):
         ws_get_statistics_during_period
     )
     hass.components.websocket_api.async_register_command(ws_get_list_statistic_ids)
+    hass.components.websocket_api.async_register_command(ws_get_history_during_period)
 
     return True
 
@@ -124,6 +129,8 @@ class LazyState(history_models.LazyState):
         vol.Required("start_time"): str,
         vol.Optional("end_time"): str,
         vol.Optional("statistic_ids"): [str],
+        vol.Optional("period", default=PERIOD_HOUR): vol.In(STATISTICS_TABLES),
+        vol.Optional("columnar", default=False): bool,
     }
 )
 @websocket_api.async_response
@@ -152,15 +159,72 @@ async def ws_get_statistics_during_period(
         end_time = None
 
     statistics = await hass.async_add_executor_job(
-        statistics_during_period,
+        statistics_during_period_columnar
+        if msg["columnar"]
+        else statistics_during_period,
         hass,
         start_time,
         end_time,
         msg.get("statistic_ids"),
+        msg["period"],
     )
     connection.send_result(msg["id"], statistics)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/history_during_period",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): [cv.entity_id],
+        vol.Optional("resolution"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_get_history_during_period(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle columnar history websocket command."""
+    start_time_str = msg["start_time"]
+    end_time_str = msg.get("end_time")
+
+    start_time = dt_util.parse_datetime(start_time_str)
+    if start_time:
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str:
+        end_time = dt_util.parse_datetime(end_time_str)
+        if end_time:
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = None
+
+    if start_time > dt_util.utcnow():
+        connection.send_result(msg["id"], [])
+        return
+
+    result = await hass.async_add_executor_job(
+        history.get_significant_states_columnar,
+        hass,
+        start_time,
+        end_time,
+        msg.get("entity_ids"),
+        hass.data.get(DOMAIN),
+        msg["include_start_time_state"],
+        msg["significant_changes_only"],
+        msg.get("resolution"),
+    )
+    connection.send_result(msg["id"], result)
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/list_statistic_ids",
@@ -234,6 +298,18 @@ class HistoryPeriodView(HomeAssistantView):
 
         minimal_response = "minimal_response" in request.query
 
+        columnar = "columnar" in request.query
+        resolution = None
+        resolution_str = request.query.get("resolution")
+        if resolution_str:
+            try:
+                resolution = int(resolution_str)
+            except ValueError:
+                resolution = 0
+            if resolution < 1:
+                return self.json_message("Invalid resolution", HTTP_BAD_REQUEST)
+            columnar = True
+
         hass = request.app["hass"]
 
         if (
@@ -243,6 +319,21 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        if columnar:
+            return cast(
+                web.Response,
+                await hass.async_add_executor_job(
+                    self._columnar_significant_states_json,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    include_start_time_state,
+                    significant_changes_only,
+                    resolution,
+                ),
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -270,7 +361,7 @@ class HistoryPeriodView(HomeAssistantView):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
 
-        with session_scope(hass=hass) as session:
+        with session_scope(hass=hass, read_only=True) as session:
             result = (
                 history._get_significant_states(  # pylint: disable=protected-access
                     hass,
@@ -305,6 +396,43 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    def _columnar_significant_states_json(
+        self,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        resolution,
+    ):
+        """Fetch significant states from the database as columnar json."""
+        timer_start = time.perf_counter()
+
+        result = history.get_significant_states_columnar(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            self.filters,
+            include_start_time_state,
+            significant_changes_only,
+            resolution,
+        )
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Extracted %d series in %fs", len(result), elapsed)
+
+        if self.filters and self.use_include_order:
+            order = {
+                entity_id: index
+                for index, entity_id in enumerate(self.filters.included_entities)
+            }
+            result.sort(key=lambda series: order.get(series["entity_id"], len(order)))
+
+        return self.json(result)
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
     """Build a sql filter from config."""
@@ -57,8 +57,17 @@ class HomeAssistantView:
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
             raise HTTPInternalServerError from err
+        return HomeAssistantView.json_raw(msg, status_code, headers)
+
+    @staticmethod
+    def json_raw(
+        body: bytes,
+        status_code: int = HTTP_OK,
+        headers: LooseHeaders | None = None,
+    ) -> web.Response:
+        """Return a JSON response of already serialized JSON."""
         response = web.Response(
-            body=msg,
+            body=body,
             content_type=CONTENT_TYPE_JSON,
             status=status_code,
             headers=headers,
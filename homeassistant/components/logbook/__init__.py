@@ -1,21 +1,26 @@
 """Event parser and human readable log generator."""
+import asyncio
 from contextlib import suppress
 from datetime import timedelta
-from itertools import groupby
+from itertools import groupby, islice
 import json
 import re
 
+from aiohttp import web
 import sqlalchemy
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.expression import literal
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
+    process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import session_scope
@@ -27,6 +32,7 @@ from homeassistant.const import (
     ATTR_ICON,
     ATTR_NAME,
     ATTR_SERVICE,
+    CONTENT_TYPE_JSON,
     EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
@@ -34,7 +40,12 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import DOMAIN as HA_DOMAIN, callback, split_entity_id
+from homeassistant.core import (
+    DOMAIN as HA_DOMAIN,
+    HomeAssistant,
+    callback,
+    split_entity_id,
+)
 from homeassistant.exceptions import InvalidEntityFormatError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
@@ -45,6 +56,7 @@ from homeassistant.helpers.entityfilter import (
 from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
+from homeassistant.helpers.json import json_bytes
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
@@ -58,8 +70,18 @@ CONTINUOUS_DOMAINS = ["proximity", "sensor"]
 
 DOMAIN = "logbook"
 
+DATA_FILTERS = "logbook_filters"
+
 GROUP_BY_MINUTES = 15
 
+# The entries written at once when streaming the logbook
+STREAM_CHUNK_SIZE = 500
+MAX_CONTEXT_LOOKUP = 20000
+MAX_ENTITY_ATTR_CACHE = 5000
+
+DEFAULT_PAGE_LIMIT = 1000
+MAX_PAGE_LIMIT = 10000
+
 EMPTY_JSON_OBJECT = "{}"
 UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
@@ -94,6 +116,11 @@ EVENT_COLUMNS = [
     Events.context_parent_id,
 ]
 
+# The attributes of the state, shared or from before they were shared
+STATE_ATTRIBUTES = sqlalchemy.func.coalesce(
+    StateAttributes.shared_attrs, States.attributes
+)
+
 SCRIPT_AUTOMATION_EVENTS = [EVENT_AUTOMATION_TRIGGERED, EVENT_SCRIPT_STARTED]
 
 LOG_MESSAGE_SCHEMA = vol.Schema(
@@ -159,7 +186,9 @@ async def async_setup(hass, config):
         filters = None
         entities_filter = None
 
+    hass.data[DATA_FILTERS] = (filters, entities_filter)
     hass.http.register_view(LogbookView(conf, filters, entities_filter))
+    hass.components.websocket_api.async_register_command(ws_get_events)
 
     hass.services.async_register(DOMAIN, "log", log_message, schema=LOG_MESSAGE_SCHEMA)
 
@@ -238,22 +267,151 @@ class LogbookView(HomeAssistantView):
                 "Can't combine entity with context_id", HTTP_BAD_REQUEST
             )
 
-        def json_events():
-            """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(
-                    hass,
-                    start_day,
-                    end_day,
-                    entity_ids,
-                    self.filters,
-                    self.entities_filter,
-                    entity_matches_only,
-                    context_id,
-                )
-            )
+        cursor = request.query.get("cursor")
+        if cursor is not None:
+            cursor = dt_util.parse_datetime(cursor)
+            if cursor is None:
+                return self.json_message("Invalid cursor", HTTP_BAD_REQUEST)
+            cursor = dt_util.as_utc(cursor)
 
-        return await hass.async_add_executor_job(json_events)
+        limit = request.query.get("limit")
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if not 1 <= limit <= MAX_PAGE_LIMIT:
+                return self.json_message("Invalid limit", HTTP_BAD_REQUEST)
+
+        # With a cursor or a limit, the entries are returned as a page
+        # holding the cursor of the next page
+        paginated = cursor is not None or limit is not None
+
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_JSON
+        response.enable_compression()
+
+        async def async_write(data):
+            """Write a part of the response, the first one starts it."""
+            if not response.prepared:
+                await response.prepare(request)
+            await response.write(data)
+
+        def write(data):
+            """Write a part of the response from the executor."""
+            asyncio.run_coroutine_threadsafe(async_write(data), hass.loop).result()
+
+        def stream_events():
+            """Fetch events and write them as JSON in chunks.
+
+            The response starts with the first chunk, after the query ran, so
+            a database or an encoding error of the query still gets an error
+            status instead of a truncated body.
+            """
+            body = b'{"entries":[' if paginated else b"["
+            separator = b""
+            for entries, next_cursor in _stream_events(
+                hass,
+                start_day,
+                end_day,
+                entity_ids,
+                self.filters,
+                self.entities_filter,
+                entity_matches_only,
+                context_id,
+                cursor,
+                limit,
+            ):
+                if entries:
+                    body += separator + json_bytes(entries)[1:-1]
+                    separator = b","
+                if body:
+                    write(body)
+                    body = b""
+            if paginated:
+                write(b'],"next_cursor":' + json_bytes(next_cursor) + b"}")
+            else:
+                write(b"]")
+
+        await hass.async_add_executor_job(stream_events)
+        await response.write_eof()
+        return response
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "logbook/get_events",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): [cv.entity_id],
+        vol.Optional("context_id"): str,
+        vol.Optional("entity_matches_only", default=False): bool,
+        vol.Optional("cursor"): str,
+        vol.Optional("limit", default=DEFAULT_PAGE_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_LIMIT)
+        ),
+    }
+)
+@websocket_api.async_response
+async def ws_get_events(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle logbook get events websocket command."""
+    start_time = dt_util.parse_datetime(msg["start_time"])
+    if start_time:
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    end_time_str = msg.get("end_time")
+    if end_time_str:
+        end_time = dt_util.parse_datetime(end_time_str)
+        if end_time:
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = start_time + timedelta(days=1)
+
+    cursor = msg.get("cursor")
+    if cursor is not None:
+        cursor = dt_util.parse_datetime(cursor)
+        if cursor is None:
+            connection.send_error(msg["id"], "invalid_cursor", "Invalid cursor")
+            return
+        cursor = dt_util.as_utc(cursor)
+
+    entity_ids = msg.get("entity_ids")
+    context_id = msg.get("context_id")
+    if entity_ids and context_id:
+        connection.send_error(
+            msg["id"], "invalid_format", "Can't combine entity_ids with context_id"
+        )
+        return
+
+    filters, entities_filter = hass.data[DATA_FILTERS]
+
+    def get_page():
+        """Fetch a page of events."""
+        entries = []
+        for chunk, next_cursor in _stream_events(
+            hass,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            entities_filter,
+            msg["entity_matches_only"],
+            context_id,
+            cursor,
+            msg["limit"],
+        ):
+            entries.extend(chunk)
+        return {"entries": entries, "next_cursor": next_cursor}
+
+    connection.send_result(msg["id"], await hass.async_add_executor_job(get_page))
 
 
 def humanify(hass, events, entity_attr_cache, context_lookup):
@@ -421,69 +579,164 @@ def _get_events(
     context_id=None,
 ):
     """Get events for a period of time."""
-    assert not (
-        entity_ids and context_id
-    ), "can't pass in both entity_ids and context_id"
+    return [
+        entry
+        for entries, _ in _stream_events(
+            hass,
+            start_day,
+            end_day,
+            entity_ids,
+            filters,
+            entities_filter,
+            entity_matches_only,
+            context_id,
+        )
+        for entry in entries
+    ]
 
+
+def _stream_events(
+    hass,
+    start_day,
+    end_day,
+    entity_ids=None,
+    filters=None,
+    entities_filter=None,
+    entity_matches_only=False,
+    context_id=None,
+    cursor=None,
+    limit=None,
+):
+    """Yield the events of a period of time in chunks of entries.
+
+    Yields (entries, next_cursor) tuples. The events are humanified per
+    group of GROUP_BY_MINUTES and the caches are pruned between groups, so
+    memory stays bounded by the chunk size instead of the period.
+
+    With a limit, the stream stops at the first group boundary after limit
+    entries and the last tuple holds the time_fired of the first event of
+    the next group. Passing it back as the cursor continues from there.
+    """
     entity_attr_cache = EntityAttributeCache(hass)
     context_lookup = {None: None}
 
-    def yield_events(query):
-        """Yield Events that are not filtered away."""
-        for row in query.yield_per(1000):
-            event = LazyEventPartialState(row)
-            context_lookup.setdefault(event.context_id, event)
-            if event.event_type == EVENT_CALL_SERVICE:
-                continue
-            if event.event_type == EVENT_STATE_CHANGED or _keep_event(
-                hass, event, entities_filter
-            ):
-                yield event
-
     if entity_ids is not None:
         entities_filter = generate_filter([], entity_ids, [], [])
 
-    with session_scope(hass=hass) as session:
-        old_state = aliased(States, name="old_state")
-
-        if entity_ids is not None:
-            query = _generate_events_query_without_states(session)
-            query = _apply_event_time_filter(query, start_day, end_day)
-            query = _apply_event_types_filter(
-                hass, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
-            )
-            if entity_matches_only:
-                # When entity_matches_only is provided, contexts and events that do not
-                # contain the entity_ids are not included in the logbook response.
-                query = _apply_event_entity_id_matchers(query, entity_ids)
-
-            query = query.union_all(
-                _generate_states_query(
-                    session, start_day, end_day, old_state, entity_ids
-                )
-            )
-        else:
-            query = _generate_events_query(session)
-            query = _apply_event_time_filter(query, start_day, end_day)
-            query = _apply_events_types_and_states_filter(
-                hass, query, old_state
-            ).filter(
-                (States.last_updated == States.last_changed)
-                | (Events.event_type != EVENT_STATE_CHANGED)
+    with session_scope(hass=hass, read_only=True) as session:
+        query = _generate_logbook_query(
+            hass,
+            session,
+            start_day,
+            end_day,
+            entity_ids,
+            filters,
+            entity_matches_only,
+            context_id,
+            cursor,
+        )
+        events = _yield_events(hass, query, entities_filter, context_lookup)
+
+        chunk = []
+        count = 0
+        for _, events_batch in groupby(
+            events, lambda event: event.time_fired_minute // GROUP_BY_MINUTES
+        ):
+            events_batch = list(events_batch)
+            if limit is not None and count >= limit:
+                yield chunk, events_batch[0].time_fired
+                return
+
+            entries = list(
+                humanify(hass, events_batch, entity_attr_cache, context_lookup)
             )
-            if filters:
-                query = query.filter(
-                    filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
-                )
+            chunk.extend(entries)
+            count += len(entries)
+
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield chunk, None
+                chunk = []
+
+            if len(context_lookup) > MAX_CONTEXT_LOOKUP:
+                # Keep the most recent contexts, later events are
+                # unlikely to refer to the older ones
+                for context_key in list(
+                    islice(context_lookup, 1, MAX_CONTEXT_LOOKUP // 2)
+                ):
+                    del context_lookup[context_key]
+            entity_attr_cache.prune(MAX_ENTITY_ATTR_CACHE)
+
+        yield chunk, None
+
+
+def _yield_events(hass, query, entities_filter, context_lookup):
+    """Yield Events that are not filtered away."""
+    for row in query.yield_per(1000):
+        event = LazyEventPartialState(row)
+        context_lookup.setdefault(event.context_id, event)
+        if event.event_type == EVENT_CALL_SERVICE:
+            continue
+        if event.event_type == EVENT_STATE_CHANGED or _keep_event(
+            hass, event, entities_filter
+        ):
+            yield event
+
 
-            if context_id is not None:
-                query = query.filter(Events.context_id == context_id)
+def _generate_logbook_query(
+    hass,
+    session,
+    start_day,
+    end_day,
+    entity_ids,
+    filters,
+    entity_matches_only,
+    context_id,
+    cursor=None,
+):
+    """Generate the query of the events and state changes of the logbook."""
+    assert not (
+        entity_ids and context_id
+    ), "can't pass in both entity_ids and context_id"
 
-        query = query.order_by(Events.time_fired)
+    old_state = aliased(States, name="old_state")
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+    if entity_ids is not None:
+        query = _generate_events_query_without_states(session)
+        query = _apply_event_time_filter(query, start_day, end_day)
+        query = _apply_event_types_filter(
+            hass, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
+        )
+        if entity_matches_only:
+            # When entity_matches_only is provided, contexts and events that do not
+            # contain the entity_ids are not included in the logbook response.
+            query = _apply_event_entity_id_matchers(query, entity_ids)
+        if cursor is not None:
+            query = query.filter(Events.time_fired >= cursor)
+
+        states_query = _generate_states_query(
+            session, start_day, end_day, old_state, entity_ids
+        )
+        if cursor is not None:
+            states_query = states_query.filter(States.last_updated >= cursor)
+        query = query.union_all(states_query)
+    else:
+        query = _generate_events_query(session)
+        query = _apply_event_time_filter(query, start_day, end_day)
+        query = _apply_events_types_and_states_filter(hass, query, old_state).filter(
+            (States.last_updated == States.last_changed)
+            | (Events.event_type != EVENT_STATE_CHANGED)
         )
+        if filters:
+            query = query.filter(
+                filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
+            )
+
+        if context_id is not None:
+            query = query.filter(Events.context_id == context_id)
+        if cursor is not None:
+            query = query.filter(Events.time_fired >= cursor)
+
+    return query.order_by(Events.time_fired)
 
 
 def _generate_events_query(session):
@@ -492,7 +745,7 @@ def _generate_events_query(session):
         States.state,
         States.entity_id,
         States.domain,
-        States.attributes,
+        STATE_ATTRIBUTES.label("attributes"),
     )
 
 
@@ -511,6 +764,9 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
@@ -525,6 +781,9 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -554,7 +813,7 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(STATE_ATTRIBUTES.contains(UNIT_OF_MEASUREMENT_JSON)),
     )
 
 
@@ -758,6 +1017,11 @@ class LazyEventPartialState:
                 self._event_data = json.loads(self._row.event_data)
         return self._event_data
 
+    @property
+    def time_fired(self):
+        """Time event was fired in utc."""
+        return process_timestamp(self._row.time_fired)
+
     @property
     def time_fired_isoformat(self):
         """Time event was fired in utc isoformat."""
@@ -800,3 +1064,8 @@ class EntityAttributeCache:
             self._cache[entity_id][attribute] = event.attributes.get(attribute)
 
         return self._cache[entity_id][attribute]
+
+    def prune(self, max_entities):
+        """Forget the attributes of all entities when there are too many."""
+        if len(self._cache) > max_entities:
+            self._cache.clear()
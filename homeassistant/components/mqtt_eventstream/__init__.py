@@ -18,7 +18,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import EventOrigin, State, callback
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_bytes
 
 DOMAIN = "mqtt_eventstream"
 CONF_PUBLISH_TOPIC = "publish_topic"
@@ -80,8 +80,16 @@ async def async_setup(hass, config):
         ):
             return
 
-        event_info = {"event_type": event.event_type, "event_data": event.data}
-        msg = json.dumps(event_info, cls=JSONEncoder)
+        try:
+            # the states in the data reuse the JSON they cached
+            msg = '{{"event_type":{},"event_data":{}}}'.format(
+                json_bytes(event.event_type).decode("utf-8"),
+                event.data_json().decode("utf-8"),
+            )
+        except ValueError:
+            # NaN and infinite floats are only encoded by the JSONEncoder
+            event_info = {"event_type": event.event_type, "event_data": event.data}
+            msg = json.dumps(event_info, cls=JSONEncoder)
         mqtt.async_publish(pub_topic, msg)
 
     # Only listen for local events if you are going to publish them.
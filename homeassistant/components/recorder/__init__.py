@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
@@ -11,16 +12,26 @@ import threading
 import time
 from typing import Any, Callable, NamedTuple
 
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
+from sqlalchemy import (
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    func,
+    select,
+    text,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 import voluptuous as vol
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    ATTR_FRIENDLY_NAME,
+    ATTR_ICON,
+    ATTR_UNIT_OF_MEASUREMENT,
     CONF_EXCLUDE,
     CONF_INCLUDE,
     EVENT_HOMEASSISTANT_FINAL_WRITE,
@@ -29,6 +40,7 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
     EVENT_TIME_CHANGED,
     MATCH_ALL,
+    PERCENTAGE,
 )
 from homeassistant.core import CoreState, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
@@ -39,6 +51,7 @@ from homeassistant.helpers.entityfilter import (
     generate_filter,
 )
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_time_change,
     async_track_time_interval,
 )
@@ -50,12 +63,21 @@ from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
-from . import history, migration, purge, statistics
-from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
+from . import history, migration, purge, repack as repack_util, statistics
+from .const import (
+    CONF_DB_INTEGRITY_CHECK,
+    DATA_INSTANCE,
+    DB_PROFILE_DEFAULT,
+    DB_PROFILE_FLASH,
+    DOMAIN,
+    SQLITE_MAX_BIND_VARS,
+    SQLITE_URL_PREFIX,
+)
 from .models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     StatisticsRuns,
     process_timestamp,
@@ -64,6 +86,7 @@ from .pool import RecorderPool
 from .util import (
     dburl_to_path,
     end_incomplete_runs,
+    execute_on_connection,
     move_away_broken_database,
     perodic_db_cleanups,
     session_scope,
@@ -114,9 +137,34 @@ DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
 KEEPALIVE_TIME = 30
 
-# Controls how often we clean up
-# States and Events objects
-EXPIRE_AFTER_COMMITS = 120
+# Rows written per commit, growing with the depth of the queue
+MIN_COMMIT_BATCH = 1000
+MAX_COMMIT_BATCH = 10000
+
+# Rows deleted per second by the purge, 0 does not throttle it
+DEFAULT_PURGE_ROWS_PER_SECOND = 5000
+
+# Free SQLite pages released by each incremental vacuum step
+INCREMENTAL_VACUUM_PAGES = 1024
+
+PURGE_PROGRESS_ENTITY_ID = "sensor.recorder_purge_progress"
+PURGE_STATUS_PURGING = "purging"
+PURGE_STATUS_VACUUMING = "vacuuming"
+PURGE_STATUS_DONE = "done"
+
+# Time changes between the WAL checkpoints of the flash profile, which
+# only happen while the queue is empty
+WAL_CHECKPOINT_INTERVAL = 300
+
+# Query only connections kept open by the flash profile for history and logbook
+READ_ONLY_POOL_SIZE = 4
+
+# Ids of the shared attributes kept to skip looking them up
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
+# Dialects where the recorder can pick the ids of the rows it inserts
+# so they can be written with executemany
+EXPLICIT_ID_DIALECTS = {"mysql", "postgresql", "sqlite"}
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
@@ -126,6 +174,8 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_PURGE_ROWS_PER_SECOND = "purge_rows_per_second"
+CONF_DB_PROFILE = "db_profile"
 
 INVALIDATED_ERR = "Database connection invalidated"
 CONNECTIVITY_ERR = "Error in database connectivity during commit"
@@ -150,7 +200,14 @@ CONFIG_SCHEMA = vol.Schema(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): cv.positive_int,
+                    vol.Optional(
+                        CONF_PURGE_ROWS_PER_SECOND,
+                        default=DEFAULT_PURGE_ROWS_PER_SECOND,
+                    ): cv.positive_int,
                     vol.Optional(CONF_DB_URL): cv.string,
+                    vol.Optional(CONF_DB_PROFILE, default=DB_PROFILE_DEFAULT): vol.In(
+                        [DB_PROFILE_DEFAULT, DB_PROFILE_FLASH]
+                    ),
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
@@ -252,6 +309,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     db_max_retries = 10
     db_retry_wait = 3
     db_integrity_check = conf[CONF_DB_INTEGRITY_CHECK]
+    db_profile = conf[CONF_DB_PROFILE]
     try:
         import json
 
@@ -281,6 +339,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
                     keep_days = 10
                     if "dbKeepDays" in ais_global.G_DB_SETTINGS_INFO:
                         keep_days = int(ais_global.G_DB_SETTINGS_INFO["dbKeepDays"])
+                    db_profile = ais_global.G_DB_SETTINGS_INFO.get(
+                        "dbProfile", db_profile
+                    )
         db_include = ais_global.G_DB_SETTINGS_INFO.get("dbInclude", {})
         db_exclude = ais_global.G_DB_SETTINGS_INFO.get("dbExclude", {})
 
@@ -323,6 +384,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        purge_rows_per_second=conf[CONF_PURGE_ROWS_PER_SECOND],
+        db_profile=db_profile,
     )
     instance.async_initialize()
     instance.start()
@@ -401,6 +464,10 @@ class PurgeEntitiesTask(NamedTuple):
     entity_filter: Callable[[str], bool]
 
 
+class IncrementalVacuumTask:
+    """An object to insert into the recorder queue to release free SQLite pages."""
+
+
 class PerodicCleanupTask:
     """An object to insert into the recorder to trigger cleanup tasks when auto purge is disabled."""
 
@@ -429,6 +496,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
+        purge_rows_per_second: int = DEFAULT_PURGE_ROWS_PER_SECOND,
+        db_profile: str = DB_PROFILE_DEFAULT,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -437,27 +506,42 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.keep_days = keep_days
         self.commit_interval = commit_interval
+        self.purge_rows_per_second = purge_rows_per_second
+        self.purge_progress = purge.PurgeProgress()
         self.queue: Any = queue.SimpleQueue()
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        self.db_profile = db_profile
         self.async_db_ready: asyncio.Future = asyncio.Future()
         self.async_recorder_ready = asyncio.Event()
         self._queue_watch = threading.Event()
         self.engine: Any = None
+        self.read_only_engine: Any = None
         self.run_info: Any = None
 
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
 
         self._timechanges_seen = 0
-        self._commits_without_expire = 0
         self._keepalive_count = 0
-        self._old_states: dict[str, States] = {}
-        self._pending_expunge: list[States] = []
+        self._wal_checkpoint_count = 0
+        # rows were committed since the last WAL checkpoint
+        self._wal_dirty = False
+        # entity_id -> state_id of the last state written
+        self._old_states: dict[str, int] = {}
+        # rows waiting for the next commit, the state rows are paired
+        # with the position of their event row and their attributes JSON
+        self._pending_events: list[dict[str, Any]] = []
+        self._pending_states: list[tuple[int, str, dict[str, Any]]] = []
+        # shared attributes JSON -> attributes_id, least recently used first
+        self._state_attributes_ids: collections.OrderedDict[
+            str, int
+        ] = collections.OrderedDict()
         self.event_session = None
         self.get_session = None
+        self.get_read_only_session = None
         self._completed_first_database_setup = None
         self._event_listener = None
         self.async_migration_event = asyncio.Event()
@@ -791,21 +875,105 @@ class Recorder(threading.Thread):
 
     def _run_purge(self, purge_before, repack, apply_filter):
         """Purge the database."""
+        start = time.monotonic()
+        purged_rows = self.purge_progress.purged_rows
         if purge.purge_old_data(self, purge_before, repack, apply_filter):
+            if (
+                self.engine.dialect.name == "sqlite"
+                and self.db_profile == DB_PROFILE_FLASH
+                and repack_util.sqlite_incremental_vacuum_enabled(self)
+            ):
+                self._update_purge_progress(PURGE_STATUS_VACUUMING)
+                self.queue.put(IncrementalVacuumTask())
+                return
+            self._update_purge_progress(PURGE_STATUS_DONE)
             # We always need to do the db cleanups after a purge
             # is finished to ensure the WAL checkpoint and other
             # tasks happen after a vacuum.
             perodic_db_cleanups(self)
             return
+        self._update_purge_progress(PURGE_STATUS_PURGING)
         # Schedule a new purge task if this one didn't finish
-        self.queue.put(PurgeTask(purge_before, repack, apply_filter))
+        self._queue_task_later(
+            PurgeTask(purge_before, repack, apply_filter),
+            self._purge_delay(self.purge_progress.purged_rows - purged_rows, start),
+        )
 
     def _run_purge_entities(self, entity_filter):
         """Purge entities from the database."""
+        start = time.monotonic()
+        purged_rows = self.purge_progress.purged_rows
         if purge.purge_entity_data(self, entity_filter):
             return
         # Schedule a new purge task if this one didn't finish
-        self.queue.put(PurgeEntitiesTask(entity_filter))
+        self._queue_task_later(
+            PurgeEntitiesTask(entity_filter),
+            self._purge_delay(self.purge_progress.purged_rows - purged_rows, start),
+        )
+
+    def _run_incremental_vacuum(self):
+        """Release a chunk of the free pages of the database."""
+        start = time.monotonic()
+        try:
+            done = repack_util.incremental_vacuum(self, INCREMENTAL_VACUUM_PAGES)
+        except SQLAlchemyError as err:
+            _LOGGER.error("Error during incremental vacuum: %s", err)
+            done = True
+        if not done:
+            # When throttled, leave the database to the writes for as long
+            # as the step took
+            self._queue_task_later(
+                IncrementalVacuumTask(),
+                time.monotonic() - start if self.purge_rows_per_second else 0,
+            )
+            return
+        self._update_purge_progress(PURGE_STATUS_DONE)
+        perodic_db_cleanups(self)
+
+    def _purge_delay(self, rows, start):
+        """Return the wait for a purge chunk to stay within the rows per second."""
+        if not self.purge_rows_per_second:
+            return 0
+        return rows / self.purge_rows_per_second - (time.monotonic() - start)
+
+    def _queue_task_later(self, task, delay):
+        """Queue the next chunk of a task after a delay.
+
+        Writes queued meanwhile are processed before the next chunk.
+        """
+        if delay <= 0:
+            self.queue.put(task)
+            return
+        self.hass.add_job(self._async_queue_task_later, task, delay)
+
+    @callback
+    def _async_queue_task_later(self, task, delay):
+        """Put a task in the queue after a delay."""
+
+        @callback
+        def _async_queue_task(_now):
+            self.queue.put(task)
+
+        async_call_later(self.hass, delay, _async_queue_task)
+
+    def _update_purge_progress(self, status):
+        """Expose the progress of the purge as a sensor."""
+        progress = self.purge_progress
+        self.hass.add_job(
+            self.hass.states.async_set,
+            PURGE_PROGRESS_ENTITY_ID,
+            progress.percentage,
+            {
+                ATTR_FRIENDLY_NAME: "Recorder purge progress",
+                ATTR_ICON: "mdi:database-remove",
+                ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
+                "status": status,
+                "purge_before": progress.purge_before,
+                "events_to_purge": progress.events_to_purge,
+                "purged_events": progress.purged_events,
+                "purged_states": progress.purged_states,
+            },
+        )
 
     def _run_statistics(self, start):
         """Run statistics task."""
@@ -822,6 +990,9 @@ class Recorder(threading.Thread):
         if isinstance(event, PurgeEntitiesTask):
             self._run_purge_entities(event.entity_filter)
             return
+        if isinstance(event, IncrementalVacuumTask):
+            self._run_incremental_vacuum()
+            return
         if isinstance(event, PerodicCleanupTask):
             perodic_db_cleanups(self)
             return
@@ -829,6 +1000,8 @@ class Recorder(threading.Thread):
             self._run_statistics(event.start)
             return
         if isinstance(event, WaitTask):
+            if not self.commit_interval:
+                self._commit_event_session_or_retry()
             self._queue_watch.set()
             return
         if event.event_type == EVENT_TIME_CHANGED:
@@ -841,6 +1014,11 @@ class Recorder(threading.Thread):
                 if self._timechanges_seen >= self.commit_interval:
                     self._timechanges_seen = 0
                     self._commit_event_session_or_retry()
+            else:
+                # Rows left behind by a task that drained the queue
+                self._commit_event_session_or_retry()
+            if self.db_profile == DB_PROFILE_FLASH and self._using_file_sqlite:
+                self._checkpoint_wal_when_idle()
             return
 
         if not self.enabled:
@@ -848,41 +1026,38 @@ class Recorder(threading.Thread):
 
         try:
             if event.event_type == EVENT_STATE_CHANGED:
-                dbevent = Events.from_event(event, event_data="{}")
+                event_row = Events.row_from_event(event, event_data="{}")
             else:
-                dbevent = Events.from_event(event)
-            dbevent.created = event.time_fired
-            self.event_session.add(dbevent)
+                event_row = Events.row_from_event(event)
         except (TypeError, ValueError):
             _LOGGER.warning("Event is not JSON serializable: %s", event)
             return
 
+        self._pending_events.append(event_row)
+
         if event.event_type == EVENT_STATE_CHANGED:
             try:
-                dbstate = States.from_event(event)
-                has_new_state = event.data.get("new_state")
-                if dbstate.entity_id in self._old_states:
-                    old_state = self._old_states.pop(dbstate.entity_id)
-                    if old_state.state_id:
-                        dbstate.old_state_id = old_state.state_id
-                    else:
-                        dbstate.old_state = old_state
-                if not has_new_state:
-                    dbstate.state = None
-                dbstate.event = dbevent
-                dbstate.created = event.time_fired
-                self.event_session.add(dbstate)
-                if has_new_state:
-                    self._old_states[dbstate.entity_id] = dbstate
-                    self._pending_expunge.append(dbstate)
+                state_row = States.row_from_event(event)
             except (TypeError, ValueError):
                 _LOGGER.warning(
                     "State is not JSON serializable: %s", event.data.get("new_state")
                 )
+            else:
+                if not event.data.get("new_state"):
+                    state_row["state"] = None
+                shared_attrs = state_row["attributes"]
+                state_row["attributes"] = None
+                self._pending_states.append(
+                    (len(self._pending_events) - 1, shared_attrs, state_row)
+                )
 
         # If they do not have a commit interval
-        # than we commit right away
-        if not self.commit_interval:
+        # than we commit as soon as the queue is drained,
+        # otherwise the batch grows with the backlog
+        pending = len(self._pending_events)
+        if (not self.commit_interval and self.queue.empty()) or pending >= min(
+            max(self.queue.qsize(), MIN_COMMIT_BATCH), MAX_COMMIT_BATCH
+        ):
             self._commit_event_session_or_retry()
 
     def _handle_database_error(self, err):
@@ -897,7 +1072,11 @@ class Recorder(threading.Thread):
 
     def _commit_event_session_or_retry(self):
         """Commit the event session if there is work to do."""
-        if not self.event_session.new and not self.event_session.dirty:
+        if (
+            not self._pending_events
+            and not self.event_session.new
+            and not self.event_session.dirty
+        ):
             return
         tries = 1
         while tries <= self.db_max_retries:
@@ -914,28 +1093,196 @@ class Recorder(threading.Thread):
                 if tries == self.db_max_retries:
                     raise
 
+                self.event_session.rollback()
                 tries += 1
                 time.sleep(self.db_retry_wait)
 
     def _commit_event_session(self):
-        self._commits_without_expire += 1
-
-        if self._pending_expunge:
-            self.event_session.flush()
-            for dbstate in self._pending_expunge:
-                # Expunge the state so its not expired
-                # until we use it later for dbstate.old_state
-                if dbstate in self.event_session:
-                    self.event_session.expunge(dbstate)
-            self._pending_expunge = []
+        if not self._pending_events:
+            self.event_session.commit()
+            return
+
+        old_states, attributes_ids = self._write_pending_rows()
         self.event_session.commit()
 
-        # Expire is an expensive operation (frequently more expensive
-        # than the flush and commit itself) so we only
-        # do it after EXPIRE_AFTER_COMMITS commits
-        if self._commits_without_expire == EXPIRE_AFTER_COMMITS:
-            self._commits_without_expire = 0
-            self.event_session.expire_all()
+        cache = self._state_attributes_ids
+        for shared_attrs, attributes_id in attributes_ids.items():
+            cache[shared_attrs] = attributes_id
+            cache.move_to_end(shared_attrs)
+        while len(cache) > STATE_ATTRIBUTES_ID_CACHE_SIZE:
+            cache.popitem(last=False)
+
+        for entity_id, state_id in old_states.items():
+            if state_id is None:
+                self._old_states.pop(entity_id, None)
+            else:
+                self._old_states[entity_id] = state_id
+        self._pending_events = []
+        self._pending_states = []
+        self._wal_dirty = True
+
+    def _checkpoint_wal_when_idle(self):
+        """Checkpoint the WAL of the flash profile while the queue is empty.
+
+        The pages rewritten by many commits reach the database file once,
+        instead of at each automatic checkpoint between writes.
+        """
+        self._wal_checkpoint_count += 1
+        if (
+            not self._wal_dirty
+            or self._wal_checkpoint_count < WAL_CHECKPOINT_INTERVAL
+            or not self.queue.empty()
+        ):
+            return
+        self._wal_checkpoint_count = 0
+        self._wal_dirty = False
+        _LOGGER.debug("Idle WAL checkpoint")
+        with self.engine.connect() as connection:
+            connection.execute(text("PRAGMA wal_checkpoint(PASSIVE);"))
+
+    def _write_pending_rows(
+        self,
+    ) -> tuple[dict[str, int | None], dict[str, int]]:
+        """Insert the pending events and states in bulk.
+
+        Returns the changes to the last state id of the entities and the
+        ids of the shared attributes, which are only kept once the commit
+        succeeds.
+        """
+        session = self.event_session
+        explicit_ids = self.engine.dialect.name in EXPLICIT_ID_DIALECTS
+        events_insert = Events.__table__.insert()
+        states_insert = States.__table__.insert()
+        old_states: dict[str, int | None] = {}
+
+        # Rows may also be written outside of the recorder, so the
+        # next ids are read from the primary key indexes each time
+        event_id = self._max_id(Events.event_id) if explicit_ids else 0
+        for event_row in self._pending_events:
+            if explicit_ids:
+                event_id += 1
+                event_row["event_id"] = event_id
+            else:
+                event_row["event_id"] = None
+                result = session.execute(events_insert, event_row)
+                event_row["event_id"] = result.inserted_primary_key[0]
+        if explicit_ids:
+            session.execute(events_insert, self._pending_events)
+
+        attributes_ids, attributes_id = self._write_state_attributes(explicit_ids)
+
+        state_id = self._max_id(States.state_id) if explicit_ids else 0
+        for event_index, shared_attrs, state_row in self._pending_states:
+            entity_id = state_row["entity_id"]
+            state_row["attributes_id"] = attributes_ids[shared_attrs]
+            state_row["event_id"] = self._pending_events[event_index]["event_id"]
+            if entity_id in old_states:
+                state_row["old_state_id"] = old_states[entity_id]
+            else:
+                state_row["old_state_id"] = self._old_states.get(entity_id)
+            if explicit_ids:
+                state_id += 1
+                state_row["state_id"] = state_id
+            else:
+                state_row["state_id"] = None
+                result = session.execute(states_insert, state_row)
+                state_row["state_id"] = result.inserted_primary_key[0]
+            old_states[entity_id] = (
+                None if state_row["state"] is None else state_row["state_id"]
+            )
+        if explicit_ids and self._pending_states:
+            session.execute(states_insert, [row for _, _, row in self._pending_states])
+
+        if explicit_ids and self.engine.dialect.name == "postgresql":
+            # The identity sequences do not see ids written by the recorder
+            for table, column, last_id in (
+                (Events.__tablename__, "event_id", event_id),
+                (States.__tablename__, "state_id", state_id),
+                (StateAttributes.__tablename__, "attributes_id", attributes_id),
+            ):
+                if not last_id:
+                    continue
+                session.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', "
+                        f"'{column}'), :last_id)"
+                    ),
+                    {"last_id": last_id},
+                )
+
+        return old_states, attributes_ids
+
+    def _max_id(self, column) -> int:
+        """Return the highest id in use in a table."""
+        return self.event_session.query(func.max(column)).scalar() or 0
+
+    def _write_state_attributes(self, explicit_ids: bool) -> tuple[dict[str, int], int]:
+        """Find or insert the shared attributes of the pending states.
+
+        Returns the attributes_id of the JSON of each attributes, and the
+        highest attributes_id written when the ids are picked here.
+        """
+        session = self.event_session
+        cache = self._state_attributes_ids
+        attributes_ids: dict[str, int] = {}
+        # hash -> JSON of the attributes not in the cache
+        missing: dict[int, list[str]] = {}
+        for _, shared_attrs, _ in self._pending_states:
+            if shared_attrs in attributes_ids:
+                continue
+            if (attributes_id := cache.get(shared_attrs)) is not None:
+                attributes_ids[shared_attrs] = attributes_id
+                continue
+            attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+            if shared_attrs not in missing.setdefault(attr_hash, []):
+                missing[attr_hash].append(shared_attrs)
+
+        hashes = list(missing)
+        for idx in range(0, len(hashes), SQLITE_MAX_BIND_VARS):
+            for attributes_id, shared_attrs in session.query(
+                StateAttributes.attributes_id, StateAttributes.shared_attrs
+            ).filter(
+                StateAttributes.hash.in_(hashes[idx : idx + SQLITE_MAX_BIND_VARS])
+            ):
+                if shared_attrs not in attributes_ids:
+                    attributes_ids[shared_attrs] = attributes_id
+
+        attributes_insert = StateAttributes.__table__.insert()
+        new_rows = []
+        attributes_id = (
+            self._max_id(StateAttributes.attributes_id)
+            if explicit_ids and missing
+            else 0
+        )
+        for attr_hash, shared_attrs_list in missing.items():
+            for shared_attrs in shared_attrs_list:
+                if shared_attrs in attributes_ids:
+                    continue
+                row = {
+                    "attributes_id": None,
+                    "hash": attr_hash,
+                    "shared_attrs": shared_attrs,
+                }
+                if explicit_ids:
+                    attributes_id += 1
+                    row["attributes_id"] = attributes_id
+                else:
+                    result = session.execute(attributes_insert, row)
+                    row["attributes_id"] = result.inserted_primary_key[0]
+                attributes_ids[shared_attrs] = row["attributes_id"]
+                new_rows.append(row)
+        if explicit_ids and new_rows:
+            session.execute(attributes_insert, new_rows)
+
+        return attributes_ids, attributes_id
+
+    def evict_state_attributes_ids(self, attributes_ids: set[int]) -> None:
+        """Forget the purged shared attributes."""
+        self._state_attributes_ids = collections.OrderedDict(
+            (shared_attrs, attributes_id)
+            for shared_attrs, attributes_id in self._state_attributes_ids.items()
+            if attributes_id not in attributes_ids
+        )
 
     def _handle_sqlite_corruption(self):
         """Handle the sqlite3 database being corrupt."""
@@ -948,6 +1295,9 @@ class Recorder(threading.Thread):
     def _close_event_session(self):
         """Close the event session."""
         self._old_states = {}
+        self._state_attributes_ids.clear()
+        self._pending_events = []
+        self._pending_states = []
 
         if not self.event_session:
             return
@@ -1007,6 +1357,7 @@ class Recorder(threading.Thread):
                 self.engine.dialect.name,
                 dbapi_connection,
                 not self._completed_first_database_setup,
+                self.db_profile,
             )
             self._completed_first_database_setup = True
 
@@ -1028,8 +1379,38 @@ class Recorder(threading.Thread):
 
         Base.metadata.create_all(self.engine)
         self.get_session = scoped_session(sessionmaker(bind=self.engine))
+        self.get_read_only_session = self.get_session
+        if self.db_profile == DB_PROFILE_FLASH and self._using_file_sqlite:
+            self._setup_read_only_connection()
         _LOGGER.debug("Connected to recorder database")
 
+    def _setup_read_only_connection(self):
+        """Set up a pool of query only connections for the read only sessions.
+
+        With WAL they read without waiting for the recorder thread, and keep
+        their page cache and memory map between queries.
+        """
+
+        def setup_read_only_connection(dbapi_connection, connection_record):
+            """Dbapi specific connection settings of the read only pool."""
+            setup_connection_for_dialect(
+                "sqlite", dbapi_connection, False, self.db_profile
+            )
+            execute_on_connection(dbapi_connection, "PRAGMA query_only=ON")
+
+        self.read_only_engine = create_engine(
+            self.db_url,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=READ_ONLY_POOL_SIZE,
+        )
+        sqlalchemy_event.listen(
+            self.read_only_engine, "connect", setup_read_only_connection
+        )
+        self.get_read_only_session = scoped_session(
+            sessionmaker(bind=self.read_only_engine)
+        )
+
     @property
     def _using_file_sqlite(self):
         """Short version to check if we are using sqlite3 as a file."""
@@ -1039,9 +1420,13 @@ class Recorder(threading.Thread):
 
     def _close_connection(self):
         """Close the connection."""
+        if self.read_only_engine:
+            self.read_only_engine.dispose()
+            self.read_only_engine = None
         self.engine.dispose()
         self.engine = None
         self.get_session = None
+        self.get_read_only_session = None
 
     def _setup_run(self):
         """Log the start of the current run and schedule any needed jobs."""
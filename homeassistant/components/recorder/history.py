@@ -4,6 +4,7 @@ from __future__ import annotations
 from collections import defaultdict
 from itertools import groupby
 import logging
+import math
 import time
 
 from sqlalchemy import and_, bindparam, func
@@ -11,6 +12,7 @@ from sqlalchemy.ext import baked
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -48,10 +50,20 @@ QUERY_STATES = [
     States.entity_id,
     States.state,
     States.attributes,
+    StateAttributes.shared_attrs,
     States.last_changed,
     States.last_updated,
 ]
 
+# The values of the states streamed by the columnar history
+QUERY_STATE_COLUMNS = [
+    States.entity_id,
+    States.state,
+    States.last_updated,
+]
+
+COLUMNAR_YIELD_PER = 1000
+
 HISTORY_BAKERY = "recorder_history_bakery"
 
 
@@ -60,9 +72,16 @@ def async_setup(hass):
     hass.data[HISTORY_BAKERY] = baked.bakery()
 
 
+def _query_states(session):
+    """Query the states with their shared attributes."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
+
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return _get_significant_states(hass, session, *args, **kwargs)
 
 
@@ -86,10 +105,40 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    baked_query = _bake_significant_states_query(
+        hass.data[HISTORY_BAKERY](_query_states),
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    )
+
+    states = execute(
+        baked_query(session).params(
+            start_time=start_time, end_time=end_time, entity_ids=entity_ids
+        )
+    )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
     )
 
+
+def _bake_significant_states_query(
+    baked_query, end_time, entity_ids, filters, significant_changes_only
+):
+    """Filter a baked query of the states to the significant states."""
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
@@ -115,34 +164,153 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
+    return baked_query
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
 
-    return _sorted_states_to_dict(
-        hass,
-        session,
-        states,
-        start_time,
+def get_significant_states_columnar(hass, *args, **kwargs):
+    """Wrap _get_significant_states_columnar with a sql session."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return _get_significant_states_columnar(hass, session, *args, **kwargs)
+
+
+def _get_significant_states_columnar(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    resolution=None,
+):
+    """Return the significant states as columns per entity.
+
+    The rows are streamed as plain tuples into a list of
+    {"entity_id", "t", "s"} series sorted by entity_id, where "t" holds the
+    UTC timestamps and "s" the states. With a resolution, numeric series with
+    more points are reduced to that many time buckets of
+    {"t", "min", "max", "mean"}.
+    """
+    timer_start = time.perf_counter()
+    end_time = end_time or dt_util.utcnow()
+
+    series = {}
+    if entity_ids is not None:
+        for entity_id in entity_ids:
+            series[entity_id] = ([], [])
+
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        start_ts = start_time.timestamp()
+        for state in _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        ):
+            times, states = series.setdefault(state.entity_id, ([], []))
+            times.append(start_ts)
+            states.append(state.state)
+
+    baked_query = _bake_significant_states_query(
+        hass.data[HISTORY_BAKERY](lambda session: session.query(*QUERY_STATE_COLUMNS)),
+        end_time,
         entity_ids,
         filters,
-        include_start_time_state,
-        minimal_response,
+        significant_changes_only,
+    )
+    rows = (
+        baked_query(session)
+        .params(start_time=start_time, end_time=end_time, entity_ids=entity_ids)
+        .with_post_criteria(lambda q: q.yield_per(COLUMNAR_YIELD_PER))
     )
 
+    # Called in a tight loop so cache the functions here
+    utc = dt_util.UTC
+    current_entity_id = None
+    append_time = append_state = None
+    for entity_id, state, last_updated in rows:
+        if entity_id != current_entity_id:
+            current_entity_id = entity_id
+            times, states = series.setdefault(entity_id, ([], []))
+            append_time = times.append
+            append_state = states.append
+        if last_updated.tzinfo is None:
+            last_updated = last_updated.replace(tzinfo=utc)
+        append_time(last_updated.timestamp())
+        append_state(state or "")
+
+    result = []
+    for entity_id, (times, states) in sorted(series.items()):
+        if not times:
+            continue
+        if resolution and len(times) > resolution:
+            downsampled = _downsample(
+                times, states, start_time.timestamp(), end_time.timestamp(), resolution
+            )
+            if downsampled is not None:
+                result.append({"entity_id": entity_id, **downsampled})
+                continue
+        result.append({"entity_id": entity_id, "t": times, "s": states})
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states_columnar took %fs", elapsed)
+
+    return result
+
+
+def _downsample(times, states, start_ts, end_ts, resolution):
+    """Reduce a numeric series to the min, max and mean of time buckets.
+
+    Returns None when the series has no numeric states.
+    """
+    width = max(end_ts - start_ts, 1) / resolution
+    bucket_times = []
+    mins = []
+    maxs = []
+    means = []
+    current_bucket = None
+    bucket_min = bucket_max = bucket_sum = 0.0
+    bucket_count = 0
+
+    for timestamp, state in zip(times, states):
+        try:
+            value = float(state)
+        except ValueError:
+            continue
+        if not math.isfinite(value):
+            continue
+        bucket = min(max(int((timestamp - start_ts) / width), 0), resolution - 1)
+        if bucket != current_bucket:
+            if bucket_count:
+                bucket_times.append(start_ts + current_bucket * width)
+                mins.append(bucket_min)
+                maxs.append(bucket_max)
+                means.append(bucket_sum / bucket_count)
+            current_bucket = bucket
+            bucket_min = bucket_max = bucket_sum = value
+            bucket_count = 1
+            continue
+        if value < bucket_min:
+            bucket_min = value
+        elif value > bucket_max:
+            bucket_max = value
+        bucket_sum += value
+        bucket_count += 1
+
+    if not bucket_count:
+        return None
+
+    bucket_times.append(start_ts + current_bucket * width)
+    mins.append(bucket_min)
+    maxs.append(bucket_max)
+    means.append(bucket_sum / bucket_count)
+    return {"t": bucket_times, "min": mins, "max": maxs, "mean": means}
+
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
-    with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+    with session_scope(hass=hass, read_only=True) as session:
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -175,10 +343,8 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     """Return the last number_of_states."""
     start_time = dt_util.utcnow()
 
-    with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+    with session_scope(hass=hass, read_only=True) as session:
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
@@ -218,7 +384,7 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None, filters=None)
         if run is None:
             return []
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return _get_states_with_session(
             hass, session, utc_point_in_time, entity_ids, run, filters
         )
@@ -243,7 +409,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -291,9 +457,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -19,10 +19,14 @@ from .models import (
     TABLE_STATES,
     Base,
     SchemaChanges,
+    StateAttributes,
     Statistics,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
     StatisticsRuns,
 )
+from .statistics import rollup_all_statistics
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -501,6 +505,24 @@ def _apply_update(engine, session, new_version, old_version):  # noqa: C901
                     "sum DOUBLE PRECISION",
                 ],
             )
+    elif new_version == 21:
+        # Move the attributes of new states to the shared state_attributes
+        # table, the states written before keep their own attributes
+        if not sqlalchemy.inspect(engine).has_table(StateAttributes.__tablename__):
+            StateAttributes.__table__.create(engine)
+        _add_columns(connection, "states", ["attributes_id INTEGER"])
+        _create_index(connection, "states", "ix_states_attributes_id")
+    elif new_version == 22:
+        # Add the daily and monthly statistics rolled up from the hourly ones and
+        # replace the hourly index with one covering the statistics columns
+        for table in (StatisticsDaily, StatisticsMonthly):
+            if not sqlalchemy.inspect(engine).has_table(table.__tablename__):
+                table.__table__.create(engine)
+        _create_index(
+            connection, "statistics", "ix_statistics_metadata_id_start_values"
+        )
+        _drop_index(connection, "statistics", "ix_statistics_statistic_id_start")
+        rollup_all_statistics(session)
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
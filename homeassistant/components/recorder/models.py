@@ -4,9 +4,11 @@ from __future__ import annotations
 from datetime import datetime
 import json
 import logging
-from typing import TypedDict
+from typing import Any, TypedDict
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -20,7 +22,7 @@ from sqlalchemy import (
     distinct,
 )
 from sqlalchemy.dialects import mysql, oracle, postgresql
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, declared_attr, relationship
 from sqlalchemy.orm.session import Session
 
 from homeassistant.const import (
@@ -39,7 +41,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 20
+SCHEMA_VERSION = 22
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,18 +49,24 @@ DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
+TABLE_STATISTICS_DAILY = "statistics_daily"
+TABLE_STATISTICS_MONTHLY = "statistics_monthly"
 TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 
 ALL_TABLES = [
     TABLE_STATES,
+    TABLE_STATE_ATTRIBUTES,
     TABLE_EVENTS,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
     TABLE_STATISTICS,
+    TABLE_STATISTICS_DAILY,
+    TABLE_STATISTICS_MONTHLY,
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
 ]
@@ -103,19 +111,28 @@ class Events(Base):  # type: ignore
             f")>"
         )
 
+    @staticmethod
+    def row_from_event(event, event_data=None) -> dict[str, Any]:
+        """Create the column values of an event database row."""
+        return {
+            "event_id": None,
+            "event_type": event.event_type,
+            "event_data": event_data
+            or json.dumps(event.data, cls=JSONEncoder, separators=(",", ":")),
+            "origin": str(event.origin.value),
+            "time_fired": event.time_fired,
+            "created": event.time_fired,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
+
     @staticmethod
     def from_event(event, event_data=None):
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=event_data
-            or json.dumps(event.data, cls=JSONEncoder, separators=(",", ":")),
-            origin=str(event.origin.value),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        row = Events.row_from_event(event, event_data)
+        del row["event_id"], row["created"]
+        return Events(**row)
 
     def to_native(self, validate_entity_id=True):
         """Convert to a native HA Event."""
@@ -138,6 +155,20 @@ class Events(Base):  # type: ignore
             return None
 
 
+def _attributes_json(state: State) -> str:
+    """Return the attributes of a state as compact JSON.
+
+    The cached JSON of the state refuses NaN and infinity, the recorder keeps
+    storing them like it stores them in the event data.
+    """
+    try:
+        return state.attributes_json().decode("utf-8")
+    except ValueError:
+        return json.dumps(
+            dict(state.attributes), cls=JSONEncoder, separators=(",", ":")
+        )
+
+
 class States(Base):  # type: ignore
     """State change history."""
 
@@ -160,8 +191,12 @@ class States(Base):  # type: ignore
     last_updated = Column(DATETIME_TYPE, default=dt_util.utcnow, index=True)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
     old_state_id = Column(Integer, ForeignKey("states.state_id"), index=True)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
+    state_attributes = relationship("StateAttributes", lazy="joined")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -175,38 +210,58 @@ class States(Base):  # type: ignore
         )
 
     @staticmethod
-    def from_event(event):
-        """Create object from a state_changed event."""
+    def row_from_event(event) -> dict[str, Any]:
+        """Create the column values of a state database row."""
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
-        else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(
-                dict(state.attributes), cls=JSONEncoder, separators=(",", ":")
-            )
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
+            return {
+                "state_id": None,
+                "domain": split_entity_id(entity_id)[0],
+                "entity_id": entity_id,
+                "state": "",
+                "attributes": "{}",
+                "event_id": None,
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+                "created": event.time_fired,
+                "old_state_id": None,
+                "attributes_id": None,
+            }
+
+        return {
+            "state_id": None,
+            "domain": state.domain,
+            "entity_id": entity_id,
+            "state": state.state,
+            "attributes": _attributes_json(state),
+            "event_id": None,
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
+            "created": event.time_fired,
+            "old_state_id": None,
+            "attributes_id": None,
+        }
 
-        return dbstate
+    @staticmethod
+    def from_event(event):
+        """Create object from a state_changed event."""
+        row = States.row_from_event(event)
+        del row["state_id"], row["event_id"], row["created"], row["old_state_id"]
+        return States(**row)
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
+        attributes = self.attributes
+        if attributes is None and self.state_attributes is not None:
+            attributes = self.state_attributes.shared_attrs
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(attributes or "{}"),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 # Join the events table on event_id to get the context instead
@@ -220,6 +275,33 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """Attributes shared by the states."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, Identity(), primary_key=True)
+    hash = Column(BigInteger, index=True)
+    # Note that this is not named attributes to avoid confusion with the states table
+    shared_attrs = Column(Text().with_variant(mysql.LONGTEXT, "mysql"))
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StateAttributes("
+            f"id={self.attributes_id}, hash='{self.hash}', "
+            f"attributes='{self.shared_attrs}'"
+            f")>"
+        )
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs: str) -> int:
+        """Return the hash of the JSON of the attributes."""
+        return zlib.crc32(shared_attrs.encode("utf-8"))
+
+
 class StatisticData(TypedDict, total=False):
     """Statistic data class."""
 
@@ -231,21 +313,21 @@ class StatisticData(TypedDict, total=False):
     sum: float
 
 
-class Statistics(Base):  # type: ignore
-    """Statistics."""
+class StatisticsBase:
+    """Statistics base class."""
 
-    __table_args__ = (
-        # Used for fetching statistics for a certain entity at a specific time
-        Index("ix_statistics_statistic_id_start", "metadata_id", "start"),
-    )
-    __tablename__ = TABLE_STATISTICS
     id = Column(Integer, primary_key=True)
     created = Column(DATETIME_TYPE, default=dt_util.utcnow)
-    metadata_id = Column(
-        Integer,
-        ForeignKey(f"{TABLE_STATISTICS_META}.id", ondelete="CASCADE"),
-        index=True,
-    )
+
+    @declared_attr
+    def metadata_id(self):
+        """Define the metadata_id column for sub classes."""
+        return Column(
+            Integer,
+            ForeignKey(f"{TABLE_STATISTICS_META}.id", ondelete="CASCADE"),
+            index=True,
+        )
+
     start = Column(DATETIME_TYPE, index=True)
     mean = Column(DOUBLE_TYPE)
     min = Column(DOUBLE_TYPE)
@@ -254,16 +336,55 @@ class Statistics(Base):  # type: ignore
     state = Column(DOUBLE_TYPE)
     sum = Column(DOUBLE_TYPE)
 
-    @staticmethod
-    def from_stats(metadata_id: str, start: datetime, stats: StatisticData):
+    @classmethod
+    def from_stats(cls, metadata_id: str, start: datetime, stats: StatisticData):
         """Create object from a statistics."""
-        return Statistics(
+        return cls(
             metadata_id=metadata_id,
             start=start,
             **stats,
         )
 
 
+class Statistics(Base, StatisticsBase):  # type: ignore
+    """Hourly statistics."""
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time,
+        # covers the returned columns so the rows are read from the index only
+        Index(
+            "ix_statistics_metadata_id_start_values",
+            "metadata_id",
+            "start",
+            "mean",
+            "min",
+            "max",
+            "last_reset",
+            "state",
+            "sum",
+        ),
+    )
+    __tablename__ = TABLE_STATISTICS
+
+
+class StatisticsDaily(Base, StatisticsBase):  # type: ignore
+    """Daily statistics, rolled up from the hourly statistics."""
+
+    __table_args__ = (
+        Index("ix_statistics_daily_metadata_id_start", "metadata_id", "start"),
+    )
+    __tablename__ = TABLE_STATISTICS_DAILY
+
+
+class StatisticsMonthly(Base, StatisticsBase):  # type: ignore
+    """Monthly statistics, rolled up from the daily statistics."""
+
+    __table_args__ = (
+        Index("ix_statistics_monthly_metadata_id_start", "metadata_id", "start"),
+    )
+    __tablename__ = TABLE_STATISTICS_MONTHLY
+
+
 class StatisticMetaData(TypedDict, total=False):
     """Statistic meta data class."""
 
@@ -435,7 +556,9 @@ class LazyState(State):
         """State attributes."""
         if not self._attributes:
             try:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(
+                    self._row.shared_attrs or self._row.attributes or "{}"
+                )
             except ValueError:
                 # When json.loads fails
                 _LOGGER.exception("Error converting row to state: %s", self._row)
@@ -1,15 +1,17 @@
 """Purge old data helper."""
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
 import logging
 from typing import TYPE_CHECKING, Callable
 
+from sqlalchemy import func
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
 from .const import MAX_ROWS_TO_PURGE
-from .models import Events, RecorderRuns, States
+from .models import Events, RecorderRuns, StateAttributes, States
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
 
@@ -19,6 +21,28 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class PurgeProgress:
+    """The rows deleted by the purge of the data before purge_before."""
+
+    purge_before: datetime | None = None
+    events_to_purge: int = 0
+    purged_events: int = 0
+    purged_states: int = 0
+
+    @property
+    def purged_rows(self) -> int:
+        """Return the number of events and states deleted."""
+        return self.purged_events + self.purged_states
+
+    @property
+    def percentage(self) -> int:
+        """Return the percentage of the events to purge deleted."""
+        if not self.events_to_purge:
+            return 100
+        return min(100, self.purged_events * 100 // self.events_to_purge)
+
+
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder, purge_before: datetime, repack: bool, apply_filter: bool = False
@@ -33,13 +57,18 @@ def purge_old_data(
     )
 
     with session_scope(session=instance.get_session()) as session:  # type: ignore
+        if instance.purge_progress.purge_before != purge_before:
+            instance.purge_progress = PurgeProgress(
+                purge_before, _count_events_to_purge(session, purge_before)
+            )
+
         # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
         event_ids = _select_event_ids_to_purge(session, purge_before)
         state_ids = _select_state_ids_to_purge(session, purge_before, event_ids)
         if state_ids:
-            _purge_state_ids(session, state_ids)
+            _purge_state_ids(instance, session, state_ids)
         if event_ids:
-            _purge_event_ids(session, event_ids)
+            _purge_event_ids(instance, session, event_ids)
             # If states or events purging isn't processing the purge_before yet,
             # return false, as we are not done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
@@ -53,11 +82,21 @@ def purge_old_data(
     return True
 
 
+def _count_events_to_purge(session: Session, purge_before: datetime) -> int:
+    """Return the number of events to purge."""
+    return (  # type: ignore[no-any-return]
+        session.query(func.count(Events.event_id))
+        .filter(Events.time_fired < purge_before)
+        .scalar()
+    )
+
+
 def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list[int]:
-    """Return a list of event ids to purge."""
+    """Return a list of the oldest event ids to purge."""
     events = (
         session.query(Events.event_id)
         .filter(Events.time_fired < purge_before)
+        .order_by(Events.time_fired)
         .limit(MAX_ROWS_TO_PURGE)
         .all()
     )
@@ -81,8 +120,16 @@ def _select_state_ids_to_purge(
     return [state.state_id for state in states]
 
 
-def _purge_state_ids(session: Session, state_ids: list[int]) -> None:
+def _purge_state_ids(
+    instance: Recorder, session: Session, state_ids: list[int]
+) -> None:
     """Disconnect states and delete by state id."""
+    attributes_ids = {
+        attributes_id
+        for (attributes_id,) in session.query(distinct(States.attributes_id))
+        .filter(States.state_id.in_(state_ids))
+        .filter(States.attributes_id.isnot(None))
+    }
 
     # Update old_state_id to NULL before deleting to ensure
     # the delete does not fail due to a foreign key constraint
@@ -101,9 +148,37 @@ def _purge_state_ids(session: Session, state_ids: list[int]) -> None:
         .delete(synchronize_session=False)
     )
     _LOGGER.debug("Deleted %s states", deleted_rows)
+    instance.purge_progress.purged_states += deleted_rows
 
+    if attributes_ids:
+        _purge_unused_attributes_ids(instance, session, attributes_ids)
 
-def _purge_event_ids(session: Session, event_ids: list[int]) -> None:
+
+def _purge_unused_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: set[int]
+) -> None:
+    """Delete the shared attributes no state uses anymore."""
+    used_attributes_ids = {
+        attributes_id
+        for (attributes_id,) in session.query(distinct(States.attributes_id)).filter(
+            States.attributes_id.in_(attributes_ids)
+        )
+    }
+    if not (unused_attributes_ids := attributes_ids - used_attributes_ids):
+        return
+
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(unused_attributes_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s state attributes", deleted_rows)
+    instance.evict_state_attributes_ids(unused_attributes_ids)
+
+
+def _purge_event_ids(
+    instance: Recorder, session: Session, event_ids: list[int]
+) -> None:
     """Delete by event id."""
     deleted_rows = (
         session.query(Events)
@@ -111,6 +186,7 @@ def _purge_event_ids(session: Session, event_ids: list[int]) -> None:
         .delete(synchronize_session=False)
     )
     _LOGGER.debug("Deleted %s events", deleted_rows)
+    instance.purge_progress.purged_events += deleted_rows
 
 
 def _purge_old_recorder_runs(
@@ -138,7 +214,7 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
         if not instance.entity_filter(entity_id)
     ]
     if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(session, excluded_entity_ids)
+        _purge_filtered_states(instance, session, excluded_entity_ids)
         return False
 
     # Check if excluded event_types are in database
@@ -148,13 +224,15 @@ def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
         if event_type in instance.exclude_t
     ]
     if len(excluded_event_types) > 0:
-        _purge_filtered_events(session, excluded_event_types)
+        _purge_filtered_events(instance, session, excluded_event_types)
         return False
 
     return True
 
 
-def _purge_filtered_states(session: Session, excluded_entity_ids: list[str]) -> None:
+def _purge_filtered_states(
+    instance: Recorder, session: Session, excluded_entity_ids: list[str]
+) -> None:
     """Remove filtered states and linked events."""
     state_ids: list[int]
     event_ids: list[int | None]
@@ -170,11 +248,13 @@ def _purge_filtered_states(session: Session, excluded_entity_ids: list[str]) ->
     _LOGGER.debug(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
     )
-    _purge_state_ids(session, state_ids)
-    _purge_event_ids(session, event_ids)  # type: ignore  # type of event_ids already narrowed to 'list[int]'
+    _purge_state_ids(instance, session, state_ids)
+    _purge_event_ids(instance, session, event_ids)  # type: ignore  # type of event_ids already narrowed to 'list[int]'
 
 
-def _purge_filtered_events(session: Session, excluded_event_types: list[str]) -> None:
+def _purge_filtered_events(
+    instance: Recorder, session: Session, excluded_event_types: list[str]
+) -> None:
     """Remove filtered events and linked states."""
     events: list[Events] = (
         session.query(Events.event_id)
@@ -190,8 +270,8 @@ def _purge_filtered_events(session: Session, excluded_event_types: list[str]) ->
         session.query(States.state_id).filter(States.event_id.in_(event_ids)).all()
     )
     state_ids: list[int] = [state.state_id for state in states]
-    _purge_state_ids(session, state_ids)
-    _purge_event_ids(session, event_ids)
+    _purge_state_ids(instance, session, state_ids)
+    _purge_event_ids(instance, session, event_ids)
 
 
 @retryable_database_job("purge")
@@ -206,7 +286,7 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
         _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
         if len(selected_entity_ids) > 0:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-            _purge_filtered_states(session, selected_entity_ids)
+            _purge_filtered_states(instance, session, selected_entity_ids)
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
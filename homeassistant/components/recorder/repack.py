@@ -4,19 +4,37 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
+from sqlalchemy import text
+
+from .const import DB_PROFILE_FLASH
+
 if TYPE_CHECKING:
     from . import Recorder
 
 _LOGGER = logging.getLogger(__name__)
 
 
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
+
+
 def repack_database(instance: Recorder) -> None:
     """Repack based on engine type."""
 
     # Execute sqlite command to free up space on disk
     if instance.engine.dialect.name == "sqlite":
         _LOGGER.debug("Vacuuming SQL DB to free space")
-        instance.engine.execute("VACUUM")
+        if instance.db_profile != DB_PROFILE_FLASH:
+            instance.engine.execute("VACUUM")
+            return
+        if sqlite_incremental_vacuum_enabled(instance):
+            # The free pages are released in chunks by incremental_vacuum
+            # instead of locking the database for the rewrite of a VACUUM
+            return
+        with instance.engine.connect() as conn:
+            # The database is rewritten anyway, switch it to incremental
+            # vacuum so this is the last full VACUUM
+            conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            conn.execute(text("VACUUM"))
         return
 
     # Execute postgresql vacuum command to free up space on disk
@@ -33,3 +51,36 @@ def repack_database(instance: Recorder) -> None:
         _LOGGER.debug("Optimizing SQL DB to free space")
         instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
         return
+
+
+def sqlite_incremental_vacuum_enabled(instance: Recorder) -> bool:
+    """Return if the SQLite database releases free pages incrementally."""
+    with instance.engine.connect() as conn:
+        return bool(
+            conn.execute(text("PRAGMA auto_vacuum")).scalar()
+            == SQLITE_AUTO_VACUUM_INCREMENTAL
+        )
+
+
+def incremental_vacuum(instance: Recorder, pages: int) -> bool:
+    """Release up to pages free pages of an incremental vacuum SQLite database.
+
+    Returns True when no free pages are left.
+    """
+    dbapi_connection = instance.engine.raw_connection()
+    try:
+        cursor = dbapi_connection.cursor()
+        # A page is released per step of the statement, unlike execute
+        # executescript steps it to the end. It also commits the open
+        # transaction of the connection, which the SQLite pool shares with
+        # the event session. That is safe as this runs as a task of the
+        # recorder thread and the event session only writes its pending
+        # rows in _commit_event_session, which commits them right away.
+        cursor.executescript(f"PRAGMA incremental_vacuum({pages});")
+        cursor.execute("PRAGMA freelist_count")
+        free_pages = cursor.fetchone()[0]
+        cursor.close()
+    finally:
+        dbapi_connection.close()
+    _LOGGER.debug("Incremental vacuum left %s free pages", free_pages)
+    return not free_pages
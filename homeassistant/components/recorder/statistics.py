@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from itertools import groupby
 import logging
 from typing import TYPE_CHECKING, Any, Callable
@@ -11,6 +11,7 @@ from sqlalchemy import bindparam
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext import baked
 from sqlalchemy.orm.scoping import scoped_session
+from sqlalchemy.orm.session import Session
 
 from homeassistant.const import (
     PRESSURE_PA,
@@ -30,8 +31,12 @@ from .const import DOMAIN
 from .models import (
     StatisticMetaData,
     Statistics,
+    StatisticsBase,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
     StatisticsRuns,
+    process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
 from .util import execute, retryable_database_job, session_scope
@@ -39,16 +44,35 @@ from .util import execute, retryable_database_job, session_scope
 if TYPE_CHECKING:
     from . import Recorder
 
-QUERY_STATISTICS = [
-    Statistics.metadata_id,
-    Statistics.start,
-    Statistics.mean,
-    Statistics.min,
-    Statistics.max,
-    Statistics.last_reset,
-    Statistics.state,
-    Statistics.sum,
-]
+PERIOD_HOUR = "hour"
+PERIOD_DAY = "day"
+PERIOD_MONTH = "month"
+
+STATISTICS_TABLES: dict[str, type[StatisticsBase]] = {
+    PERIOD_HOUR: Statistics,
+    PERIOD_DAY: StatisticsDaily,
+    PERIOD_MONTH: StatisticsMonthly,
+}
+
+
+def _query_statistics(table: type[StatisticsBase]) -> list:
+    """Return the columns to query from a statistics table."""
+    return [
+        table.metadata_id,
+        table.start,
+        table.mean,
+        table.min,
+        table.max,
+        table.last_reset,
+        table.state,
+        table.sum,
+    ]
+
+
+QUERY_STATISTICS = _query_statistics(Statistics)
+QUERY_STATISTICS_PERIOD = {
+    period: _query_statistics(table) for period, table in STATISTICS_TABLES.items()
+}
 
 QUERY_STATISTIC_META = [
     StatisticsMeta.id,
@@ -224,11 +248,120 @@ def compile_statistics(instance: Recorder, start: datetime) -> bool:
                         metadata_id,
                         stat,
                     )
+        _compile_rollups(session, start)
         session.add(StatisticsRuns(start=start))
 
     return True
 
 
+def _start_of_local_day(time: datetime) -> datetime:
+    """Return the start of the local day of time in UTC."""
+    return dt_util.as_utc(dt_util.start_of_local_day(dt_util.as_local(time)))
+
+
+def _start_of_local_month(time: datetime) -> datetime:
+    """Return the start of the local month of time in UTC."""
+    local_date = dt_util.as_local(time).date()
+    return dt_util.as_utc(dt_util.start_of_local_day(local_date.replace(day=1)))
+
+
+def _next_local_month(month_start: datetime) -> datetime:
+    """Return the start of the local month after the one starting at month_start."""
+    local_date = dt_util.as_local(month_start).date()
+    next_month: date = (local_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return dt_util.as_utc(dt_util.start_of_local_day(next_month))
+
+
+def _rollup_statistics(
+    session: Session,
+    source: type[StatisticsBase],
+    target: type[StatisticsBase],
+    start: datetime,
+    end: datetime | None,
+    period_start: Callable[[datetime], datetime],
+) -> None:
+    """Aggregate the source statistics during start - end into the target table.
+
+    The target rows of the periods during start - end are replaced. Mean, min and
+    max aggregate over the period, last_reset, state and sum are the last values
+    of the period.
+    """
+    query = session.query(*_query_statistics(source)).filter(source.start >= start)
+    if end is not None:
+        query = query.filter(source.start < end)
+    rows = execute(query.order_by(source.metadata_id, source.start)) or []
+
+    delete = session.query(target).filter(target.start >= start)
+    if end is not None:
+        delete = delete.filter(target.start < end)
+    delete.delete(synchronize_session=False)
+
+    rollups = []
+    for (metadata_id, rollup_start), group in groupby(
+        rows, lambda row: (row.metadata_id, period_start(process_timestamp(row.start)))
+    ):
+        period_rows = list(group)
+        means = [row.mean for row in period_rows if row.mean is not None]
+        mins = [row.min for row in period_rows if row.min is not None]
+        maxs = [row.max for row in period_rows if row.max is not None]
+        last = period_rows[-1]
+        rollups.append(
+            {
+                "metadata_id": metadata_id,
+                "start": rollup_start,
+                "mean": sum(means) / len(means) if means else None,
+                "min": min(mins) if mins else None,
+                "max": max(maxs) if maxs else None,
+                "last_reset": last.last_reset,
+                "state": last.state,
+                "sum": last.sum,
+            }
+        )
+    session.bulk_insert_mappings(target, rollups)
+
+
+def _compile_rollups(session: Session, start: datetime) -> None:
+    """Update the daily and monthly statistics of the hour starting at start."""
+    day_start = _start_of_local_day(start)
+    day_end = _start_of_local_day(day_start + timedelta(hours=25))
+    _rollup_statistics(
+        session, Statistics, StatisticsDaily, day_start, day_end, _start_of_local_day
+    )
+    month_start = _start_of_local_month(start)
+    _rollup_statistics(
+        session,
+        StatisticsDaily,
+        StatisticsMonthly,
+        month_start,
+        _next_local_month(month_start),
+        _start_of_local_month,
+    )
+
+
+def rollup_all_statistics(session: Session) -> None:
+    """Rebuild the daily and monthly statistics from all hourly statistics."""
+    first = session.query(Statistics.start).order_by(Statistics.start).first()
+    if first is None:
+        return
+    first_start = process_timestamp(first.start)
+    _rollup_statistics(
+        session,
+        Statistics,
+        StatisticsDaily,
+        _start_of_local_day(first_start),
+        None,
+        _start_of_local_day,
+    )
+    _rollup_statistics(
+        session,
+        StatisticsDaily,
+        StatisticsMonthly,
+        _start_of_local_month(first_start),
+        None,
+        _start_of_local_month,
+    )
+
+
 def _get_metadata(
     hass: HomeAssistant,
     session: scoped_session,
@@ -307,7 +440,7 @@ def list_statistic_ids(
     """Return statistic_ids and meta data."""
     units = hass.config.units
     statistic_ids = {}
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         metadata = _get_metadata(hass, session, None, statistic_type)
 
         for meta in metadata.values():
@@ -339,47 +472,88 @@ def list_statistic_ids(
     ]
 
 
-def statistics_during_period(
+def _statistics_during_period_query(
     hass: HomeAssistant,
+    session: scoped_session,
     start_time: datetime,
-    end_time: datetime | None = None,
-    statistic_ids: list[str] | None = None,
-) -> dict[str, list[dict[str, str]]]:
-    """Return states changes during UTC period start_time - end_time."""
-    metadata = None
-    with session_scope(hass=hass) as session:
-        metadata = _get_metadata(hass, session, statistic_ids, None)
-        if not metadata:
-            return {}
+    end_time: datetime | None,
+    statistic_ids: list[str] | None,
+    period: str,
+) -> tuple[dict[str, StatisticMetaData], list]:
+    """Return the metadata and the statistics rows of a period table."""
+    metadata = _get_metadata(hass, session, statistic_ids, None)
+    if not metadata:
+        return {}, []
+
+    table = STATISTICS_TABLES[period]
+    # The period is part of the cache key, the criteria below close over table
+    baked_query = hass.data[STATISTICS_BAKERY](
+        lambda session: session.query(*QUERY_STATISTICS_PERIOD[period]), period
+    )
 
-        baked_query = hass.data[STATISTICS_BAKERY](
-            lambda session: session.query(*QUERY_STATISTICS)
+    baked_query += lambda q: q.filter(table.start >= bindparam("start_time"))
+
+    if end_time is not None:
+        baked_query += lambda q: q.filter(table.start < bindparam("end_time"))
+
+    metadata_ids = None
+    if statistic_ids is not None:
+        baked_query += lambda q: q.filter(
+            table.metadata_id.in_(bindparam("metadata_ids"))
         )
+        metadata_ids = list(metadata.keys())
 
-        baked_query += lambda q: q.filter(Statistics.start >= bindparam("start_time"))
+    baked_query += lambda q: q.order_by(table.metadata_id, table.start)
 
-        if end_time is not None:
-            baked_query += lambda q: q.filter(Statistics.start < bindparam("end_time"))
+    stats = execute(
+        baked_query(session).params(
+            start_time=start_time, end_time=end_time, metadata_ids=metadata_ids
+        )
+    )
+    return metadata, stats or []
 
-        metadata_ids = None
-        if statistic_ids is not None:
-            baked_query += lambda q: q.filter(
-                Statistics.metadata_id.in_(bindparam("metadata_ids"))
-            )
-            metadata_ids = list(metadata.keys())
 
-        baked_query += lambda q: q.order_by(Statistics.metadata_id, Statistics.start)
+def statistics_during_period(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    statistic_ids: list[str] | None = None,
+    period: str = PERIOD_HOUR,
+) -> dict[str, list[dict[str, str]]]:
+    """Return statistics during UTC period start_time - end_time.
 
-        stats = execute(
-            baked_query(session).params(
-                start_time=start_time, end_time=end_time, metadata_ids=metadata_ids
-            )
+    The period selects the hourly, daily or monthly statistics.
+    """
+    with session_scope(hass=hass, read_only=True) as session:
+        metadata, stats = _statistics_during_period_query(
+            hass, session, start_time, end_time, statistic_ids, period
         )
         if not stats:
             return {}
         return _sorted_statistics_to_dict(hass, stats, statistic_ids, metadata, True)
 
 
+def statistics_during_period_columnar(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    statistic_ids: list[str] | None = None,
+    period: str = PERIOD_HOUR,
+) -> dict[str, dict[str, list]]:
+    """Return statistics during UTC period start_time - end_time as columns.
+
+    Each statistic_id maps to a list per column, start and last_reset are UNIX
+    timestamps, which is much more compact than a dict per row.
+    """
+    with session_scope(hass=hass, read_only=True) as session:
+        metadata, stats = _statistics_during_period_query(
+            hass, session, start_time, end_time, statistic_ids, period
+        )
+        if not stats:
+            return {}
+        return _sorted_statistics_to_columns(hass, stats, metadata)
+
+
 def get_last_statistics(
     hass: HomeAssistant, number_of_stats: int, statistic_id: str, convert_units: bool
 ) -> dict[str, list[dict]]:
@@ -465,3 +639,33 @@ def _sorted_statistics_to_dict(
 
     # Filter out the empty lists if some states had 0 results.
     return {metadata[key]["statistic_id"]: val for key, val in result.items() if val}
+
+
+def _sorted_statistics_to_columns(
+    hass: HomeAssistant,
+    stats: list,
+    metadata: dict[str, StatisticMetaData],
+) -> dict[str, dict[str, list]]:
+    """Convert SQL results into a list per column for each statistic_id."""
+    result: dict[str, dict[str, list]] = {}
+    units = hass.config.units
+
+    def _timestamp(time: datetime | None) -> float | None:
+        """Return the UNIX timestamp of a database time."""
+        if time is None:
+            return None
+        return process_timestamp(time).timestamp()  # type: ignore
+
+    for meta_id, group in groupby(stats, lambda stat: stat.metadata_id):  # type: ignore
+        unit = metadata[meta_id]["unit_of_measurement"]
+        convert = UNIT_CONVERSIONS.get(unit, lambda x, units: x)  # type: ignore
+        rows = list(group)
+        columns: dict[str, list] = {
+            "start": [_timestamp(row.start) for row in rows],
+            "last_reset": [_timestamp(row.last_reset) for row in rows],
+        }
+        for column in ("mean", "min", "max", "state", "sum"):
+            columns[column] = [convert(getattr(row, column), units) for row in rows]
+        result[metadata[meta_id]["statistic_id"]] = columns
+
+    return result
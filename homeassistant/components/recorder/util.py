@@ -17,13 +17,21 @@ from sqlalchemy.orm.session import Session
 from homeassistant.core import HomeAssistant
 import homeassistant.util.dt as dt_util
 
-from .const import DATA_INSTANCE, SQLITE_URL_PREFIX
+from .const import (
+    DATA_INSTANCE,
+    DB_PROFILE_DEFAULT,
+    DB_PROFILE_FLASH,
+    SQLITE_URL_PREFIX,
+)
 from .models import (
     ALL_TABLES,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
+    TABLE_STATE_ATTRIBUTES,
     TABLE_STATISTICS,
+    TABLE_STATISTICS_DAILY,
     TABLE_STATISTICS_META,
+    TABLE_STATISTICS_MONTHLY,
     TABLE_STATISTICS_RUNS,
     RecorderRuns,
     process_timestamp,
@@ -52,11 +60,22 @@ RETRYABLE_MYSQL_ERRORS = (1205, 1206, 1213)
 
 @contextmanager
 def session_scope(
-    *, hass: HomeAssistant | None = None, session: Session | None = None
+    *,
+    hass: HomeAssistant | None = None,
+    session: Session | None = None,
+    read_only: bool = False,
 ) -> Generator[Session, None, None]:
-    """Provide a transactional scope around a series of operations."""
+    """Provide a transactional scope around a series of operations.
+
+    Queries that only read can ask for a read only session, which does not
+    contend with the recorder thread when the database has a read only pool.
+    """
     if session is None and hass is not None:
-        session = hass.data[DATA_INSTANCE].get_session()
+        instance = hass.data[DATA_INSTANCE]
+        if read_only:
+            session = instance.get_read_only_session()
+        else:
+            session = instance.get_session()
 
     if session is None:
         raise RuntimeError("Session required")
@@ -184,8 +203,16 @@ def basic_sanity_check(cursor):
     """Check tables to make sure select does not fail."""
 
     for table in ALL_TABLES:
-        # The statistics tables may not be present in old databases
-        if table in [TABLE_STATISTICS, TABLE_STATISTICS_META, TABLE_STATISTICS_RUNS]:
+        # The statistics and state attributes tables may not be present in old
+        # databases
+        if table in [
+            TABLE_STATISTICS,
+            TABLE_STATISTICS_DAILY,
+            TABLE_STATISTICS_MONTHLY,
+            TABLE_STATISTICS_META,
+            TABLE_STATISTICS_RUNS,
+            TABLE_STATE_ATTRIBUTES,
+        ]:
             continue
         if table in (TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES):
             cursor.execute(f"SELECT * FROM {table};")  # nosec # not injection
@@ -260,13 +287,36 @@ def execute_on_connection(dbapi_connection, statement):
     cursor.close()
 
 
-def setup_connection_for_dialect(dialect_name, dbapi_connection, first_connection):
+# Pragmas of the flash profile. The last commits may be lost on power loss
+# in exchange for fewer and larger writes to the storage.
+SQLITE_FLASH_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    # approximately 32MiB of memory
+    "PRAGMA cache_size = -32768",
+    "PRAGMA mmap_size = 134217728",
+    "PRAGMA temp_store=MEMORY",
+    # The recorder checkpoints the WAL when idle, this only bounds its size
+    "PRAGMA wal_autocheckpoint=10000",
+    "PRAGMA journal_size_limit = 67108864",
+)
+
+
+def setup_connection_for_dialect(
+    dialect_name, dbapi_connection, first_connection, db_profile=DB_PROFILE_DEFAULT
+):
     """Execute statements needed for dialect connection."""
     # Returns False if the the connection needs to be setup
     # on the next connection, returns True if the connection
     # never needs to be setup again.
     if dialect_name == "sqlite":
         if first_connection:
+            if db_profile == DB_PROFILE_FLASH:
+                # New databases of the flash profile release their free pages
+                # with incremental vacuums, existing ones switch at their
+                # next VACUUM
+                execute_on_connection(
+                    dbapi_connection, "PRAGMA auto_vacuum=INCREMENTAL"
+                )
             old_isolation = dbapi_connection.isolation_level
             dbapi_connection.isolation_level = None
             execute_on_connection(dbapi_connection, "PRAGMA journal_mode=WAL")
@@ -275,8 +325,12 @@ def setup_connection_for_dialect(dialect_name, dbapi_connection, first_connectio
             # instead of every time we open the sqlite connection
             # as its persistent and isn't free to call every time.
 
-        # approximately 8MiB of memory
-        execute_on_connection(dbapi_connection, "PRAGMA cache_size = -8192")
+        if db_profile == DB_PROFILE_FLASH:
+            for pragma in SQLITE_FLASH_PRAGMAS:
+                execute_on_connection(dbapi_connection, pragma)
+        else:
+            # approximately 8MiB of memory
+            execute_on_connection(dbapi_connection, "PRAGMA cache_size = -8192")
 
     if dialect_name == "mysql":
         execute_on_connection(dbapi_connection, "SET session wait_timeout=28800")
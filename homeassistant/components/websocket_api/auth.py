@@ -58,10 +58,12 @@ class AuthPhase:
         hass: HomeAssistant,
         send_message: Callable[[str | dict[str, Any]], None],
         request: Request,
+        pending_messages: Callable[[], int] | None = None,
     ) -> None:
         """Initialize the authentiated connection."""
         self._hass = hass
         self._send_message = send_message
+        self._pending_messages = pending_messages
         self._logger = logger
         self._request = request
 
@@ -97,5 +99,10 @@ class AuthPhase:
         await process_success_login(self._request)
         self._send_message(auth_ok_message())
         return ActiveConnection(
-            self._logger, self._hass, self._send_message, user, refresh_token
+            self._logger,
+            self._hass,
+            self._send_message,
+            user,
+            refresh_token,
+            self._pending_messages,
         )
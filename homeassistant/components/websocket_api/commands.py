@@ -11,8 +11,13 @@ import voluptuous as vol
 from homeassistant.auth.permissions.const import CAT_ENTITIES, POLICY_READ
 from homeassistant.bootstrap import SIGNAL_BOOTSTRAP_INTEGRATONS
 from homeassistant.components.websocket_api.const import ERR_NOT_FOUND
-from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL
-from homeassistant.core import Context, Event, HomeAssistant, callback
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+    MATCH_ALL,
+)
+from homeassistant.core import Context, Event, HomeAssistant, callback, split_entity_id
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
@@ -24,6 +29,7 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
+    async_template_render_stats,
     async_track_template_result,
 )
 from homeassistant.helpers.json import ExtendedJSONEncoder
@@ -44,6 +50,7 @@ def async_register_commands(
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_execute_script)
+    async_reg(hass, handle_get_backlog)
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_get_services)
     async_reg(hass, handle_get_states)
@@ -52,6 +59,7 @@ def async_register_commands(
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
+    async_reg(hass, handle_render_template_stats)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
@@ -69,6 +77,12 @@ def pong_message(iden: int) -> dict[str, Any]:
     {
         vol.Required("type"): "subscribe_events",
         vol.Optional("event_type", default=MATCH_ALL): str,
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("domains"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("attributes"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("coalesce", default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=const.MAX_COALESCE_WINDOW)
+        ),
     }
 )
 def handle_subscribe_events(
@@ -84,6 +98,23 @@ def handle_subscribe_events(
     if event_type not in SUBSCRIBE_ALLOWLIST and not connection.user.is_admin:
         raise Unauthorized
 
+    filtered = msg["coalesce"] > 0 or any(
+        key in msg for key in ("entity_ids", "domains", "attributes")
+    )
+
+    if filtered and event_type != EVENT_STATE_CHANGED:
+        connection.send_error(
+            msg["id"],
+            const.ERR_INVALID_FORMAT,
+            f"Only {EVENT_STATE_CHANGED} events can be filtered or coalesced",
+        )
+        return
+
+    if filtered:
+        _async_subscribe_state_changed_filtered(hass, connection, msg)
+        connection.send_message(messages.result_message(msg["id"]))
+        return
+
     if event_type == EVENT_STATE_CHANGED:
 
         @callback
@@ -113,6 +144,62 @@ def handle_subscribe_events(
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+def _async_subscribe_state_changed_filtered(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Forward the state changed events of some entities and attributes."""
+    entity_ids = set(msg.get("entity_ids", ()))
+    domains = msg.get("domains")
+    attributes = msg.get("attributes")
+    window = msg["coalesce"]
+
+    @callback
+    def forward_events(event: Event) -> None:
+        """Forward the matching state changed events to websocket."""
+        entity_id = event.data["entity_id"]
+        if (
+            domains is not None
+            and entity_id not in entity_ids
+            and split_entity_id(entity_id)[0] not in domains
+        ):
+            return
+
+        if not connection.user.permissions.check_entity(entity_id, POLICY_READ):
+            return
+
+        if attributes is None:
+            message = messages.cached_event_message(msg["id"], event)
+        else:
+            message = messages.state_changed_event_message(msg["id"], event, attributes)
+        connection.send_coalesced_message((msg["id"], entity_id), message, window)
+
+    if entity_ids and domains is None:
+        # only the listener of the entity is called, no filtering of all events
+        unsub = hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED, ATTR_ENTITY_ID, entity_ids, forward_events
+        )
+    else:
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, forward_events)
+
+    @callback
+    def async_unsubscribe() -> None:
+        """Stop forwarding, also the events held back in the window."""
+        unsub()
+        connection.async_discard_coalesced(msg["id"])
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+
+
+@callback
+@decorators.websocket_command({vol.Required("type"): "get_backlog"})
+def handle_get_backlog(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle get backlog command."""
+    connection.send_result(msg["id"], connection.async_backlog())
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -238,7 +325,7 @@ def handle_get_states(
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.states_result_message(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -314,6 +401,16 @@ def handle_ping(
     connection.send_message(pong_message(msg["id"]))
 
 
+@callback
+@decorators.require_admin
+@decorators.websocket_command({vol.Required("type"): "render_template_stats"})
+def handle_render_template_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle render template stats command."""
+    connection.send_result(msg["id"], async_template_render_stats(hass))
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "render_template",
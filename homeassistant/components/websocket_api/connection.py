@@ -27,6 +27,7 @@ class ActiveConnection:
         send_message: Callable[[str | dict[str, Any]], None],
         user: User,
         refresh_token: RefreshToken,
+        pending_messages: Callable[[], int] | None = None,
     ) -> None:
         """Initialize an active connection."""
         self.logger = logger
@@ -36,6 +37,11 @@ class ActiveConnection:
         self.refresh_token_id = refresh_token.id
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
         self.last_id = 0
+        self._pending_messages = pending_messages
+        # (subscription id, key) -> last message held back in the coalescing window
+        self._coalescing: dict[tuple[int, Hashable], str] = {}
+        self._coalesce_handle: asyncio.TimerHandle | None = None
+        self._coalesced = 0
 
     def context(self, msg: dict[str, Any]) -> Context:
         """Return a context."""
@@ -53,6 +59,57 @@ class ActiveConnection:
         )
         self.send_message(content)
 
+    @callback
+    def send_coalesced_message(
+        self, key: tuple[int, Hashable], message: str, window: float
+    ) -> None:
+        """Send a message that replaces the pending message with the same key.
+
+        The message is held back for up to window seconds, so a slow client
+        only gets the last update of an entity in the window.
+        """
+        if window <= 0:
+            self.send_message(message)
+            return
+
+        if key in self._coalescing:
+            self._coalesced += 1
+        self._coalescing[key] = message
+
+        if self._coalesce_handle is None:
+            self._coalesce_handle = self.hass.loop.call_later(
+                window, self._async_send_coalesced
+            )
+
+    @callback
+    def async_discard_coalesced(self, msg_id: int) -> None:
+        """Forget the held back messages of a subscription.
+
+        The keys of the messages of a subscription start with its id.
+        """
+        for key in [key for key in self._coalescing if key[0] == msg_id]:
+            del self._coalescing[key]
+        if not self._coalescing and self._coalesce_handle is not None:
+            self._coalesce_handle.cancel()
+            self._coalesce_handle = None
+
+    @callback
+    def _async_send_coalesced(self) -> None:
+        """Send the messages held back in the coalescing window."""
+        self._coalesce_handle = None
+        coalescing, self._coalescing = self._coalescing, {}
+        for message in coalescing.values():
+            self.send_message(message)
+
+    @callback
+    def async_backlog(self) -> dict[str, int]:
+        """Return the messages waiting to be sent to the client."""
+        return {
+            "pending": self._pending_messages() if self._pending_messages else 0,
+            "coalescing": len(self._coalescing),
+            "coalesced": self._coalesced,
+        }
+
     @callback
     def send_error(self, msg_id: int, code: str, message: str) -> None:
         """Send a error message."""
@@ -108,6 +165,10 @@ class ActiveConnection:
         """Close down connection."""
         for unsub in self.subscriptions.values():
             unsub()
+        if self._coalesce_handle is not None:
+            self._coalesce_handle.cancel()
+            self._coalesce_handle = None
+        self._coalescing.clear()
 
     @callback
     def async_handle_exception(self, msg: dict[str, Any], err: Exception) -> None:
@@ -26,6 +26,8 @@ URL: Final = "/api/websocket"
 PENDING_MSG_PEAK: Final = 512
 PENDING_MSG_PEAK_TIME: Final = 5
 MAX_PENDING_MSG: Final = 2048
+# Longest window in seconds the updates of an entity can be coalesced
+MAX_COALESCE_WINDOW: Final = 60
 
 ERR_ID_REUSE: Final = "id_reuse"
 ERR_INVALID_FORMAT: Final = "invalid_format"
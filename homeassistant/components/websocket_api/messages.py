@@ -1,13 +1,14 @@
 """Message templates for websocket commands."""
 from __future__ import annotations
 
+from collections.abc import Collection, Iterable
 from functools import lru_cache
 import logging
 from typing import Any, Final
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -37,6 +38,22 @@ def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
 
 
+def states_result_message(iden: int, states: Iterable[State]) -> str:
+    """Return a success result message with the states.
+
+    Reuses the JSON the states cached.
+    """
+    states = list(states)
+    try:
+        states_json = b",".join(state.as_json() for state in states).decode("utf-8")
+    except (ValueError, TypeError):
+        return message_to_json(result_message(iden, states))
+    return (
+        f'{{"id":{iden},"type":"{const.TYPE_RESULT}","success":true,'
+        f'"result":[{states_json}]}}'
+    )
+
+
 def error_message(iden: int | None, code: str, message: str) -> dict[str, Any]:
     """Return an error result message."""
     return {
@@ -71,7 +88,31 @@ def _cached_event_message(event: Event) -> str:
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
-    return message_to_json(event_message(IDEN_TEMPLATE, event))
+    try:
+        event_json = event.as_json().decode("utf-8")
+    except (ValueError, TypeError):
+        # message_to_json logs the bad data
+        return message_to_json(event_message(IDEN_TEMPLATE, event))
+    return f'{{"id":{IDEN_JSON_TEMPLATE},"type":"event","event":{event_json}}}'
+
+
+def state_changed_event_message(
+    iden: int, event: Event, attributes: Collection[str]
+) -> str:
+    """Return a state changed event message with only some state attributes."""
+    event_dict = event.as_dict()
+    data = event_dict["data"]
+    for key in ("old_state", "new_state"):
+        state = data.get(key)
+        if state is None:
+            continue
+        data[key] = state_dict = dict(state.as_dict())
+        state_dict["attributes"] = {
+            name: value
+            for name, value in state.attributes.items()
+            if name in attributes
+        }
+    return message_to_json(event_message(iden, event_dict))
 
 
 def message_to_json(message: dict[str, Any]) -> str:
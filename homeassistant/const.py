@@ -225,6 +225,7 @@ EVENT_LOGBOOK_ENTRY: Final = "logbook_entry"
 EVENT_SERVICE_REGISTERED: Final = "service_registered"
 EVENT_SERVICE_REMOVED: Final = "service_removed"
 EVENT_STATE_CHANGED: Final = "state_changed"
+EVENT_STATES_CHANGED: Final = "states_changed"
 EVENT_THEMES_UPDATED: Final = "themes_updated"
 EVENT_TIMER_OUT_OF_SYNC: Final = "timer_out_of_sync"
 EVENT_TIME_CHANGED: Final = "time_changed"
@@ -15,6 +15,7 @@ import logging
 import os
 import pathlib
 import re
+import sys
 import threading
 from time import monotonic
 from types import MappingProxyType
@@ -44,6 +45,7 @@ from homeassistant.const import (
     EVENT_SERVICE_REGISTERED,
     EVENT_SERVICE_REMOVED,
     EVENT_STATE_CHANGED,
+    EVENT_STATES_CHANGED,
     EVENT_TIME_CHANGED,
     EVENT_TIMER_OUT_OF_SYNC,
     LENGTH_METERS,
@@ -60,6 +62,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import json_bytes
 from homeassistant.util import location
 from homeassistant.util.async_ import (
     fire_coroutine_threadsafe,
@@ -111,6 +114,14 @@ SOURCE_YAML = "yaml"
 # How long to wait until things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# Attributes of the states without attributes
+EMPTY_ATTRIBUTES: MappingProxyType = MappingProxyType({})
+
+# Types of the attribute values the state machine shares between the states
+_INTERNABLE_TYPES = frozenset((str, int, float, bool, type(None)))
+# Number of unused attributes kept before the shared attributes are pruned
+_MAX_UNUSED_ATTRIBUTES = 1000
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -135,6 +146,24 @@ def valid_state(state: str) -> bool:
     return len(state) <= MAX_LENGTH_STATE_STATE
 
 
+def _attributes_key(attributes: Mapping[str, Any]) -> tuple | None:
+    """Return the key of the attributes to share them or None if they can't be."""
+    key = []
+    for name, value in attributes.items():
+        value_type = type(value)
+        if value_type not in _INTERNABLE_TYPES:
+            return None
+        # the type keeps 1, 1.0 and True apart
+        key.append((name, value_type, value))
+    return tuple(key)
+
+
+def _same_value_types(old: Mapping[str, Any], new: Mapping[str, Any]) -> bool:
+    """Return if equal attributes also have values of the same types."""
+    # 1, 1.0 and True are equal but the new attributes must not keep the old
+    return all(value.__class__ is old[name].__class__ for name, value in new.items())
+
+
 def callback(func: CALLABLE_T) -> CALLABLE_T:
     """Annotation to mark method as safe to call from within the event loop."""
     setattr(func, "_hass_callback", True)
@@ -641,7 +670,15 @@ class EventOrigin(enum.Enum):
 class Event:
     """Representation of an event within the bus."""
 
-    __slots__ = ["event_type", "data", "origin", "time_fired", "context"]
+    __slots__ = [
+        "event_type",
+        "data",
+        "origin",
+        "time_fired",
+        "context",
+        "_as_json",
+        "_data_json",
+    ]
 
     def __init__(
         self,
@@ -657,6 +694,8 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context: Context = context or Context()
+        self._as_json: bytes | None = None
+        self._data_json: bytes | None = None
 
     def __hash__(self) -> int:
         """Make hashable."""
@@ -676,6 +715,43 @@ class Event:
             "context": self.context.as_dict(),
         }
 
+    def as_json(self) -> bytes:
+        """Return the event serialized to JSON, see as_dict.
+
+        Async friendly.
+
+        The UTF-8 bytes are cached, the states in the data reuse their own.
+        """
+        if self._as_json is None:
+            head = json_bytes({"event_type": self.event_type})
+            tail = json_bytes(
+                {
+                    "origin": str(self.origin.value),
+                    "time_fired": self.time_fired.isoformat(),
+                    "context": self.context.as_dict(),
+                }
+            )
+            self._as_json = b'%s,"data":%s,%s' % (
+                head[:-1],
+                self.data_json(),
+                tail[1:],
+            )
+        return self._as_json
+
+    def data_json(self) -> bytes:
+        """Return the data of the event serialized to JSON.
+
+        Async friendly.
+        """
+        if self._data_json is None:
+            self._data_json = b"{%s}" % b",".join(
+                b"%s:%s" % (json_bytes(str(key)), value.as_json())
+                if isinstance(value, State)
+                else json_bytes({key: value})[1:-1]
+                for key, value in self.data.items()
+            )
+        return self._data_json
+
     def __repr__(self) -> str:
         """Return the representation."""
         if self.data:
@@ -701,6 +777,8 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[tuple[HassJob, Callable | None]]] = {}
+        # event_type -> data key -> value of the data key -> jobs
+        self._keyed_listeners: dict[str, dict[str, dict[Any, list[HassJob]]]] = {}
         self._hass = hass
 
     @callback
@@ -709,7 +787,17 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(jobs) for key, jobs in self._listeners.items()}
+        for event_type, indexes in self._keyed_listeners.items():
+            keyed_jobs = {
+                id(job)
+                for index in indexes.values()
+                for jobs in index.values()
+                for job in jobs
+            }
+            if keyed_jobs:
+                listeners[event_type] = listeners.get(event_type, 0) + len(keyed_jobs)
+        return listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -746,30 +834,60 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
+        listeners = self._listeners.get(event_type)
+        keyed_listeners = self._keyed_listeners.get(event_type)
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        match_all_listeners = None
+        if event_type != EVENT_HOMEASSISTANT_CLOSE:
+            match_all_listeners = self._listeners.get(MATCH_ALL)
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
+        for filterable_jobs in (match_all_listeners, listeners):
+            if filterable_jobs is None:
+                continue
+            for job, event_filter in filterable_jobs:
+                if event_filter is not None:
+                    try:
+                        if not event_filter(event):
+                            continue
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error in event filter")
+                        continue
+                self._hass.async_add_hass_job(job, event)
+
+        if keyed_listeners is None or not event_data:
             return
 
-        for job, event_filter in listeners:
-            if event_filter is not None:
-                try:
-                    if not event_filter(event):
-                        continue
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception("Error in event filter")
+        for data_key, index in keyed_listeners.items():
+            try:
+                if event_data.get(data_key) not in index:
                     continue
-            self._hass.async_add_hass_job(job, event)
+            except TypeError:
+                # the value is not hashable, no listener can match it
+                continue
+            self._hass.loop.call_soon(
+                self._async_run_keyed_listeners, index, data_key, event
+            )
+
+    @callback
+    def _async_run_keyed_listeners(
+        self, index: dict[Any, list[HassJob]], data_key: str, event: Event
+    ) -> None:
+        """Run the listeners of the event data value, as they are now."""
+        key = event.data[data_key]
+        jobs = index.get(key)
+        if jobs is None:
+            return
+        for job in jobs[:]:
+            try:
+                self._hass.async_run_hass_job(job, event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error while processing %s for %s", event, key)
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
@@ -823,6 +941,54 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_keyed_listeners(
+        self, event_type: str, data_key: str
+    ) -> dict[Any, list[HassJob]]:
+        """Return the jobs of the keyed listeners by the value of the data key.
+
+        This method must be run in the event loop.
+        """
+        return self._keyed_listeners.setdefault(event_type, {}).setdefault(data_key, {})
+
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: str,
+        data_key: str,
+        keys: Iterable[Any],
+        listener: Callable,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a type where a data key has one of the keys.
+
+        The listeners are found with a dict lookup of the event data value,
+        eg. the state_changed events of some entity_ids, without calling an
+        event filter for every event. The listeners of the value are looked
+        up when the event is handled and run one after another.
+
+        This method must be run in the event loop.
+        """
+        keys = list(keys)
+        job = HassJob(listener)
+        index = self.async_keyed_listeners(event_type, data_key)
+        for key in keys:
+            index.setdefault(key, []).append(job)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            for key in keys:
+                try:
+                    jobs = index[key]
+                    jobs.remove(job)
+                except (KeyError, ValueError):
+                    _LOGGER.exception("Unable to remove unknown job listener %s", job)
+                    continue
+                if not jobs:
+                    del index[key]
+
+        return remove_listener
+
     def listen_once(
         self, event_type: str, listener: Callable[[Event], None]
     ) -> CALLBACK_TYPE:
@@ -919,8 +1085,9 @@ class State:
         "last_updated",
         "context",
         "domain",
-        "object_id",
         "_as_dict",
+        "_as_json",
+        "_attributes_json",
     ]
 
     def __init__(
@@ -948,14 +1115,28 @@ class State:
                 "State max length is 255 characters."
             )
 
-        self.entity_id = entity_id.lower()
+        # keep the entity_id of the state machine, it is already lower case
+        lower_entity_id = entity_id.lower()
+        self.entity_id = entity_id if entity_id == lower_entity_id else lower_entity_id
         self.state = state
-        self.attributes = MappingProxyType(attributes or {})
+        if isinstance(attributes, MappingProxyType):
+            self.attributes = attributes
+        elif attributes:
+            self.attributes = MappingProxyType(attributes)
+        else:
+            self.attributes = EMPTY_ATTRIBUTES
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
-        self.domain, self.object_id = split_entity_id(self.entity_id)
+        self.domain = sys.intern(self.entity_id.split(".", 1)[0])
         self._as_dict: dict[str, Collection[Any]] | None = None
+        self._as_json: bytes | None = None
+        self._attributes_json: bytes | None = None
+
+    @property
+    def object_id(self) -> str:
+        """Object id of this state."""
+        return self.entity_id[len(self.domain) + 1 :]
 
     @property
     def name(self) -> str:
@@ -988,6 +1169,40 @@ class State:
             }
         return self._as_dict
 
+    def as_json(self) -> bytes:
+        """Return the state serialized to JSON, see as_dict.
+
+        Async friendly.
+
+        The state is immutable so the UTF-8 bytes are cached and shared by
+        everything that sends the state.
+        """
+        if self._as_json is None:
+            as_dict = self.as_dict()
+            head = json_bytes({"entity_id": self.entity_id, "state": self.state})
+            tail = json_bytes(
+                {
+                    "last_changed": as_dict["last_changed"],
+                    "last_updated": as_dict["last_updated"],
+                    "context": as_dict["context"],
+                }
+            )
+            self._as_json = b'%s,"attributes":%s,%s' % (
+                head[:-1],
+                self.attributes_json(),
+                tail[1:],
+            )
+        return self._as_json
+
+    def attributes_json(self) -> bytes:
+        """Return the attributes of the state serialized to JSON.
+
+        Async friendly.
+        """
+        if self._attributes_json is None:
+            self._attributes_json = json_bytes(dict(self.attributes))
+        return self._attributes_json
+
     @classmethod
     def from_dict(cls, json_dict: dict) -> Any:
         """Initialize a state from a dict.
@@ -1048,6 +1263,10 @@ class StateMachine:
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
         self._states: dict[str, State] = {}
+        # domain -> entity_id -> state, to filter by domain without a scan
+        self._domain_index: dict[str, dict[str, State]] = {}
+        # hash of the attributes key -> read only copy shared by the states
+        self._attributes: dict[int, MappingProxyType] = {}
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
@@ -1071,13 +1290,12 @@ class StateMachine:
             return list(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), ()))
 
-        return [
-            state.entity_id
-            for state in self._states.values()
-            if state.domain in domain_filter
-        ]
+        entity_ids: list[str] = []
+        for domain in domain_filter:
+            entity_ids.extend(self._domain_index.get(domain, ()))
+        return entity_ids
 
     @callback
     def async_entity_ids_count(
@@ -1091,11 +1309,9 @@ class StateMachine:
             return len(self._states)
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return len(self._domain_index.get(domain_filter.lower(), ()))
 
-        return len(
-            [None for state in self._states.values() if state.domain in domain_filter]
-        )
+        return sum(len(self._domain_index.get(domain, ())) for domain in domain_filter)
 
     def all(self, domain_filter: str | Iterable | None = None) -> list[State]:
         """Create a list of all states."""
@@ -1113,11 +1329,12 @@ class StateMachine:
             return list(self._states.values())
 
         if isinstance(domain_filter, str):
-            domain_filter = (domain_filter.lower(),)
+            return list(self._domain_index.get(domain_filter.lower(), {}).values())
 
-        return [
-            state for state in self._states.values() if state.domain in domain_filter
-        ]
+        states: list[State] = []
+        for domain in domain_filter:
+            states.extend(self._domain_index.get(domain, {}).values())
+        return states
 
     def get(self, entity_id: str) -> State | None:
         """Retrieve state of entity_id or None if not found.
@@ -1160,6 +1377,11 @@ class StateMachine:
         if old_state is None:
             return False
 
+        domain_states = self._domain_index[old_state.domain]
+        del domain_states[entity_id]
+        if not domain_states:
+            del self._domain_index[old_state.domain]
+
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1235,6 +1457,95 @@ class StateMachine:
         This method must be run in the event loop.
         """
         entity_id = entity_id.lower()
+        now = dt_util.utcnow()
+        event_data = self._async_new_state(
+            entity_id, new_state, attributes, force_update, context, now
+        )
+        if event_data is None:
+            return
+
+        self._async_store_state(event_data["new_state"])
+        self._bus.async_fire(
+            EVENT_STATE_CHANGED,
+            event_data,
+            EventOrigin.local,
+            event_data["new_state"].context,
+            time_fired=now,
+        )
+
+    @callback
+    def async_set_many(
+        self,
+        changes: Iterable[tuple[Any, ...]],
+        context: Context | None = None,
+        aggregate: bool = False,
+    ) -> None:
+        """Set the states of many entities at once.
+
+        Each change is a tuple of the async_set arguments: entity_id,
+        new_state and optionally attributes, force_update and context.
+
+        The changes share the update time and the context, when a change
+        has no context of its own. Only the last change of an entity is
+        applied and one state_changed event is fired for each changed
+        entity. Nothing is set if one of the changes is invalid. With
+        aggregate, one EVENT_STATES_CHANGED event with the data of the
+        state_changed events is fired after them, for the listeners that
+        handle the changes in one batch.
+
+        This method must be run in the event loop.
+        """
+        pending: dict[str, tuple[Any, ...]] = {}
+        for entity_id, *args in changes:
+            pending[entity_id.lower()] = tuple(args)
+
+        if context is None:
+            context = Context()
+
+        now = dt_util.utcnow()
+        changed: list[dict[str, Any]] = []
+        for entity_id, (new_state, *args) in pending.items():
+            attributes = args[0] if args else None
+            force_update = args[1] if len(args) > 1 else False
+            change_context = (args[2] if len(args) > 2 else None) or context
+            event_data = self._async_new_state(
+                entity_id, new_state, attributes, force_update, change_context, now
+            )
+            if event_data is not None:
+                changed.append(event_data)
+
+        for event_data in changed:
+            self._async_store_state(event_data["new_state"])
+
+        for event_data in changed:
+            self._bus.async_fire(
+                EVENT_STATE_CHANGED,
+                event_data,
+                EventOrigin.local,
+                event_data["new_state"].context,
+                time_fired=now,
+            )
+
+        if aggregate and changed:
+            self._bus.async_fire(
+                EVENT_STATES_CHANGED,
+                {"changes": changed},
+                EventOrigin.local,
+                context,
+                time_fired=now,
+            )
+
+    @callback
+    def _async_new_state(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Mapping[str, Any] | None,
+        force_update: bool,
+        context: Context | None,
+        now: datetime.datetime,
+    ) -> dict[str, Any] | None:
+        """Return the state_changed data of the new state or None if same."""
         new_state = str(new_state)
         attributes = attributes or {}
         old_state = self._states.get(entity_id)
@@ -1244,17 +1555,22 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
+            same_attr = old_state.attributes == MappingProxyType(
+                attributes
+            ) and _same_value_types(old_state.attributes, attributes)
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
-            return
+            return None
+
+        if same_attr:
+            attributes = old_state.attributes  # type: ignore
+        else:
+            attributes = self._async_intern_attributes(attributes)
 
         if context is None:
             context = Context()
 
-        now = dt_util.utcnow()
-
         state = State(
             entity_id,
             new_state,
@@ -1264,14 +1580,43 @@ class StateMachine:
             context,
             old_state is None,
         )
-        self._states[entity_id] = state
-        self._bus.async_fire(
-            EVENT_STATE_CHANGED,
-            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
-            EventOrigin.local,
-            context,
-            time_fired=now,
-        )
+        return {"entity_id": entity_id, "old_state": old_state, "new_state": state}
+
+    @callback
+    def _async_intern_attributes(
+        self, attributes: Mapping[str, Any]
+    ) -> Mapping[str, Any]:
+        """Return the shared copy of the attributes if they can be shared."""
+        if not attributes:
+            return EMPTY_ATTRIBUTES
+        key = _attributes_key(attributes)
+        if key is None:
+            return attributes
+        key_hash = hash(key)
+        interned = self._attributes.get(key_hash)
+        if interned is not None and _attributes_key(interned) == key:
+            return interned
+        if len(self._attributes) > len(self._states) + _MAX_UNUSED_ATTRIBUTES:
+            self._async_prune_attributes()
+        # a copy, the caller may change its dict later
+        interned = self._attributes[key_hash] = MappingProxyType(dict(attributes))
+        return interned
+
+    @callback
+    def _async_prune_attributes(self) -> None:
+        """Forget the shared attributes no state uses."""
+        attributes = {}
+        for state in self._states.values():
+            key = _attributes_key(state.attributes)
+            if key is not None:
+                attributes[hash(key)] = state.attributes
+        self._attributes = attributes
+
+    @callback
+    def _async_store_state(self, state: State) -> None:
+        """Store the state and index it by domain."""
+        self._states[state.entity_id] = state
+        self._domain_index.setdefault(state.domain, {})[state.entity_id] = state
 
 
 class Service:
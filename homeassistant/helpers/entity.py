@@ -162,6 +162,32 @@ def get_unit_of_measurement(hass: HomeAssistant, entity_id: str) -> str | None:
     return entry.unit_of_measurement
 
 
+@callback
+def async_write_ha_states(
+    hass: HomeAssistant, entities: Iterable[Entity], aggregate: bool = False
+) -> None:
+    """Write the states of many entities to the state machine at once.
+
+    The states share the update time and are set with one
+    StateMachine.async_set_many call, see there for aggregate.
+    """
+    changes = []
+    for entity in entities:
+        if entity.hass is None:
+            raise RuntimeError(f"Attribute hass is None for {entity}")
+
+        if entity.entity_id is None:
+            raise NoEntitySpecifiedError(
+                f"No entity id specified for entity {entity.name}"
+            )
+
+        change = entity._async_state_change()  # pylint: disable=protected-access
+        if change is not None:
+            changes.append(change)
+
+    hass.states.async_set_many(changes, aggregate=aggregate)
+
+
 class DeviceInfo(TypedDict, total=False):
     """Entity device information for device registry."""
 
@@ -479,6 +505,13 @@ class Entity(ABC):
     @callback
     def _async_write_ha_state(self) -> None:
         """Write the state to the state machine."""
+        change = self._async_state_change()
+        if change is not None:
+            self.hass.states.async_set(*change)
+
+    @callback
+    def _async_state_change(self) -> tuple[Any, ...] | None:
+        """Return the async_set arguments of the state or None if disabled."""
         if self.registry_entry and self.registry_entry.disabled_by:
             if not self._disabled_reported:
                 self._disabled_reported = True
@@ -488,7 +521,7 @@ class Entity(ABC):
                     self.entity_id,
                     self.platform.platform_name,
                 )
-            return
+            return None
 
         start = timer()
 
@@ -575,9 +608,7 @@ class Entity(ABC):
             self._context = None
             self._context_set = None
 
-        self.hass.states.async_set(
-            self.entity_id, state, attr, self.force_update, self._context
-        )
+        return self.entity_id, state, attr, self.force_update, self._context
 
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
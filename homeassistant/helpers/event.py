@@ -43,7 +43,6 @@ from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
 TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
-TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
 
 TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
 TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
@@ -54,6 +53,8 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TEMPLATE_RENDER_SCHEDULER = "template_render_scheduler"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -242,62 +243,23 @@ def async_track_state_change_event(
 
     In order to avoid having to iterate a long list
     of EVENT_STATE_CHANGED and fire and create a job
-    for each one, we keep a dict of entity ids that
-    care about the state change events so we can
-    do a fast dict lookup to route events.
+    for each one, the event bus keeps a dict of entity
+    ids that care about the state change events so it
+    can do a fast dict lookup to route events.
     """
     entity_ids = _async_string_to_lower_list(entity_ids)
     if not entity_ids:
         return _remove_empty_listener
 
-    entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
-
-    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("entity_id") in entity_callbacks
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            entity_id = event.data.get("entity_id")
-
-            if entity_id not in entity_callbacks:
-                return
-
-            for job in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_hass_job(job, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing state change for %s", entity_id
-                    )
-
-        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action)
-
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_CHANGE_CALLBACKS,
-            TRACK_STATE_CHANGE_LISTENER,
-            entity_ids,
-            job,
+    if TRACK_STATE_CHANGE_CALLBACKS not in hass.data:
+        # the jobs by entity_id, routed by the event bus
+        hass.data[TRACK_STATE_CHANGE_CALLBACKS] = hass.bus.async_keyed_listeners(
+            EVENT_STATE_CHANGED, ATTR_ENTITY_ID
         )
 
-    return remove_listener
+    return hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, ATTR_ENTITY_ID, entity_ids, action
+    )
 
 
 @callback
@@ -767,6 +729,119 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class _TemplateRenderScheduler:
+    """Refresh the template trackers once per loop iteration.
+
+    The state changed events of a loop iteration are collected per tracker.
+    All the trackers render first, each template at most once, and identical
+    templates without variables share the render. The actions run after
+    the renders, a tracker that a state written by an action triggers is
+    refreshed in the next pass and a tracker removed by an action does not
+    run its action.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.trackers: set[_TrackTemplateResultInfo] = set()
+        # tracker -> state changed events waiting for the next pass
+        self._pending: dict[_TrackTemplateResultInfo, list[Event]] = {}
+        self._rendering = False
+        # template string, limited and strict -> render info of the current pass
+        self._renders: dict[tuple[str, bool | None, bool | None], RenderInfo] = {}
+
+    @callback
+    def async_schedule(self, tracker: _TrackTemplateResultInfo, event: Event) -> None:
+        """Schedule a refresh of the tracker for a state changed event."""
+        if not self._pending:
+            # a task, so async_block_till_done waits for the refresh
+            self.hass.async_create_task(self._async_refresh())
+        self._pending.setdefault(tracker, []).append(event)
+
+    @callback
+    def async_cancel(self, tracker: _TrackTemplateResultInfo) -> None:
+        """Forget a removed tracker."""
+        self.trackers.discard(tracker)
+        self._pending.pop(tracker, None)
+
+    @callback
+    def async_render_to_info(
+        self, template: Template, variables: TemplateVarsType
+    ) -> RenderInfo:
+        """Render the template, or reuse the render of the same template."""
+        if variables or not self._rendering:
+            return template.async_render_to_info(variables)
+
+        # pylint: disable=protected-access
+        # the environment of a compiled template depends on limited and strict
+        key = (template.template, template._limited, template._strict)
+        info = self._renders.get(key)
+        if info is None:
+            info = self._renders[key] = template.async_render_to_info()
+            return info
+
+        shared_info = copy.copy(info)
+        shared_info.template = template
+        return shared_info
+
+    async def _async_refresh(self) -> None:
+        """Refresh the trackers with pending events."""
+        pending = self._pending
+        self._pending = {}
+        results = []
+
+        self._rendering = True
+        try:
+            for tracker, events in pending.items():
+                try:
+                    results.extend(tracker.async_render_events(events))
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error rendering templates of %s", tracker)
+        finally:
+            self._rendering = False
+            self._renders.clear()
+
+        for tracker, event, updates in results:
+            if tracker not in self.trackers:
+                # removed by an earlier action of this pass
+                continue
+            try:
+                tracker.async_run_action(event, updates)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running action of %s", tracker)
+
+
+@callback
+def _async_get_template_scheduler(hass: HomeAssistant) -> _TemplateRenderScheduler:
+    """Return the template render scheduler."""
+    scheduler = hass.data.get(TEMPLATE_RENDER_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[TEMPLATE_RENDER_SCHEDULER] = _TemplateRenderScheduler(
+            hass
+        )
+    return cast(_TemplateRenderScheduler, scheduler)
+
+
+@callback
+@bind_hass
+def async_template_render_stats(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """Return how often and how long the tracked templates render.
+
+    The times are in milliseconds, templates tracked more than once are
+    summed up.
+    """
+    stats: dict[str, dict[str, Any]] = {}
+    for tracker in _async_get_template_scheduler(hass).trackers:
+        for template, (renders, total, longest) in tracker.render_stats.items():
+            template_stats = stats.setdefault(
+                template.template, {"renders": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            template_stats["renders"] += renders
+            template_stats["total_ms"] += total * 1000
+            template_stats["max_ms"] = max(template_stats["max_ms"], longest * 1000)
+    return stats
+
+
 class _TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -790,6 +865,13 @@ class _TrackTemplateResultInfo:
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable] = {}
+        self._scheduler = _async_get_template_scheduler(hass)
+        # template -> renders, total and longest render time in seconds
+        self.render_stats: dict[Template, list] = {}
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return f"<TrackTemplateResultInfo {self._track_templates}>"
 
     def async_setup(self, raise_on_template_error: bool, strict: bool = False) -> None:
         """Activation of template tracking."""
@@ -809,8 +891,11 @@ class _TrackTemplateResultInfo:
                     exc_info=info.exception,
                 )
 
+        self._scheduler.trackers.add(self)
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass,
+            _render_infos_to_track_states(self._info.values()),
+            self._async_schedule_refresh,
         )
         self._update_time_listeners()
         _LOGGER.debug(
@@ -864,6 +949,7 @@ class _TrackTemplateResultInfo:
         assert self._track_state_changes
         self._track_state_changes.async_remove()
         self._rate_limit.async_remove()
+        self._scheduler.async_cancel(self)
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
 
@@ -872,6 +958,44 @@ class _TrackTemplateResultInfo:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _async_schedule_refresh(self, event: Event) -> None:
+        """Refresh the templates with the other state changes of the loop."""
+        self._scheduler.async_schedule(self, event)
+
+    @callback
+    def async_render_events(
+        self, events: list[Event]
+    ) -> list[tuple[_TrackTemplateResultInfo, Event, list[TrackTemplateResult]]]:
+        """Render the templates once for the state changed events.
+
+        Each template re-renders for the last event that triggers it, the
+        state its render reflects. Returns the results to run the action with.
+        """
+        batches = []
+        pending = list(self._track_templates)
+        for event in reversed(events):
+            triggered = [
+                track_template_
+                for track_template_ in pending
+                if _event_triggers_rerender(event, self._info[track_template_.template])
+            ]
+            if not triggered:
+                continue
+            pending = [
+                track_template_
+                for track_template_ in pending
+                if track_template_ not in triggered
+            ]
+            batches.append((event, triggered))
+
+        results = []
+        for event, triggered in reversed(batches):
+            updates = self._render(event, triggered)
+            if updates:
+                results.append((self, event, updates))
+        return results
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
@@ -916,9 +1040,15 @@ class _TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
+        start = time.perf_counter()
+        self._info[template] = info = self._scheduler.async_render_to_info(
+            template, track_template_.variables
         )
+        elapsed = time.perf_counter() - start
+        stats = self.render_stats.setdefault(template, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
 
         try:
             result: str | TemplateError = info.result()
@@ -943,7 +1073,19 @@ class _TrackTemplateResultInfo:
         track_templates: Iterable[TrackTemplate] | None = None,
         replayed: bool | None = False,
     ) -> None:
-        """Refresh the template.
+        """Refresh the template, see _render."""
+        updates = self._render(event, track_templates, replayed)
+        if updates:
+            self.async_run_action(event, updates)
+
+    @callback
+    def _render(
+        self,
+        event: Event | None,
+        track_templates: Iterable[TrackTemplate] | None = None,
+        replayed: bool | None = False,
+    ) -> list[TrackTemplateResult]:
+        """Render the template and return the changed results.
 
         The event is the state_changed event that caused the refresh
         to be considered.
@@ -955,7 +1097,7 @@ class _TrackTemplateResultInfo:
         replayed is True if the event is being replayed because the
         rate limit was hit.
         """
-        updates = []
+        updates: list[TrackTemplateResult] = []
         info_changed = False
         now = event.time_fired if not replayed and event else dt_util.utcnow()
 
@@ -990,12 +1132,16 @@ class _TrackTemplateResultInfo:
                 self.listeners,
             )
 
-        if not updates:
-            return
-
         for track_result in updates:
             self._last_result[track_result.template] = track_result.result
 
+        return updates
+
+    @callback
+    def async_run_action(
+        self, event: Event | None, updates: list[TrackTemplateResult]
+    ) -> None:
+        """Run the action with the changed results."""
         self.hass.async_run_hass_job(self._job, event, updates)
 
 
@@ -1,8 +1,14 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
 from datetime import datetime, timedelta
 import json
+import math
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
@@ -36,3 +42,46 @@ class ExtendedJSONEncoder(JSONEncoder):
             return super().default(o)
         except TypeError:
             return {"__type": str(type(o)), "repr": repr(o)}
+
+
+def _orjson_default(o: Any) -> Any:
+    """Convert the Home Assistant objects orjson doesn't know."""
+    if isinstance(o, set):
+        return list(o)
+    if hasattr(o, "as_dict"):
+        return o.as_dict()
+    raise TypeError
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Return if there are NaN or infinite floats, orjson writes them as null."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        obj = obj.values()
+    elif not isinstance(obj, (list, tuple, set, frozenset)):
+        return False
+    return any(_has_non_finite(value) for value in obj)
+
+
+def json_bytes(obj: Any) -> bytes:
+    """Serialize an object to compact UTF-8 JSON.
+
+    Uses orjson when it is installed and JSONEncoder otherwise. Like
+    JSONEncoder with allow_nan=False, NaN and infinity raise ValueError.
+    """
+    if orjson is not None and not _has_non_finite(obj):
+        try:
+            return orjson.dumps(  # type: ignore[no-any-return]
+                obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            # orjson refuses some data json accepts, e.g. integers over 64 bits
+            pass
+    return json.dumps(
+        obj,
+        cls=JSONEncoder,
+        allow_nan=False,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
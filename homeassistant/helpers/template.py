@@ -10,14 +10,18 @@ from contextlib import suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from functools import partial, wraps
+import hashlib
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
 from operator import attrgetter
 import random
 import re
 import sys
-from typing import Any, Callable, cast
+from types import CodeType
+from typing import TYPE_CHECKING, Any, Callable, cast
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
@@ -32,10 +36,13 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     STATE_UNKNOWN,
+    __version__,
 )
 from homeassistant.core import (
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -55,6 +62,9 @@ from homeassistant.util import convert, dt as dt_util, location as loc_util
 from homeassistant.util.async_ import run_callback_threadsafe
 from homeassistant.util.thread import ThreadWithException
 
+if TYPE_CHECKING:
+    from homeassistant.helpers.storage import Store
+
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
 _LOGGER = logging.getLogger(__name__)
@@ -66,6 +76,12 @@ _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
 
+COMPILED_CACHE_STORAGE_KEY = "core.template_compiled"
+COMPILED_CACHE_STORAGE_VERSION = 1
+COMPILED_CACHE_SAVE_DELAY = 60
+# Compiled templates kept in memory and in .storage
+MAX_COMPILED_CACHE = 4096
+
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -1528,6 +1544,15 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         super().__init__(undefined=undefined)
         self.hass = hass
         self.template_cache = weakref.WeakValueDictionary()
+        # the filters and globals change the compiled code
+        if hass is None:
+            self.compiled_cache_prefix = "no_hass"
+        elif limited:
+            self.compiled_cache_prefix = "limited"
+        elif strict:
+            self.compiled_cache_prefix = "strict"
+        else:
+            self.compiled_cache_prefix = "default"
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1693,9 +1718,120 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         cached = self.template_cache.get(source)
 
         if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
+            key = "{}:{}".format(
+                self.compiled_cache_prefix,
+                hashlib.sha256(source.encode("utf-8")).hexdigest(),
+            )
+            cached = _COMPILED_CACHE.get(key)
+            if cached is None:
+                cached = super().compile(source)
+                _COMPILED_CACHE.set(key, cached)
+            self.template_cache[source] = cached
 
         return cached
 
 
+class CompiledCache:
+    """Marshalled code of the compiled templates in a LRU, saved in .storage.
+
+    Only the marshalled code is kept so the templates themselves can still be
+    garbage collected. The templates of the previous run are loaded at startup
+    and dropped when Home Assistant, Jinja or Python change.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        # key -> marshalled code, base64 encoded when loaded from .storage
+        self._entries: collections.OrderedDict[
+            str, bytes | str
+        ] = collections.OrderedDict()
+        self._store: Store | None = None
+
+    def get(self, key: str) -> CodeType | None:
+        """Return the compiled code of a template."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+        try:
+            if isinstance(entry, str):
+                entry = self._entries[key] = base64.b64decode(entry)
+            return cast(CodeType, marshal.loads(entry))
+        except (ValueError, TypeError, EOFError):
+            del self._entries[key]
+            return None
+
+    def set(self, key: str, code: CodeType) -> None:
+        """Add the compiled code of a template."""
+        self._entries[key] = marshal.dumps(code)
+        self._entries.move_to_end(key)
+        while len(self._entries) > MAX_COMPILED_CACHE:
+            self._entries.popitem(last=False)
+
+        if self._store is not None:
+            # templates are compiled in the executor too
+            with suppress(RuntimeError):
+                self._store.hass.loop.call_soon_threadsafe(self._async_schedule_save)
+
+    async def async_load(self, hass: HomeAssistant) -> None:
+        """Load the compiled templates of the previous run."""
+        # Circular dep
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.helpers.storage import Store
+
+        self._store = Store(
+            hass, COMPILED_CACHE_STORAGE_VERSION, COMPILED_CACHE_STORAGE_KEY
+        )
+        data = await self._store.async_load()
+        if isinstance(data, dict) and data.get("version") == _compiled_cache_version():
+            entries: collections.OrderedDict[
+                str, bytes | str
+            ] = collections.OrderedDict(data["templates"])
+            entries.update(self._entries)
+            self._entries = entries
+            while len(self._entries) > MAX_COMPILED_CACHE:
+                self._entries.popitem(last=False)
+
+        @callback
+        def _async_started(_event: Event) -> None:
+            """Save the templates compiled during the startup."""
+            self._async_schedule_save()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_started)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the compiled templates later."""
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, COMPILED_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data of the compiled templates to save."""
+        return {
+            "version": _compiled_cache_version(),
+            "templates": {
+                key: entry
+                if isinstance(entry, str)
+                else base64.b64encode(entry).decode("ascii")
+                for key, entry in self._entries.items()
+            },
+        }
+
+
+def _compiled_cache_version() -> str:
+    """Return the version of the code the saved templates were compiled for."""
+    return f"{__version__}-{jinja2.__version__}-{MAGIC_NUMBER.hex()}"
+
+
+_COMPILED_CACHE = CompiledCache()
+
+
+@bind_hass
+async def async_load_compiled_cache(hass: HomeAssistant) -> None:
+    """Load the compiled templates of the previous run from .storage."""
+    await _COMPILED_CACHE.async_load(hass)
+
+
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
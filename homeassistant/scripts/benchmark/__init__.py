@@ -8,14 +8,24 @@ from contextlib import suppress
 from datetime import datetime
 import json
 import logging
+import os
+import tempfile
 from timeit import default_timer as timer
+import tracemalloc
 from typing import Callable, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.const import (
+    ATTR_NOW,
+    EVENT_STATE_CHANGED,
+    EVENT_STATES_CHANGED,
+    EVENT_TIME_CHANGED,
+)
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
+from homeassistant.helpers.event import TrackTemplate, async_track_template_result
 from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.template import Template
 from homeassistant.util import dt as dt_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
@@ -252,6 +262,133 @@ async def state_changed_event_filter_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def set_states(hass):
+    """Set 1000 states 100 times one by one, with one listener."""
+    return await _set_states(hass, False)
+
+
+@benchmark
+async def set_many_states(hass):
+    """Set 1000 states 100 times in batches, with one batch listener."""
+    return await _set_states(hass, True)
+
+
+async def _set_states(hass, batch):
+    """Set the states and handle them in a listener."""
+    count = 0
+
+    @core.callback
+    def listener(event):
+        """Handle event."""
+        nonlocal count
+        count += len(event.data["changes"]) if batch else 1
+
+    hass.bus.async_listen(
+        EVENT_STATES_CHANGED if batch else EVENT_STATE_CHANGED, listener
+    )
+    entity_ids = [f"sensor.temperature{idx}" for idx in range(1000)]
+    attributes = {"unit_of_measurement": "°C"}
+
+    start = timer()
+
+    for value in range(100):
+        if batch:
+            hass.states.async_set_many(
+                [(entity_id, value, attributes) for entity_id in entity_ids],
+                aggregate=True,
+            )
+            continue
+        for entity_id in entity_ids:
+            hass.states.async_set(entity_id, value, attributes)
+
+    await hass.async_block_till_done()
+
+    assert count == 100 * 1000
+
+    return timer() - start
+
+
+@benchmark
+async def template_trackers_shared(hass):
+    """Update 2 sensors 1000 times, 10 identical templates read both."""
+    count = 0
+
+    @core.callback
+    def listener(event, updates):
+        """Handle template result."""
+        nonlocal count
+        count += 1
+
+    for _ in range(10):
+        template = Template(
+            "{{ states('sensor.a') | int + states('sensor.b') | int }}", hass
+        )
+        async_track_template_result(hass, [TrackTemplate(template, None)], listener)
+
+    start = timer()
+
+    for value in range(1000):
+        hass.states.async_set_many([("sensor.a", value), ("sensor.b", value)])
+        await hass.async_block_till_done()
+
+    assert count >= 10 * 999
+
+    return timer() - start
+
+
+@benchmark
+async def state_changed_filtered_listeners(hass):
+    """Fire 100k state changed events with 500 entity_id event filters."""
+    return await _state_changed_listeners(hass, False)
+
+
+@benchmark
+async def state_changed_keyed_listeners(hass):
+    """Fire 100k state changed events with 500 entity_id keyed listeners."""
+    return await _state_changed_listeners(hass, True)
+
+
+async def _state_changed_listeners(hass, keyed):
+    """Fire the events of 500 entities, each with its own listener."""
+    count = 0
+    events_to_fire = 10 ** 5
+    entity_ids = [f"light.kitchen{idx}" for idx in range(500)]
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for entity_id in entity_ids:
+        if keyed:
+            hass.bus.async_listen_keyed(
+                EVENT_STATE_CHANGED, "entity_id", [entity_id], listener
+            )
+            continue
+
+        @core.callback
+        def event_filter(event, entity_id=entity_id):
+            """Filter the events of the entity."""
+            return event.data["entity_id"] == entity_id
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, listener, event_filter)
+
+    events_data = [{"entity_id": entity_id} for entity_id in entity_ids]
+
+    start = timer()
+
+    for idx in range(events_to_fire):
+        hass.bus.async_fire(EVENT_STATE_CHANGED, events_data[idx % 500])
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
 @benchmark
 async def logbook_filtering_state(hass):
     """Filter state changes."""
@@ -390,6 +527,526 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def json_cached_states(hass):
+    """Send 10k states to 100 consumers with the cached state JSON."""
+    states = [
+        core.State(f"light.kitchen_{idx}", "on", {"friendly_name": "Kitchen Lights"})
+        for idx in range(10 ** 4)
+    ]
+
+    start = timer()
+    for _ in range(100):
+        b",".join(state.as_json() for state in states)
+    return timer() - start
+
+
+@benchmark
+async def filtering_domain_5k(hass):
+    """Query a small domain 100k times among 5k entities."""
+    return await _filtering_domain(hass, 5000)
+
+
+@benchmark
+async def filtering_domain_20k(hass):
+    """Query a small domain 100k times among 20k entities."""
+    return await _filtering_domain(hass, 20000)
+
+
+async def _filtering_domain(hass, entity_count):
+    """Query the states, entity ids and count of a domain with 20 entities."""
+    domains = ["sensor", "binary_sensor", "light", "switch", "media_player"]
+    for i in range(entity_count - 20):
+        hass.states.async_set(f"{domains[i % len(domains)]}.entity_{i}", "on")
+    for i in range(20):
+        hass.states.async_set(f"climate.entity_{i}", "heat")
+
+    start = timer()
+
+    for _ in range(10 ** 5):
+        hass.states.async_all("climate")
+        hass.states.async_entity_ids("climate")
+        hass.states.async_entity_ids_count("climate")
+
+    return timer() - start
+
+
+@benchmark
+async def state_machine_memory(hass):
+    """Set 10k sensor states 10 times and print the memory they use."""
+    tracemalloc.start()
+    start = timer()
+
+    for value in range(10):
+        for idx in range(10000):
+            hass.states.async_set(
+                f"sensor.temperature_{idx}",
+                value,
+                {
+                    "unit_of_measurement": "°C",
+                    "device_class": "temperature",
+                    "friendly_name": f"Temperature {idx % 100}",
+                },
+            )
+        await hass.async_block_till_done()
+
+    elapsed = timer() - start
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Memory: {used / 2 ** 20:.2f} MiB")
+    return elapsed
+
+
+@benchmark
+async def recorder_write_states(hass):
+    """Write 50k state changes with the recorder and print the events/sec.
+
+    Uses a SQLite file unless BENCHMARK_RECORDER_DB_URL points the recorder
+    to another database, like a local MariaDB or PostgreSQL.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    events_to_write = 50000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_url = os.environ.get(
+            "BENCHMARK_RECORDER_DB_URL",
+            f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}",
+        )
+        hass.state = core.CoreState.running
+        instance = recorder.Recorder(
+            hass,
+            auto_purge=False,
+            keep_days=10,
+            commit_interval=1,
+            uri=db_url,
+            db_max_retries=1,
+            db_retry_wait=0,
+            entity_filter=lambda entity_id: True,
+            exclude_t=[],
+        )
+        instance.async_initialize()
+        instance.start()
+        await instance.async_db_ready
+        await instance.async_recorder_ready.wait()
+
+        old_states = {}
+        events = []
+        now = dt_util.utcnow()
+        for idx in range(events_to_write):
+            entity_id = f"sensor.power_{idx % 500}"
+            new_state = core.State(
+                entity_id,
+                str(idx),
+                {
+                    "state_class": "measurement",
+                    "unit_of_measurement": "W",
+                    "device_class": "power",
+                    "friendly_name": f"Power {idx % 500}",
+                    "icon": "mdi:flash",
+                },
+                now,
+                now,
+            )
+            events.append(
+                core.Event(
+                    EVENT_STATE_CHANGED,
+                    {
+                        "entity_id": entity_id,
+                        "old_state": old_states.get(entity_id),
+                        "new_state": new_state,
+                    },
+                    time_fired=now,
+                )
+            )
+            old_states[entity_id] = new_state
+        time_changed = core.Event(EVENT_TIME_CHANGED, {ATTR_NOW: now})
+
+        start = timer()
+        for idx, event in enumerate(events):
+            instance.queue.put(event)
+            if idx % 1000 == 0:
+                instance.queue.put(time_changed)
+        instance.queue.put(time_changed)
+        await hass.async_add_executor_job(instance.block_till_done)
+        elapsed = timer() - start
+
+        instance.queue.put(None)
+        await hass.async_add_executor_job(instance.join)
+        if "BENCHMARK_RECORDER_DB_URL" not in os.environ:
+            db_size = os.path.getsize(os.path.join(tmp_dir, "benchmark.db"))
+            print(f"Database size: {db_size / 2 ** 20:.2f} MiB")
+
+    print(f"Events/sec: {events_to_write / elapsed:.0f}")
+    return elapsed
+
+
+@benchmark
+async def recorder_flash_profile(hass):
+    """Write 30k state changes with the default and the flash SQLite profiles.
+
+    Emulates an SD card from the bytes the database sends to the block layer,
+    read from /proc/self/io on Linux, at the random write speed of an A1 SD
+    card. Prints the results of the default profile and returns the emulated
+    time of the flash profile.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder.const import (
+        DB_PROFILE_DEFAULT,
+        DB_PROFILE_FLASH,
+    )
+
+    events_to_write = 30000
+    # An A1 SD card writes about 500 random 4 KiB blocks per second
+    sd_card_bytes_per_second = 500 * 4096
+
+    def written_bytes():
+        with open("/proc/self/io", encoding="utf8") as io_file:
+            for line in io_file:
+                if line.startswith("write_bytes:"):
+                    return int(line.split()[1])
+        return 0
+
+    now = dt_util.utcnow()
+    old_states = {}
+    events = []
+    for idx in range(events_to_write):
+        entity_id = f"sensor.power_{idx % 100}"
+        new_state = core.State(
+            entity_id,
+            str(idx),
+            {"unit_of_measurement": "W", "device_class": "power"},
+            now,
+            now,
+        )
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": entity_id,
+                    "old_state": old_states.get(entity_id),
+                    "new_state": new_state,
+                },
+                time_fired=now,
+            )
+        )
+        old_states[entity_id] = new_state
+    time_changed = core.Event(EVENT_TIME_CHANGED, {ATTR_NOW: now})
+
+    for db_profile in (DB_PROFILE_DEFAULT, DB_PROFILE_FLASH):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            hass.state = core.CoreState.running
+            instance = recorder.Recorder(
+                hass,
+                auto_purge=False,
+                keep_days=10,
+                commit_interval=1,
+                uri=f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}",
+                db_max_retries=1,
+                db_retry_wait=0,
+                entity_filter=lambda entity_id: True,
+                exclude_t=[],
+                db_profile=db_profile,
+            )
+            instance.async_initialize()
+            instance.start()
+            await instance.async_db_ready
+            await instance.async_recorder_ready.wait()
+
+            # A commit for every 100 state changes, like a busy instance
+            # committing each second
+            start_bytes = written_bytes()
+            start = timer()
+            for idx, event in enumerate(events):
+                instance.queue.put(event)
+                if idx % 100 == 99:
+                    instance.queue.put(time_changed)
+            instance.queue.put(recorder.PerodicCleanupTask())
+            await hass.async_add_executor_job(instance.block_till_done)
+            elapsed = timer() - start
+            written = written_bytes() - start_bytes
+
+            instance.queue.put(None)
+            await hass.async_add_executor_job(instance.join)
+
+        emulated = elapsed + written / sd_card_bytes_per_second
+        print(
+            f"{db_profile}: {elapsed:.3f}s, {written / 2 ** 20:.2f} MiB written, "
+            f"{emulated:.3f}s on an SD card"
+        )
+
+    return emulated
+
+
+@benchmark
+async def recorder_history_columnar(hass):
+    """Compare the 7 day history of 30 sensors as states and as columns.
+
+    Each history is queried and encoded to JSON like the history view does.
+    Prints the time taken by the state based history and returns the time
+    taken by the columnar history downsampled to 500 points per sensor.
+    """
+    # pylint: disable=import-outside-toplevel
+    from datetime import timedelta
+
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import history
+
+    sensor_count = 30
+    days = 7
+    interval = timedelta(minutes=1)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hass.state = core.CoreState.running
+        instance = recorder.Recorder(
+            hass,
+            auto_purge=False,
+            keep_days=10,
+            commit_interval=1,
+            uri=f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}",
+            db_max_retries=1,
+            db_retry_wait=0,
+            entity_filter=lambda entity_id: True,
+            exclude_t=[],
+        )
+        hass.data[recorder.DATA_INSTANCE] = instance
+        history.async_setup(hass)
+        instance.async_initialize()
+        instance.start()
+        await instance.async_db_ready
+        await instance.async_recorder_ready.wait()
+
+        end_time = dt_util.utcnow()
+        start_time = end_time - timedelta(days=days)
+        old_states = {}
+        point = start_time
+        idx = 0
+        while point < end_time:
+            for sensor in range(sensor_count):
+                entity_id = f"sensor.power_{sensor}"
+                new_state = core.State(
+                    entity_id,
+                    str(idx % 1000),
+                    {"unit_of_measurement": "W", "device_class": "power"},
+                    point,
+                    point,
+                )
+                instance.queue.put(
+                    core.Event(
+                        EVENT_STATE_CHANGED,
+                        {
+                            "entity_id": entity_id,
+                            "old_state": old_states.get(entity_id),
+                            "new_state": new_state,
+                        },
+                        time_fired=point,
+                    )
+                )
+                old_states[entity_id] = new_state
+                idx += 1
+            point += interval
+        instance.queue.put(core.Event(EVENT_TIME_CHANGED, {ATTR_NOW: end_time}))
+        await hass.async_add_executor_job(instance.block_till_done)
+        print(f"States recorded: {idx}")
+
+        entity_ids = list(old_states)
+
+        def state_history():
+            return JSON_DUMP(
+                list(
+                    history.get_significant_states(
+                        hass, start_time, end_time, entity_ids
+                    ).values()
+                )
+            )
+
+        def columnar_history(resolution=None):
+            return JSON_DUMP(
+                history.get_significant_states_columnar(
+                    hass, start_time, end_time, entity_ids, resolution=resolution
+                )
+            )
+
+        start = timer()
+        response = await hass.async_add_executor_job(state_history)
+        print(f"State history: {timer() - start:.3f}s, {len(response)} bytes")
+
+        start = timer()
+        response = await hass.async_add_executor_job(columnar_history)
+        print(f"Columnar history: {timer() - start:.3f}s, {len(response)} bytes")
+
+        start = timer()
+        response = await hass.async_add_executor_job(columnar_history, 500)
+        elapsed = timer() - start
+        print(f"Columnar history at 500 points: {elapsed:.3f}s, {len(response)} bytes")
+
+        instance.queue.put(None)
+        await hass.async_add_executor_job(instance.join)
+
+    return elapsed
+
+
+@benchmark
+async def recorder_statistics_periods(hass):
+    """Compare a year of statistics of 20 meters per hour, day and month.
+
+    Each period is queried and encoded to JSON like the websocket command does.
+    Prints the time taken by the hourly statistics and returns the time taken
+    by the columnar daily statistics.
+    """
+    # pylint: disable=import-outside-toplevel
+    from datetime import timedelta
+
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import statistics
+    from homeassistant.components.recorder.models import Statistics, StatisticsMeta
+    from homeassistant.components.recorder.util import session_scope
+
+    meter_count = 20
+    hours = 365 * 24
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        hass.state = core.CoreState.running
+        instance = recorder.Recorder(
+            hass,
+            auto_purge=False,
+            keep_days=10,
+            commit_interval=1,
+            uri=f"sqlite:///{os.path.join(tmp_dir, 'benchmark.db')}",
+            db_max_retries=1,
+            db_retry_wait=0,
+            entity_filter=lambda entity_id: True,
+            exclude_t=[],
+        )
+        hass.data[recorder.DATA_INSTANCE] = instance
+        statistics.async_setup(hass)
+        instance.async_initialize()
+        instance.start()
+        await instance.async_db_ready
+        await instance.async_recorder_ready.wait()
+
+        end_time = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        start_time = end_time - timedelta(hours=hours)
+
+        def record_statistics():
+            with session_scope(hass=hass) as session:
+                for meter in range(meter_count):
+                    session.add(
+                        StatisticsMeta.from_meta(
+                            "recorder", f"sensor.energy_{meter}", "kWh", True, True
+                        )
+                    )
+                session.flush()
+                for meter in range(meter_count):
+                    session.bulk_insert_mappings(
+                        Statistics,
+                        [
+                            {
+                                "metadata_id": meter + 1,
+                                "start": start_time + timedelta(hours=hour),
+                                "mean": hour % 24,
+                                "min": 0,
+                                "max": 24,
+                                "state": hour,
+                                "sum": hour,
+                            }
+                            for hour in range(hours)
+                        ],
+                    )
+                statistics.rollup_all_statistics(session)
+
+        await hass.async_add_executor_job(record_statistics)
+        print(f"Statistics recorded: {meter_count * hours}")
+
+        def query_statistics(query, period):
+            return JSON_DUMP(query(hass, start_time, end_time, None, period))
+
+        start = timer()
+        response = await hass.async_add_executor_job(
+            query_statistics, statistics.statistics_during_period, "hour"
+        )
+        print(f"Hourly statistics: {timer() - start:.3f}s, {len(response)} bytes")
+
+        for period in ("hour", "day", "month"):
+            start = timer()
+            response = await hass.async_add_executor_job(
+                query_statistics, statistics.statistics_during_period_columnar, period
+            )
+            elapsed = timer() - start
+            print(
+                f"Columnar {period} statistics: {elapsed:.3f}s, {len(response)} bytes"
+            )
+            if period == "day":
+                result = elapsed
+
+        instance.queue.put(None)
+        await hass.async_add_executor_job(instance.join)
+
+    return result
+
+
+@benchmark
+async def ais_intents_linear(hass):
+    """Match 100k texts trying the AIS intent utterances one by one."""
+    intents, texts = _ais_intents_and_texts()
+    size = len(texts)
+
+    def match(text):
+        for intent_type, matchers in intents.items():
+            for matcher in matchers:
+                if matcher.match(text):
+                    return intent_type
+        return None
+
+    start = timer()
+
+    for i in range(10 ** 5):
+        match(texts[i % size])
+
+    return timer() - start
+
+
+@benchmark
+async def ais_intents_dispatcher(hass):
+    """Match 100k texts with the AIS intent dispatcher."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.ais_ai_service.intent_dispatcher import (
+        IntentDispatcher,
+    )
+
+    intents, texts = _ais_intents_and_texts()
+    dispatcher = IntentDispatcher({"intents": intents}, "intents")
+    size = len(texts)
+
+    start = timer()
+
+    for i in range(10 ** 5):
+        dispatcher.match(texts[i % size])
+
+    return timer() - start
+
+
+def _ais_intents_and_texts():
+    """Return the shipped AIS intent matchers and texts built from them."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import ais_ai_service
+
+    intents = {}
+    texts = ["włącz radio", "co słychać", "zrób mi kawę"]
+    for intent_type, utterances in ais_ai_service.AIS_INTENT_UTTERANCES:
+        matchers = intents.setdefault(intent_type, [])
+        for utterance in utterances:
+            matchers.append(ais_ai_service._create_matcher(utterance))
+            text = (
+                utterance.replace("{item}", "światło w salonie")
+                .replace("{temp}", "21")
+                .replace("[", "")
+                .replace("]", "")
+                .lower()
+            )
+            texts.append(text)
+    return intents, texts
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
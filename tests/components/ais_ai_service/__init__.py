@@ -0,0 +1 @@
+"""Tests for the AIS ai service integration."""
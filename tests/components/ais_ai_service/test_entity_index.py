@@ -0,0 +1,80 @@
+"""Test the AIS entity name index."""
+import pytest
+
+from homeassistant.components.ais_ai_service.entity_index import AisEntityNameIndex
+
+# the AIS requirements are not in the generated test requirements
+process = pytest.importorskip("fuzzywuzzy.process")
+
+NAMES = {
+    "light.salon": "Lampa w salonie",
+    "light.salon_sufit": "Światło sufit salon",
+    "light.kuchnia": "Światło w kuchni",
+    "light.sypialnia": "Lampka nocna sypialnia",
+    "switch.gniazdko": "Gniazdko biurko",
+    "switch.wentylator": "Wentylator łazienka",
+    "cover.taras": "Roleta taras",
+    "cover.salon": "Roleta salon",
+    "media_player.tv": "TV",
+    "media_player.glosnik": "Głośnik kuchnia",
+    "climate.biuro": "Termostat biuro",
+    "sensor.ruch": "Czujnik ruchu korytarz",
+}
+
+
+def _index(names):
+    index = AisEntityNameIndex()
+    for entity_id, name in names.items():
+        index.async_update(entity_id, name)
+    return index
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "lampa w salonie",
+        "salon",
+        "światło kuchnia",
+        "włącz światło w kuchni",
+        "roleta",
+        "tv",
+        "telewizor",
+        "gniazdko",
+        "biurko",
+        "nocna lampka",
+        "termostat w biurze",
+        "czujnik",
+        "radio",
+    ],
+)
+def test_match_as_extract_one(query):
+    """Test the index matches the entity extractOne matches."""
+    index = _index(NAMES)
+
+    expected = process.extractOne(query, NAMES, score_cutoff=86)
+
+    assert index.match(query) == (expected[2] if expected else None)
+
+
+def test_match_as_extract_one_in_domain():
+    """Test the index matches the entity of the domain extractOne matches."""
+    index = _index(NAMES)
+    names = {eid: name for eid, name in NAMES.items() if eid.startswith("cover.")}
+
+    expected = process.extractOne("salon", names, score_cutoff=86)
+
+    assert index.match("salon", "cover") == expected[2] == "cover.salon"
+
+
+def test_match_outside_the_trigram_candidates():
+    """Test the first best entity matches when the trigrams pass it over."""
+    names = {"media_player.garaz": "TV garaż"}
+    names.update({f"light.salon_{idx}": f"W salonie {idx}" for idx in range(1, 26)})
+    index = _index(names)
+    query = "włącz tv w salonie"
+
+    expected = process.extractOne(query, names, score_cutoff=86)
+
+    # pylint: disable=protected-access
+    assert expected[2] not in index._candidates(query, None)
+    assert index.match(query) == expected[2] == "media_player.garaz"
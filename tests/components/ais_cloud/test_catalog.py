@@ -0,0 +1,71 @@
+"""Test the AIS cloud catalog."""
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.ais_cloud import AisColudData
+from homeassistant.components.ais_cloud.catalog import async_setup_catalog
+from homeassistant.components.ais_dom import ais_global
+
+from tests.common import async_mock_service
+
+CATALOG = "homeassistant.components.ais_cloud.catalog"
+GLOBAL = "homeassistant.components.ais_dom.ais_global"
+URL = "https://" + ais_global.AIS_HOST + "/ords/dom/dom/"
+
+
+@pytest.fixture(autouse=True)
+def mock_cloud_files():
+    """Keep the catalog away from the cache files and the device id."""
+    with patch(f"{CATALOG}._load_nature", return_value={}), patch(
+        f"{CATALOG}._save_nature"
+    ):
+        with patch(f"{GLOBAL}.get_sercure_android_id_dom", return_value="dom-test"):
+            with patch(f"{GLOBAL}.set_ais_android_id_dom_file_path"):
+                yield
+
+
+async def test_radio_types_with_private_and_shared(hass, aioclient_mock):
+    """Test the radio types list the private and shared types of the user."""
+    aioclient_mock.post(
+        URL + "audio_type2",
+        json={
+            "data": [
+                {"name": "Muzyczne"},
+                {"name": "Moje Muzyczne"},
+                {"name": "Udostępnione Informacyjne"},
+            ]
+        },
+    )
+    calls = async_mock_service(hass, "input_select", "set_options")
+    catalog = async_setup_catalog(hass)
+
+    await AisColudData(hass).async_get_radio_types(None)
+    await hass.async_block_till_done()
+
+    assert len(aioclient_mock.mock_calls) == 1
+    assert aioclient_mock.mock_calls[0][2] == {"nature": ais_global.G_AN_RADIO}
+    assert len(calls) == 1
+    assert calls[0].data["options"] == [
+        ais_global.G_FAVORITE_OPTION,
+        "Muzyczne",
+        "Moje Muzyczne",
+        "Udostępnione Informacyjne",
+    ]
+    # the public types of the media browsers are a separate list
+    assert catalog.cached_audio_type(ais_global.G_AN_RADIO) is None
+
+
+async def test_private_type_names(hass, aioclient_mock):
+    """Test the names of a private type are asked with the private origin."""
+    aioclient_mock.post(URL + "audio_name2", json={"data": [{"NAME": "Radio"}]})
+    catalog = async_setup_catalog(hass)
+
+    resp = await catalog.async_audio_name(ais_global.G_AN_RADIO, "Moje Muzyczne")
+
+    assert resp == {"data": [{"NAME": "Radio"}]}
+    assert aioclient_mock.mock_calls[0][2] == {
+        "nature": ais_global.G_AN_RADIO,
+        "origin": "private",
+        "type": "Muzyczne",
+    }
@@ -830,6 +830,202 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert response_json[1][0]["entity_id"] == "light.cow"
 
 
+async def _async_record_sensor_states(hass, config=None):
+    """Set up history and record the states of two sensors."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", config or {})
+    instance = hass.data[recorder.DATA_INSTANCE]
+    # Commit as soon as the queue is drained
+    instance.commit_interval = 0
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    start = dt_util.utcnow() - timedelta(minutes=1)
+    for state in ("1", "3", "2"):
+        hass.states.async_set("sensor.power", state)
+        await hass.async_block_till_done()
+    hass.states.async_set("sensor.door", "open")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+    return start
+
+
+async def test_fetch_period_api_columnar(hass, hass_client):
+    """Test the fetch period view returns columns sorted by entity_id."""
+    start = await _async_record_sensor_states(hass)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"filter_entity_id": "sensor.power,sensor.door", "columnar": ""},
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert [series["entity_id"] for series in response_json] == [
+        "sensor.door",
+        "sensor.power",
+    ]
+    assert response_json[0]["s"] == ["open"]
+    assert response_json[1]["s"] == ["1", "3", "2"]
+    assert len(response_json[1]["t"]) == 3
+    assert response_json[1]["t"] == sorted(response_json[1]["t"])
+
+
+async def test_fetch_period_api_resolution(hass, hass_client):
+    """Test the fetch period view downsamples the numeric series."""
+    start = await _async_record_sensor_states(hass)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"filter_entity_id": "sensor.power,sensor.door", "resolution": "1"},
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert response_json[0] == {
+        "entity_id": "sensor.door",
+        "t": response_json[0]["t"],
+        "s": ["open"],
+    }
+    assert response_json[1] == {
+        "entity_id": "sensor.power",
+        "t": [approx(start.timestamp())],
+        "min": [1.0],
+        "max": [3.0],
+        "mean": [2.0],
+    }
+
+
+@pytest.mark.parametrize("resolution", ["0", "-1", "cats"])
+async def test_fetch_period_api_invalid_resolution(hass, hass_client, resolution):
+    """Test the fetch period view rejects an invalid resolution."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}",
+        params={"resolution": resolution},
+    )
+    assert response.status == 400
+
+
+async def test_fetch_period_api_columnar_with_use_include_order(hass, hass_client):
+    """Test the columns follow the order of the included entities."""
+    start = await _async_record_sensor_states(
+        hass,
+        {
+            "history": {
+                "use_include_order": True,
+                "include": {"entities": ["sensor.power", "sensor.door"]},
+            }
+        },
+    )
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}", params={"columnar": ""}
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert [series["entity_id"] for series in response_json] == [
+        "sensor.power",
+        "sensor.door",
+    ]
+
+
+async def test_history_during_period(hass, hass_ws_client):
+    """Test history_during_period."""
+    start = await _async_record_sensor_states(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.power", "sensor.door"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert [series["entity_id"] for series in response["result"]] == [
+        "sensor.door",
+        "sensor.power",
+    ]
+    assert response["result"][1]["s"] == ["1", "3", "2"]
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "resolution": 1,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == [
+        {
+            "entity_id": "sensor.power",
+            "t": [approx(start.timestamp())],
+            "min": [1.0],
+            "max": [3.0],
+            "mean": [2.0],
+        }
+    ]
+
+    await client.send_json(
+        {
+            "id": 3,
+            "type": "history/history_during_period",
+            "start_time": (dt_util.utcnow() + timedelta(hours=1)).isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == []
+
+
+async def test_history_during_period_bad_times(hass, hass_ws_client):
+    """Test history_during_period with invalid times."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {"id": 1, "type": "history/history_during_period", "start_time": "cats"}
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": dt_util.utcnow().isoformat(),
+            "end_time": "dogs",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_end_time"
+
+    await client.send_json(
+        {
+            "id": 3,
+            "type": "history/history_during_period",
+            "start_time": dt_util.utcnow().isoformat(),
+            "resolution": 0,
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+
+
 POWER_SENSOR_ATTRIBUTES = {
     "device_class": "power",
     "state_class": "measurement",
@@ -512,6 +512,107 @@ async def test_exclude_described_event(hass, hass_client):
     assert event["entity_id"] == "automation.included_rule"
 
 
+async def _async_record_switch_changes(hass, count):
+    """Record count state changes of a switch, 20 minutes apart."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    start = dt_util.utcnow() - timedelta(hours=2)
+    for idx in range(count + 1):
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=start + timedelta(minutes=20 * idx),
+        ):
+            hass.states.async_set("switch.test", STATE_ON if idx % 2 else STATE_OFF)
+            await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    return start
+
+
+async def test_logbook_view_pagination(hass, hass_client):
+    """Test the logbook view returns pages continued by a cursor."""
+    start = await _async_record_switch_changes(hass, 4)
+    client = await hass_client()
+
+    response = await client.get(f"/api/logbook/{start.isoformat()}?period=1&limit=2")
+    assert response.status == 200
+    response_json = await response.json()
+    assert [entry["state"] for entry in response_json["entries"]] == [
+        STATE_ON,
+        STATE_OFF,
+    ]
+    assert response_json["next_cursor"] is not None
+
+    response = await client.get(
+        f"/api/logbook/{start.isoformat()}",
+        params={"limit": 2, "cursor": response_json["next_cursor"]},
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert [entry["state"] for entry in response_json["entries"]] == [
+        STATE_ON,
+        STATE_OFF,
+    ]
+    assert response_json["next_cursor"] is None
+
+    response = await client.get(f"/api/logbook/{start.isoformat()}?limit=0")
+    assert response.status == 400
+    response = await client.get(
+        f"/api/logbook/{start.isoformat()}",
+        params={"limit": logbook.MAX_PAGE_LIMIT + 1},
+    )
+    assert response.status == 400
+    response = await client.get(f"/api/logbook/{start.isoformat()}?cursor=invalid")
+    assert response.status == 400
+
+
+async def test_logbook_get_events_websocket(hass, hass_ws_client):
+    """Test the logbook websocket command returns pages continued by a cursor."""
+    start = await _async_record_switch_changes(hass, 4)
+    client = await hass_ws_client()
+
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/get_events",
+            "start_time": start.isoformat(),
+            "entity_ids": ["switch.test"],
+            "limit": 3,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert len(response["result"]["entries"]) == 3
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "logbook/get_events",
+            "start_time": start.isoformat(),
+            "entity_ids": ["switch.test"],
+            "cursor": response["result"]["next_cursor"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert [entry["state"] for entry in response["result"]["entries"]] == [STATE_OFF]
+    assert response["result"]["next_cursor"] is None
+
+    await client.send_json(
+        {
+            "id": 3,
+            "type": "logbook/get_events",
+            "start_time": "invalid",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
 async def test_logbook_view_end_time_entity(hass, hass_client):
     """Test the logbook view with end_time and entity."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -1,5 +1,6 @@
 """The tests for the MQTT eventstream component."""
 import json
+import math
 from unittest.mock import ANY, patch
 
 import homeassistant.components.mqtt_eventstream as eventstream
@@ -104,6 +105,26 @@ async def test_state_changed_event_sends_message(hass, mqtt_mock):
     assert result == event
 
 
+async def test_state_changed_event_with_nan_attribute_sends_message(hass, mqtt_mock):
+    """Test a state with a NaN attribute is still sent."""
+    e_id = "sensor.x"
+    pub_topic = "bar"
+    assert await add_eventstream(hass, pub_topic=pub_topic)
+    await hass.async_block_till_done()
+    mqtt_mock.async_publish.reset_mock()
+
+    mock_state_change_event(hass, State(e_id, "1", {"v": float("nan")}))
+    await hass.async_block_till_done()
+    await hass.async_block_till_done()
+
+    mqtt_mock.async_publish.assert_called_with(pub_topic, ANY, 0, False)
+    msg = mqtt_mock.async_publish.call_args[0][1]
+    result = json.loads(msg)
+    assert result["event_type"] == EVENT_STATE_CHANGED
+    assert result["event_data"]["entity_id"] == e_id
+    assert math.isnan(result["event_data"]["new_state"]["attributes"]["v"])
+
+
 async def test_time_event_does_not_send_message(hass, mqtt_mock):
     """Test the sending of a new message if time event."""
     assert await add_eventstream(hass, pub_topic="bar")
@@ -358,6 +358,34 @@ def test_get_significant_states_only(hass_recorder):
     assert states == hist[entity_id]
 
 
+def test_get_significant_states_columnar(hass_recorder):
+    """Test the columnar significant states match the significant states."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    hist = history.get_significant_states_columnar(hass, zero, four)
+
+    assert [series["entity_id"] for series in hist] == sorted(states)
+    for series in hist:
+        entity_states = states[series["entity_id"]]
+        assert series["s"] == [state.state for state in entity_states]
+        assert series["t"] == [
+            state.last_updated.timestamp() for state in entity_states
+        ]
+
+
+def test_downsample():
+    """Test numeric series are reduced to the min, max and mean of buckets."""
+    times = [0, 1, 2, 3, 5, 6, 9]
+    states = ["1", "3", "unavailable", "2", "10", "nan", "4"]
+    assert history._downsample(times, states, 0, 10, 2) == {
+        "t": [0, 5],
+        "min": [1.0, 4.0],
+        "max": [3.0, 10.0],
+        "mean": [2.0, 7.0],
+    }
+    assert history._downsample(times, ["on"] * len(times), 0, 10, 2) is None
+
+
 def record_states(hass):
     """Record some test states.
 
@@ -150,27 +150,33 @@ async def test_saving_state(
 async def test_saving_many_states(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
-    """Test we expire after many commits."""
+    """Test we link the old states of many states written in bulk."""
     instance = await async_setup_recorder_instance(hass)
 
     entity_id = "test.recorder"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    with patch.object(
-        hass.data[DATA_INSTANCE].event_session, "expire_all"
-    ) as expire_all, patch.object(recorder, "EXPIRE_AFTER_COMMITS", 2):
+    with patch.object(recorder, "MIN_COMMIT_BATCH", 2):
         for _ in range(3):
             hass.states.async_set(entity_id, "on", attributes)
-            await async_wait_recording_done(hass, instance)
             hass.states.async_set(entity_id, "off", attributes)
-            await async_wait_recording_done(hass, instance)
-
-    assert expire_all.called
+            hass.states.async_set("test.other", "on")
+        await async_wait_recording_done(hass, instance)
 
     with session_scope(hass=hass) as session:
-        db_states = list(session.query(States))
+        db_states = list(
+            session.query(States)
+            .filter(States.entity_id == entity_id)
+            .order_by(States.state_id)
+        )
         assert len(db_states) == 6
         assert db_states[0].event_id > 0
+        assert db_states[0].old_state_id is None
+        for old_state, state in zip(db_states, db_states[1:]):
+            assert state.old_state_id == old_state.state_id
+            assert state.event_id > old_state.event_id
+        assert len({state.attributes_id for state in db_states}) == 1
+        assert db_states[0].to_native().attributes == attributes
 
 
 async def test_saving_state_with_intermixed_time_changes(
@@ -207,17 +213,12 @@ def test_saving_state_with_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
-
     with patch("time.sleep"), patch.object(
-        hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        hass.data[DATA_INSTANCE],
+        "_write_pending_rows",
+        side_effect=OperationalError(
+            "insert the state", "fake params", "forced to fail"
+        ),
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -245,17 +246,12 @@ def test_saving_state_with_sqlalchemy_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise SQLAlchemyError(
-                    "insert the state", "fake params", "forced to fail"
-                )
-
     with patch("time.sleep"), patch.object(
-        hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        hass.data[DATA_INSTANCE],
+        "_write_pending_rows",
+        side_effect=SQLAlchemyError(
+            "insert the state", "fake params", "forced to fail"
+        ),
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -287,8 +283,8 @@ async def test_force_shutdown_with_queue_of_writes_that_generate_exceptions(
     await async_wait_recording_done(hass, instance)
 
     with patch.object(instance, "db_retry_wait", 0.2), patch.object(
-        instance.event_session,
-        "flush",
+        instance,
+        "_write_pending_rows",
         side_effect=OperationalError(
             "insert the state", "fake params", "forced to fail"
         ),
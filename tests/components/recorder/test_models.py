@@ -1,5 +1,6 @@
 """The tests for the Recorder component."""
 from datetime import datetime
+import math
 
 import pytest
 from sqlalchemy import create_engine
@@ -40,6 +41,24 @@ def test_from_event_to_db_state():
     assert state == States.from_event(event).to_native()
 
 
+def test_from_event_to_db_state_nan_attributes():
+    """Test states with NaN or infinite attributes are still recorded."""
+    state = ha.State(
+        "sensor.temperature", "18", {"min": float("nan"), "max": float("inf")}
+    )
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
+    )
+
+    row = States.row_from_event(event)
+
+    assert row["attributes"] == '{"min":NaN,"max":Infinity}'
+    attributes = States.from_event(event).to_native().attributes
+    assert math.isnan(attributes["min"])
+    assert attributes["max"] == float("inf")
+
+
 def test_from_event_to_delete_state():
     """Test converting deleting state event to db state."""
     event = ha.Event(
@@ -2,15 +2,26 @@
 from datetime import datetime, timedelta
 import json
 import sqlite3
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder import PurgeTask
-from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder import PurgeTask, repack as repack_util
+from homeassistant.components.recorder.const import (
+    DB_PROFILE_DEFAULT,
+    DB_PROFILE_FLASH,
+    MAX_ROWS_TO_PURGE,
+)
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import EVENT_STATE_CHANGED
@@ -61,6 +72,217 @@ async def test_purge_old_states(
         assert states.count() == 2
 
 
+async def test_purge_old_states_with_shared_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting the attributes only shared by old states."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass, instance)
+
+    utcnow = dt_util.utcnow()
+    eleven_days_ago = utcnow - timedelta(days=11)
+    with recorder.session_scope(hass=hass) as session:
+        shared = {}
+        for name in ("old", "both", "new"):
+            shared_attrs = json.dumps({"name": name})
+            shared[name] = StateAttributes(
+                hash=StateAttributes.hash_shared_attrs(shared_attrs),
+                shared_attrs=shared_attrs,
+            )
+            session.add(shared[name])
+        session.flush()
+        for timestamp, names in (
+            (eleven_days_ago, ("old", "both")),
+            (utcnow, ("both", "new")),
+        ):
+            for name in names:
+                event = Events(
+                    event_type="state_changed",
+                    event_data="{}",
+                    origin="LOCAL",
+                    time_fired=timestamp,
+                )
+                session.add(event)
+                session.flush()
+                session.add(
+                    States(
+                        entity_id=f"test.{name}",
+                        domain="test",
+                        state="on",
+                        last_changed=timestamp,
+                        last_updated=timestamp,
+                        event_id=event.event_id,
+                        attributes_id=shared[name].attributes_id,
+                    )
+                )
+        attributes_ids = {name: attrs.attributes_id for name, attrs in shared.items()}
+        old_shared_attrs = shared["old"].shared_attrs
+
+    instance._state_attributes_ids[old_shared_attrs] = attributes_ids["old"]
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    assert not purge_old_data(instance, purge_before, repack=False)
+
+    with session_scope(hass=hass) as session:
+        assert {attrs.attributes_id for attrs in session.query(StateAttributes)} == {
+            attributes_ids["both"],
+            attributes_ids["new"],
+        }
+        assert {
+            state.entity_id: state.to_native().attributes["name"]
+            for state in session.query(States)
+        } == {"test.both": "both", "test.new": "new"}
+    assert old_shared_attrs not in instance._state_attributes_ids
+
+
+async def test_purge_progress_sensor(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the progress of the purge is exposed as a sensor."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass, instance)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    instance.queue.put(PurgeTask(purge_before, repack=False, apply_filter=False))
+    await async_wait_purge_done(hass, instance)
+
+    state = hass.states.get(recorder.PURGE_PROGRESS_ENTITY_ID)
+    assert state.state == "100"
+    assert state.attributes["status"] == recorder.PURGE_STATUS_DONE
+    assert state.attributes["purge_before"] == purge_before
+    assert state.attributes["events_to_purge"] == 4
+    assert state.attributes["purged_events"] == 4
+    assert state.attributes["purged_states"] == 4
+
+
+async def test_purge_throttled_queues_next_chunk_later(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test a throttled purge queues its next chunk after a delay."""
+    instance = await async_setup_recorder_instance(hass)
+    instance.purge_rows_per_second = 1
+
+    await _add_test_states(hass, instance)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with patch("homeassistant.components.recorder.async_call_later") as call_later:
+        instance.queue.put(PurgeTask(purge_before, repack=False, apply_filter=False))
+        await async_wait_purge_done(hass, instance)
+
+    assert call_later.call_count == 1
+    _, delay, queue_task = call_later.call_args[0]
+    assert delay > 0
+    state = hass.states.get(recorder.PURGE_PROGRESS_ENTITY_ID)
+    assert state.attributes["status"] == recorder.PURGE_STATUS_PURGING
+
+    queue_task(None)
+    await async_wait_purge_done(hass, instance)
+
+    state = hass.states.get(recorder.PURGE_PROGRESS_ENTITY_ID)
+    assert state.attributes["status"] == recorder.PURGE_STATUS_DONE
+    assert state.attributes["purged_states"] == 4
+
+
+async def test_purge_unthrottled_queues_next_chunk_at_once(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test a purge without a rows per second limit queues its next chunk at once."""
+    instance = await async_setup_recorder_instance(hass)
+    instance.purge_rows_per_second = 0
+
+    await _add_test_states(hass, instance)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with patch(
+        "homeassistant.components.recorder.async_call_later"
+    ) as call_later, patch(
+        "homeassistant.components.recorder.purge.purge_old_data",
+        side_effect=[False, True],
+    ) as purge_data:
+        instance.queue.put(PurgeTask(purge_before, repack=False, apply_filter=False))
+        await async_wait_purge_done(hass, instance)
+
+    assert purge_data.call_count == 2
+    assert not call_later.called
+
+
+async def test_purge_incremental_vacuum_until_no_free_pages(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test the free pages of the flash profile are released in chunks."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_DB_PROFILE: DB_PROFILE_FLASH}
+    )
+
+    await _add_test_states(hass, instance)
+    five_days_ago = dt_util.utcnow() - timedelta(days=5)
+    with recorder.session_scope(hass=hass) as session:
+        for _ in range(100):
+            session.add(
+                Events(
+                    event_type="EVENT_TEST_PURGE",
+                    event_data=json.dumps({"padding": "x" * 2000}),
+                    origin="LOCAL",
+                    created=five_days_ago,
+                    time_fired=five_days_ago,
+                )
+            )
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with patch("homeassistant.components.recorder.INCREMENTAL_VACUUM_PAGES", 8), patch(
+        "homeassistant.components.recorder.repack_util.incremental_vacuum",
+        wraps=repack_util.incremental_vacuum,
+    ) as vacuum:
+        instance.queue.put(PurgeTask(purge_before, repack=False, apply_filter=False))
+        await async_wait_purge_done(hass, instance, max=100)
+
+    assert vacuum.call_count > 1
+    assert vacuum.call_args[0][1] == 8
+    with instance.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA freelist_count")).scalar() == 0
+    state = hass.states.get(recorder.PURGE_PROGRESS_ENTITY_ID)
+    assert state.attributes["status"] == recorder.PURGE_STATUS_DONE
+
+
+def test_repack_vacuums_by_default():
+    """Test the database is rewritten on every repack by default."""
+    engine = create_engine("sqlite://")
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    instance = SimpleNamespace(engine=engine, db_profile=DB_PROFILE_DEFAULT)
+    for _ in range(2):
+        statements.clear()
+        repack_util.repack_database(instance)
+        assert statements == ["VACUUM"]
+    assert not repack_util.sqlite_incremental_vacuum_enabled(instance)
+
+
+def test_repack_incremental_database_skips_vacuum():
+    """Test the flash profile only rewrites a database without incremental vacuum."""
+    engine = create_engine("sqlite://")
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    instance = SimpleNamespace(engine=engine, db_profile=DB_PROFILE_FLASH)
+    assert not repack_util.sqlite_incremental_vacuum_enabled(instance)
+
+    repack_util.repack_database(instance)
+    assert "VACUUM" in statements
+    assert repack_util.sqlite_incremental_vacuum_enabled(instance)
+
+    statements.clear()
+    repack_util.repack_database(instance)
+    assert "VACUUM" not in statements
+
+
 async def test_purge_old_states_encouters_database_corruption(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
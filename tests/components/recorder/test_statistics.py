@@ -15,6 +15,7 @@ from homeassistant.components.recorder.models import (
 from homeassistant.components.recorder.statistics import (
     get_last_statistics,
     statistics_during_period,
+    statistics_during_period_columnar,
 )
 from homeassistant.const import TEMP_CELSIUS
 from homeassistant.setup import setup_component
@@ -197,6 +198,73 @@ def test_compile_hourly_statistics_exception(
     }
 
 
+def test_compile_statistics_rollups(hass_recorder):
+    """Test the daily and monthly statistics are rolled up from the hourly ones."""
+    hass = hass_recorder()
+    recorder = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+
+    day_start = dt_util.as_utc(dt_util.start_of_local_day(dt_util.now()))
+    hour_stats = [
+        {"mean": 10.0, "min": 5.0, "max": 15.0, "state": 1.0, "sum": 1.0},
+        {"mean": 20.0, "min": 15.0, "max": 30.0, "state": 3.0, "sum": 3.0},
+    ]
+    for hour, stat in enumerate(hour_stats):
+        with patch(
+            "homeassistant.components.sensor.recorder.compile_statistics",
+            return_value={
+                "sensor.test1": {
+                    "meta": {
+                        "unit_of_measurement": "kWh",
+                        "has_mean": True,
+                        "has_sum": True,
+                    },
+                    "stat": stat,
+                }
+            },
+        ):
+            recorder.do_adhoc_statistics(
+                period="hourly", start=day_start + timedelta(hours=hour)
+            )
+            wait_recording_done(hass)
+
+    expected_rollup = {
+        "statistic_id": "sensor.test1",
+        "mean": approx(15.0),
+        "min": approx(5.0),
+        "max": approx(30.0),
+        "last_reset": None,
+        "state": approx(3.0),
+        "sum": approx(3.0),
+    }
+    month_start = dt_util.as_utc(
+        dt_util.start_of_local_day(dt_util.now().date().replace(day=1))
+    )
+    for period, start in (("day", day_start), ("month", month_start)):
+        stats = statistics_during_period(hass, month_start, period=period)
+        assert stats == {
+            "sensor.test1": [
+                {**expected_rollup, "start": process_timestamp_to_utc_isoformat(start)}
+            ]
+        }
+
+    stats = statistics_during_period_columnar(hass, day_start)
+    assert stats == {
+        "sensor.test1": {
+            "start": [
+                day_start.timestamp(),
+                (day_start + timedelta(hours=1)).timestamp(),
+            ],
+            "last_reset": [None, None],
+            "mean": [approx(10.0), approx(20.0)],
+            "min": [approx(5.0), approx(15.0)],
+            "max": [approx(15.0), approx(30.0)],
+            "state": [approx(1.0), approx(3.0)],
+            "sum": [approx(1.0), approx(3.0)],
+        }
+    }
+
+
 def test_rename_entity(hass_recorder):
     """Test statistics is migrated when entity_id is changed."""
     hass = hass_recorder()
@@ -9,7 +9,11 @@ from sqlalchemy import text
 from sqlalchemy.sql.elements import TextClause
 
 from homeassistant.components.recorder import run_information_with_session, util
-from homeassistant.components.recorder.const import DATA_INSTANCE, SQLITE_URL_PREFIX
+from homeassistant.components.recorder.const import (
+    DATA_INSTANCE,
+    DB_PROFILE_FLASH,
+    SQLITE_URL_PREFIX,
+)
 from homeassistant.components.recorder.models import RecorderRuns
 from homeassistant.components.recorder.util import end_incomplete_runs, session_scope
 from homeassistant.util import dt as dt_util
@@ -29,6 +33,21 @@ def test_session_scope_not_setup(hass_recorder):
             pass
 
 
+def test_session_scope_read_only(hass_recorder):
+    """Test read only session scopes use the read only sessions."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    read_only_session = MagicMock()
+    with patch.object(
+        instance, "get_read_only_session", return_value=read_only_session
+    ), patch.object(instance, "get_session") as get_session:
+        with util.session_scope(hass=hass, read_only=True) as session:
+            assert session is read_only_session
+
+    assert not get_session.called
+    assert read_only_session.close.called
+
+
 def test_recorder_bad_commit(hass_recorder):
     """Bad _commit should retry 3 times."""
     hass = hass_recorder()
@@ -160,6 +179,37 @@ def test_setup_connection_for_dialect_sqlite():
     assert execute_mock.call_args_list[0][0][0] == "PRAGMA cache_size = -8192"
 
 
+def test_setup_connection_for_dialect_sqlite_flash_profile():
+    """Test setting up the connection for a sqlite dialect with the flash profile."""
+    execute_mock = MagicMock()
+    close_mock = MagicMock()
+
+    def _make_cursor_mock(*_):
+        return MagicMock(execute=execute_mock, close=close_mock)
+
+    dbapi_connection = MagicMock(cursor=_make_cursor_mock)
+
+    util.setup_connection_for_dialect(
+        "sqlite", dbapi_connection, False, DB_PROFILE_FLASH
+    )
+
+    assert [call[0][0] for call in execute_mock.call_args_list] == list(
+        util.SQLITE_FLASH_PRAGMAS
+    )
+    assert "PRAGMA synchronous=NORMAL" in util.SQLITE_FLASH_PRAGMAS
+
+    execute_mock.reset_mock()
+    util.setup_connection_for_dialect(
+        "sqlite", dbapi_connection, True, DB_PROFILE_FLASH
+    )
+
+    assert [call[0][0] for call in execute_mock.call_args_list] == [
+        "PRAGMA auto_vacuum=INCREMENTAL",
+        "PRAGMA journal_mode=WAL",
+        *util.SQLITE_FLASH_PRAGMAS,
+    ]
+
+
 def test_basic_sanity_check(hass_recorder):
     """Test the basic sanity checks with a missing table."""
     hass = hass_recorder()
@@ -393,6 +393,143 @@ async def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+async def test_subscribe_events_filtered(hass, websocket_client):
+    """Test subscribe events of some entities with some attributes."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+            "entity_ids": ["light.kitchen"],
+            "attributes": ["brightness"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    await websocket_client.send_json(
+        {
+            "id": 6,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+            "domains": ["sensor"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.states.async_set("light.bedroom", "on")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10, "rgb": [1, 2]})
+    hass.states.async_set("sensor.temperature", "20")
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    new_state = msg["event"]["data"]["new_state"]
+    assert new_state["entity_id"] == "light.kitchen"
+    assert new_state["attributes"] == {"brightness": 10}
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["event"]["data"]["entity_id"] == "sensor.temperature"
+
+
+async def test_subscribe_events_coalesced(hass, websocket_client):
+    """Test the updates of an entity are coalesced."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+            "coalesce": 0.1,
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    for value in range(5):
+        hass.states.async_set("sensor.temperature", value)
+    hass.states.async_set("sensor.humidity", "50")
+
+    await websocket_client.send_json({"id": 6, "type": "get_backlog"})
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["result"]["coalescing"] == 2
+    assert msg["result"]["coalesced"] == 4
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+    assert msg["event"]["data"]["new_state"]["state"] == "4"
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+    assert msg["event"]["data"]["new_state"]["state"] == "50"
+
+
+async def test_unsubscribe_events_coalesced(hass, websocket_client):
+    """Test the held back updates of a subscription are not sent after it ends."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_events",
+            "event_type": "state_changed",
+            "coalesce": 10,
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.states.async_set("sensor.temperature", "20")
+
+    await websocket_client.send_json(
+        {"id": 6, "type": "unsubscribe_events", "subscription": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 6
+    assert msg["success"]
+
+    await websocket_client.send_json({"id": 7, "type": "get_backlog"})
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["result"]["coalescing"] == 0
+
+
+async def test_subscribe_events_filter_other_event(hass, websocket_client):
+    """Test only state changed events can be filtered."""
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "subscribe_events",
+            "event_type": "test_event",
+            "domains": ["sensor"],
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_INVALID_FORMAT
+
+
+async def test_render_template_stats(hass, websocket_client):
+    """Test the render times of the tracked templates."""
+    await websocket_client.send_json(
+        {"id": 5, "type": "render_template", "template": "{{ states('sensor.a') }}"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"result": "unknown", "listeners": ANY}
+
+    hass.states.async_set("sensor.a", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["result"] == "on"
+
+    await websocket_client.send_json({"id": 6, "type": "render_template_stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    # the first render and the render for the state change
+    assert msg["result"]["{{ states('sensor.a') }}"]["renders"] == 2
+
+
 async def test_get_states(hass, websocket_client):
     """Test get_states command."""
     hass.states.async_set("greeting.hello", "world")
@@ -539,6 +539,30 @@ async def test_async_remove_runs_callbacks(hass):
     assert len(result) == 1
 
 
+async def test_async_write_ha_states(hass):
+    """Test writing the states of many entities at once."""
+    events = []
+    hass.bus.async_listen("states_changed", events.append)
+    entities = []
+    for idx in range(3):
+        ent = entity.Entity()
+        ent.hass = hass
+        ent.entity_id = f"test.test_{idx}"
+        ent._attr_state = str(idx)
+        entities.append(ent)
+
+    entity.async_write_ha_states(hass, entities, aggregate=True)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("test.test_2").state == "2"
+    assert len(events) == 1
+    assert len(events[0].data["changes"]) == 3
+
+    entities[1].entity_id = None
+    with pytest.raises(entity.NoEntitySpecifiedError):
+        entity.async_write_ha_states(hass, entities)
+
+
 async def test_set_context(hass):
     """Test setting context."""
     context = Context()
@@ -20,6 +20,7 @@ from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_template_render_stats,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -1968,6 +1969,126 @@ async def test_track_template_result_refresh_cancel(hass):
     assert refresh_runs == ["duck"]
 
 
+async def test_track_template_result_shared_render(hass):
+    """Test identical templates render once for the state changes of a loop."""
+    template_str = "{{ states('sensor.a') | int + states('sensor.b') | int }}"
+    runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        runs.append(updates.pop().result)
+
+    for _ in range(2):
+        async_track_template_result(
+            hass, [TrackTemplate(Template(template_str, hass), None)], refresh_listener
+        )
+    await hass.async_block_till_done()
+
+    with patch.object(
+        Template,
+        "async_render_to_info",
+        autospec=True,
+        side_effect=Template.async_render_to_info,
+    ) as render:
+        hass.states.async_set_many([("sensor.a", "1"), ("sensor.b", "2")])
+        await hass.async_block_till_done()
+
+    assert render.call_count == 1
+    assert runs == [3, 3]
+
+    stats = async_template_render_stats(hass)
+    assert stats[template_str]["renders"] == 2
+    assert stats[template_str]["max_ms"] >= 0
+
+
+async def test_track_template_result_last_triggering_event(hass):
+    """Test the action runs with the last state change the render reflects."""
+    template_str = "{{ states('sensor.a') | int + states('sensor.b') | int }}"
+    runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        runs.append((event.data["new_state"].state, updates.pop().result))
+
+    async_track_template_result(
+        hass, [TrackTemplate(Template(template_str, hass), None)], refresh_listener
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "2")
+    hass.states.async_set("sensor.a", "5")
+    await hass.async_block_till_done()
+
+    assert runs == [("5", 7)]
+
+
+async def test_track_template_result_removed_by_earlier_action(hass):
+    """Test a tracker removed by an action of the same pass does not run."""
+    runs = []
+
+    @ha.callback
+    def remove_listener(event, updates):
+        runs.append("remove")
+        info.async_remove()
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        runs.append("refresh")
+
+    async_track_template_result(
+        hass,
+        [TrackTemplate(Template("{{ states('sensor.a') }}", hass), None)],
+        remove_listener,
+    )
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(Template("{{ states('sensor.a') }}", hass), None)],
+        refresh_listener,
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.a", "1")
+    await hass.async_block_till_done()
+
+    assert runs == ["remove"]
+
+
+async def test_track_template_result_strict_render_not_shared(hass):
+    """Test strict and non strict templates of the same source render apart."""
+    template_str = "{{ states.sensor.a.state }}"
+    runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        runs.append(updates.pop().result)
+
+    hass.states.async_set("sensor.a", "1")
+    async_track_template_result(
+        hass, [TrackTemplate(Template(template_str, hass), None)], refresh_listener
+    )
+    strict_info = async_track_template_result(
+        hass,
+        [TrackTemplate(Template(template_str, hass), None)],
+        refresh_listener,
+        strict=True,
+    )
+    await hass.async_block_till_done()
+
+    with patch.object(
+        Template,
+        "async_render_to_info",
+        autospec=True,
+        side_effect=Template.async_render_to_info,
+    ) as render:
+        hass.states.async_set("sensor.a", "2")
+        await hass.async_block_till_done()
+
+    assert render.call_count == 2
+    assert runs == [2, 2]
+    strict_info.async_remove()
+
+
 async def test_async_track_template_result_multiple_templates(hass):
     """Test tracking multiple templates."""
 
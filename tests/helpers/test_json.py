@@ -1,10 +1,13 @@
 """Test Home Assistant remote methods and classes."""
 from datetime import timedelta
+import json
+from unittest.mock import patch
 
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder
+import homeassistant.helpers.json as json_helper
+from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder, json_bytes
 from homeassistant.util import dt as dt_util
 
 
@@ -63,3 +66,25 @@ def test_trace_json_encoder(hass):
     # Default method falls back to repr(o)
     o = object()
     assert ha_json_enc.default(o) == {"__type": str(type(o)), "repr": repr(o)}
+
+
+@pytest.mark.parametrize("orjson", [json_helper.orjson, None])
+def test_json_bytes(orjson):
+    """Test serializing to compact UTF-8 JSON with and without orjson."""
+    state = core.State("test.test", "hello")
+    now = dt_util.utcnow()
+    data = {"state": state, "time": now, "tags": {"milk"}, "name": "Łódź", 1: None}
+
+    with patch.object(json_helper, "orjson", orjson):
+        encoded = json_bytes(data)
+        with pytest.raises(ValueError):
+            json_bytes({"value": [float("nan")]})
+
+    assert "Łódź".encode() in encoded
+    assert json.loads(encoded) == {
+        "state": state.as_dict(),
+        "time": now.isoformat(),
+        "tags": ["milk"],
+        "name": "Łódź",
+        "1": None,
+    }
@@ -1,5 +1,6 @@
 """Test Home Assistant template helper methods."""
-from datetime import datetime
+from datetime import datetime, timedelta
+from hashlib import sha256
 import math
 import random
 from unittest.mock import patch
@@ -11,6 +12,7 @@ from homeassistant.components import group
 from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     MASS_GRAMS,
     PRESSURE_PA,
@@ -25,6 +27,7 @@ from homeassistant.util.unit_system import UnitSystem
 
 from tests.common import (
     MockConfigEntry,
+    async_fire_time_changed,
     mock_area_registry,
     mock_device_registry,
     mock_registry,
@@ -2860,3 +2863,35 @@ async def test_undefined_variable(hass, caplog):
         "Template variable warning: 'no_such_variable' is undefined when rendering '{{ no_such_variable }}'"
         in caplog.text
     )
+
+
+async def test_compiled_cache(hass, hass_storage):
+    """Test compiled templates are kept in memory and saved in .storage."""
+    cache = template.CompiledCache()
+    with patch.object(template, "_COMPILED_CACHE", cache):
+        await template.async_load_compiled_cache(hass)
+
+        tpl = template.Template("{{ 1 + compiled_cache_test }}", hass)
+        tpl.ensure_valid()
+        key = f"default:{sha256(tpl.template.encode()).hexdigest()}"
+        assert cache.get(key) == tpl._compiled_code
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done()
+        async_fire_time_changed(
+            hass,
+            dt_util.utcnow() + timedelta(seconds=template.COMPILED_CACHE_SAVE_DELAY),
+        )
+        await hass.async_block_till_done()
+
+    data = hass_storage[template.COMPILED_CACHE_STORAGE_KEY]["data"]
+    assert key in data["templates"]
+
+    loaded_cache = template.CompiledCache()
+    await loaded_cache.async_load(hass)
+    assert loaded_cache.get(key) == tpl._compiled_code
+
+    data["version"] = "old"
+    outdated_cache = template.CompiledCache()
+    await outdated_cache.async_load(hass)
+    assert outdated_cache.get(key) is None
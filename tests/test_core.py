@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -26,6 +27,7 @@ from homeassistant.const import (
     EVENT_SERVICE_REGISTERED,
     EVENT_SERVICE_REMOVED,
     EVENT_STATE_CHANGED,
+    EVENT_STATES_CHANGED,
     EVENT_TIME_CHANGED,
     EVENT_TIMER_OUT_OF_SYNC,
     MATCH_ALL,
@@ -38,6 +40,7 @@ from homeassistant.exceptions import (
     MaxLengthExceeded,
     ServiceNotFound,
 )
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -383,6 +386,23 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_and_event_as_json():
+    """Test a State and an Event as cached JSON."""
+    state = ha.State("happy.happy", "on", {"pig": "dóg"})
+    assert json.loads(state.as_json()) == state.as_dict()
+    assert state.as_json() is state.as_json()
+    assert state.attributes_json() == '{"pig":"dóg"}'.encode()
+
+    event = ha.Event(
+        EVENT_STATE_CHANGED, {"entity_id": "happy.happy", "new_state": state}
+    )
+    assert json.loads(event.as_json()) == json.loads(
+        json.dumps(event.as_dict(), cls=JSONEncoder)
+    )
+    assert state.as_json() in event.as_json()
+    assert event.as_json() is event.as_json()
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -431,6 +451,39 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass):
+    """Test we can listen for events by a value of the event data."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.data["entity_id"])
+
+    unsub = hass.bus.async_listen_keyed(
+        "test", "entity_id", ["light.kitchen", "light.bowl"], listener
+    )
+    assert hass.bus.async_listeners()["test"] == 1
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.other"})
+    hass.bus.async_fire("test", {"entity_id": ["light.bowl"]})
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other", {"entity_id": "light.bowl"})
+    hass.bus.async_fire("test", {"entity_id": "light.bowl"})
+    await hass.async_block_till_done()
+
+    assert calls == ["light.kitchen", "light.bowl"]
+
+    unsub()
+    assert "test" not in hass.bus.async_listeners()
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 2
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -728,6 +781,94 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_set_many(hass):
+    """Test setting many states at once."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    hass.states.async_set("light.kitchen", "off")
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    batches = async_capture_events(hass, EVENT_STATES_CHANGED)
+    context = ha.Context()
+
+    hass.states.async_set_many(
+        [
+            ("light.Bowl", "on", {"brightness": 100}),
+            ("light.kitchen", "on"),
+            ("light.kitchen", "dim", {"brightness": 50}),
+            ("light.porch", "off", None, False, context),
+        ]
+    )
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in events] == [
+        "light.kitchen",
+        "light.porch",
+    ]
+    assert events[0].data["old_state"].state == "off"
+    assert events[0].data["new_state"].state == "dim"
+    assert events[0].time_fired == events[1].time_fired
+    assert events[1].context is context
+    assert hass.states.get("light.kitchen").attributes == {"brightness": 50}
+    assert hass.states.async_entity_ids_count("light") == 3
+    assert len(batches) == 0
+
+    hass.states.async_set_many(
+        [("light.bowl", "off"), ("light.kitchen", "off")], aggregate=True
+    )
+    await hass.async_block_till_done()
+
+    assert len(events) == 4
+    assert len(batches) == 1
+    assert [change["entity_id"] for change in batches[0].data["changes"]] == [
+        "light.bowl",
+        "light.kitchen",
+    ]
+    assert events[2].context is events[3].context is batches[0].context
+
+
+async def test_statemachine_set_many_invalid(hass):
+    """Test nothing is set if a change is invalid."""
+    hass.states.async_set("light.bowl", "on")
+
+    with pytest.raises(InvalidEntityFormatError):
+        hass.states.async_set_many([("light.bowl", "off"), ("invalid", "on")])
+
+    assert hass.states.get("light.bowl").state == "on"
+    assert hass.states.async_entity_ids() == ["light.bowl"]
+
+
+async def test_statemachine_shares_attributes(hass):
+    """Test states with the same attributes share them."""
+    attributes = {"unit_of_measurement": "°C", "friendly_name": "Temperature"}
+    hass.states.async_set("sensor.kitchen", "20", attributes)
+    hass.states.async_set("sensor.bedroom", "18", dict(attributes))
+    kitchen = hass.states.get("sensor.kitchen")
+    bedroom = hass.states.get("sensor.bedroom")
+    assert kitchen.attributes is bedroom.attributes
+
+    attributes["friendly_name"] = "Changed"
+    assert kitchen.attributes["friendly_name"] == "Temperature"
+
+    # 1 and True are equal but are not the same attributes
+    hass.states.async_set("sensor.one", "1", {"value": 1})
+    hass.states.async_set("sensor.true", "1", {"value": True})
+    assert hass.states.get("sensor.true").attributes["value"] is True
+
+    # nor are they the same attributes of a changed state
+    hass.states.async_set("sensor.one", "2", {"value": True})
+    assert hass.states.get("sensor.one").attributes["value"] is True
+    hass.states.async_set("sensor.one", "2", {"value": 1.0})
+    assert type(hass.states.get("sensor.one").attributes["value"]) is float
+
+    hass.states.async_set("sensor.empty", "1")
+    assert hass.states.get("sensor.empty").attributes is ha.EMPTY_ATTRIBUTES
+
+    hass.states.async_set("sensor.kitchen", "21", attributes)
+    assert hass.states.get("sensor.kitchen").attributes == attributes
+    assert hass.states.get("sensor.bedroom").attributes["friendly_name"] == (
+        "Temperature"
+    )
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")